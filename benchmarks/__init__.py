@@ -0,0 +1,13 @@
+"""
+Benchmarks for the pamqp encoding, decoding and frame marshaling paths
+
+Run the benchmarks from the root of the repository, writing the results to a
+JSON file that can be used as the baseline for later runs::
+
+    python -m benchmarks --output baseline.json
+    python -m benchmarks --baseline baseline.json --threshold 0.1
+
+When a baseline is specified, the run fails if any benchmark is slower than
+its baseline by more than the threshold.
+
+"""
@@ -0,0 +1,5 @@
+import sys
+
+from benchmarks import codec, frames, harness  # noqa: F401
+
+sys.exit(harness.main())
@@ -0,0 +1,171 @@
+"""Benchmarks for the :mod:`pamqp.encode` and :mod:`pamqp.decode` functions"""
+import datetime
+import decimal
+import typing
+
+from benchmarks import harness
+
+from pamqp import decode, encode
+
+ENCODE_VALUES = {
+    'bytearray': bytearray(b'\x00' * 64),
+    'double': 3.141592653589793,
+    'field_array': [1, 'two', 3.0, True],
+    'long': 2147483647,
+    'longlong': 9223372036854775807,
+    'longstr': 'x' * 256,
+    'octet': 255,
+    'short': 65535,
+    'shortstr': 'amq.direct',
+    'table': {'key': 'value', 'count': 10},
+    'timestamp': datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+    'void': None,
+}
+
+TABLE_VALUES = {
+    'boolean': True,
+    'int8': 100,
+    'int16': -30000,
+    'uint16': 60000,
+    'int32': -2000000000,
+    'uint32': 4000000000,
+    'int64': 9000000000000000000,
+    'float': 1.5,
+    'decimal': decimal.Decimal('3.14'),
+    'long_str': 'x' * 256,
+    'byte_array': bytearray(b'x' * 256),
+    'timestamp': datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+    'void': None,
+}
+
+HEADERS = {
+    'content-type': 'application/json',
+    'x-correlation-id': '7f9c2a3e-51b4-4d8e-9a6b-0c1d2e3f4a5b',
+    'x-death': [{
+        'count': 3,
+        'exchange': 'orders',
+        'queue': 'orders.retry',
+        'reason': 'expired',
+        'routing-keys': ['orders.created'],
+        'time': datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+    }],
+    'x-first-death-exchange': 'orders',
+    'x-first-death-queue': 'orders.retry',
+    'x-first-death-reason': 'expired',
+    'x-retry-count': 3,
+    'x-priority': 5,
+}
+"""A realistic RabbitMQ message headers table for a dead-lettered message"""
+
+
+def table(size: int, depth: int) -> dict:
+    """Return a field table with size keys per level and nested depth levels
+    """
+    value = {'key-{}'.format(index): TABLE_VALUES[name]
+             for index, name in zip(range(size), sorted(TABLE_VALUES) * size)}
+    if depth > 1:
+        value['nested'] = table(size, depth - 1)
+    return value
+
+
+def register_encode() -> None:
+    for data_type, value in sorted(ENCODE_VALUES.items()):
+        harness.register(
+            'encode.{}'.format(data_type),
+            lambda encoder=encode.METHODS[data_type], value=value:
+            encoder(value))
+    for name, value in sorted(TABLE_VALUES.items()):
+        harness.register(
+            'encode.table_value.{}'.format(name),
+            lambda value=value: encode.encode_table_value(value))
+
+
+def register_decode() -> None:
+    encoded = {
+        'array': encode.field_array(ENCODE_VALUES['field_array']),
+        'bit': b'\x05',
+        'boolean': b'\x01',
+        'byte_array': encode.byte_array(ENCODE_VALUES['bytearray']),
+        'decimal': encode.decimal(decimal.Decimal('3.14')),
+        'double': encode.double(3.141592653589793),
+        'float': encode.floating_point(1.5),
+        'long': encode.long_uint(2147483647),
+        'longlong': encode.long_long_int(9223372036854775807),
+        'longstr': encode.long_string('x' * 256),
+        'octet': encode.octet(255),
+        'short': encode.short_uint(65535),
+        'shortstr': encode.short_string('amq.direct'),
+        'table': encode.field_table(ENCODE_VALUES['table']),
+        'timestamp': encode.timestamp(ENCODE_VALUES['timestamp']),
+        'void': b'',
+    }
+    for data_type, value in sorted(encoded.items()):
+        harness.register(
+            'decode.{}'.format(data_type),
+            lambda data_type=data_type, value=value:
+            decode.by_type(value, data_type))
+    for name, value in sorted(TABLE_VALUES.items()):
+        harness.register(
+            'decode.table_value.{}'.format(name),
+            lambda value=encode.encode_table_value(value):
+            decode.embedded_value(value))
+
+
+def register_field_tables() -> None:
+    for size in (1, 8, 32):
+        for depth in (1, 3):
+            value = table(size, depth)
+            encoded = encode.field_table(value)
+            name = 'field_table.size-{}.depth-{}'.format(size, depth)
+            harness.register('encode.' + name,
+                             lambda value=value: encode.field_table(value))
+            harness.register('decode.' + name,
+                             lambda value=encoded: decode.field_table(value))
+    harness.register('encode.field_table.headers.unsorted',
+                     lambda: encode.field_table(HEADERS, sort_keys=False))
+    harness.register('decode.field_table.headers',
+                     lambda value=encode.field_table(HEADERS):
+                     decode.field_table(value))
+
+
+def register_encode_into() -> None:
+    large = {'a': {'b': {'c': {'d': bytearray(1024 * 1024)}}}}
+    for name, value in (('headers', HEADERS), ('large-nested', large)):
+        buffer = bytearray(encode.sizeof(value, 'table'))
+        harness.register('encode.field_table.{}'.format(name),
+                         lambda value=value: encode.field_table(value))
+        harness.register('encode.sizeof.table.{}'.format(name),
+                         lambda value=value: encode.sizeof(value, 'table'))
+        harness.register(
+            'encode.encode_into.table.{}'.format(name),
+            lambda buffer=buffer, value=value:
+            encode.encode_into(buffer, 0, value, 'table'))
+
+
+def register_short_string_cache() -> None:
+    cache = decode.StringCache()
+
+    def cached(function: typing.Callable[[], object]) \
+            -> typing.Callable[[], object]:
+        def run() -> object:
+            decode.SHORT_STRING_CACHE = cache
+            try:
+                return function()
+            finally:
+                decode.SHORT_STRING_CACHE = None
+        return run
+
+    shortstr = encode.short_string('amq.ctag-Zx9qW3tRkLm8vBnYp0aQeA')
+    harness.register('decode.shortstr.cached',
+                     cached(lambda: decode.short_str(shortstr)))
+    harness.register(
+        'decode.field_table.headers.cached',
+        cached(lambda value=encode.field_table(HEADERS):
+               decode.field_table(value)))
+
+
+register_encode()
+register_decode()
+register_field_tables()
+register_short_string_cache()
+register_encode_into()
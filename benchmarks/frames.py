@@ -0,0 +1,146 @@
+"""Benchmarks for marshaling and unmarshaling frames"""
+import datetime
+import typing
+
+from benchmarks import harness
+
+from pamqp import base, body, commands, frame, header
+
+SAMPLE_VALUES = {
+    'bit': True,
+    'long': 1024,
+    'longlong': 1024,
+    'longstr': 'x' * 64,
+    'octet': 1,
+    'short': 1,
+    'shortstr': 'name',
+    'table': {'key': 'value'},
+    'timestamp': datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+}
+
+# Reserved arguments that must have a specific value
+RESERVED_VALUES = {
+    'capabilities': '',
+    'channel_id': '0',
+    'cluster_id': '',
+    'insist': False,
+    'known_hosts': '',
+    'out_of_band': '0',
+    'ticket': 0,
+}
+
+PROPERTIES = commands.Basic.Properties(
+    app_id='benchmarks',
+    content_encoding='gzip',
+    content_type='application/json',
+    correlation_id='3a9b6f4c-8d7e-4d1a-9f3b-2c5e7a1d0b8f',
+    delivery_mode=2,
+    expiration='60000',
+    headers={'x-retry': 3, 'x-origin': 'benchmarks', 'x-flag': True},
+    message_id='5f2c8e1a-6b3d-4a9f-8e7c-1d0b9a2f3c4e',
+    message_type='event',
+    priority=5,
+    reply_to='amq.rabbitmq.reply-to',
+    timestamp=datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+    user_id='guest',
+    cluster_id='')
+
+BODY = b'x' * 4096
+
+
+def sample(frame_class: typing.Type[base.Frame]) -> base.Frame:
+    """Return an instance of the frame class with every argument set"""
+    value = frame_class.__new__(frame_class)
+    for name in frame_class.attributes():
+        setattr(value, name,
+                RESERVED_VALUES.get(
+                    name, SAMPLE_VALUES[frame_class.amqp_type(name)]))
+    value.validate()
+    return value
+
+
+def register_methods() -> None:
+    for _index, frame_class in sorted(commands.INDEX_MAPPING.items()):
+        value = sample(frame_class)
+        encoded = frame.marshal(value, 1)
+        harness.register('frame.marshal.{}'.format(frame_class.name),
+                         lambda value=value: frame.marshal(value, 1))
+        harness.register('frame.unmarshal.{}'.format(frame_class.name),
+                         lambda value=encoded: frame.unmarshal(value))
+
+
+def register_properties() -> None:
+    encoded = PROPERTIES.marshal()
+    offset, flags = header.ContentHeader._get_flags(encoded)
+    harness.register('properties.marshal', PROPERTIES.marshal)
+    harness.register(
+        'properties.unmarshal',
+        lambda value=encoded: commands.Basic.Properties().unmarshal(
+            flags, value, offset))
+    content_header = header.ContentHeader(0, len(BODY), PROPERTIES)
+    encoded = frame.marshal(content_header, 1)
+    harness.register('frame.marshal.ContentHeader',
+                     lambda: frame.marshal(content_header, 1))
+    harness.register('frame.unmarshal.ContentHeader',
+                     lambda: frame.unmarshal(encoded))
+
+
+def register_messages() -> None:
+    publish = commands.Basic.Publish(exchange='amq.direct',
+                                     routing_key='benchmarks')
+    harness.register(
+        'message.publish.frames',
+        lambda: b''.join([
+            frame.marshal(publish, 1),
+            frame.marshal(header.ContentHeader(0, len(BODY), PROPERTIES), 1),
+            frame.marshal(body.ContentBody(BODY), 1)]))
+    harness.register(
+        'message.publish.marshal_message',
+        lambda: frame.marshal_message(1, 'amq.direct', 'benchmarks',
+                                      PROPERTIES, BODY, 131072))
+    deliver = frame.marshal_many([
+        (commands.Basic.Deliver('ctag', 1, False, 'amq.direct',
+                                'benchmarks'), 1),
+        (header.ContentHeader(0, len(BODY), PROPERTIES), 1),
+        (body.ContentBody(BODY), 1)])
+
+    def unmarshal_deliver() -> None:
+        offset = 0
+        while offset < len(deliver):
+            consumed, _channel, _value = frame.unmarshal(deliver[offset:])
+            offset += consumed
+
+    def read_deliver() -> None:
+        reader = frame.FrameReader()
+        reader.feed(deliver)
+        list(reader)
+
+    harness.register('message.deliver.unmarshal', unmarshal_deliver)
+    harness.register('message.deliver.frame_reader', read_deliver)
+
+
+def register_validation() -> None:
+    def publish(mode: str) -> typing.Callable[[], bytes]:
+        def run() -> bytes:
+            base.set_validation_mode(mode)
+            try:
+                return frame.marshal_many([
+                    (commands.Basic.Publish(exchange='orders',
+                                            routing_key='orders.created'), 1),
+                    (header.ContentHeader(0, len(BODY),
+                                          commands.Basic.Properties(
+                                              content_type='application/json',
+                                              delivery_mode=2)), 1),
+                    (body.ContentBody(BODY), 1)])
+            finally:
+                base.set_validation_mode('strict')
+        return run
+
+    for mode in base.VALIDATION_MODES:
+        harness.register('validation.{}.publish'.format(mode), publish(mode))
+
+
+register_methods()
+register_properties()
+register_messages()
+register_validation()
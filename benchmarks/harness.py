@@ -0,0 +1,106 @@
+"""A small benchmark harness built on :mod:`timeit`"""
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+import typing
+
+Benchmark = typing.Callable[[], typing.Any]
+
+BENCHMARKS: typing.Dict[str, Benchmark] = {}
+
+
+def register(name: str, benchmark: Benchmark) -> None:
+    """Register a benchmark, a callable that runs the code to time once
+
+    :param name: The unique name of the benchmark
+    :param benchmark: The callable to time
+    :raises: ValueError
+
+    """
+    if name in BENCHMARKS:
+        raise ValueError('Duplicate benchmark: {}'.format(name))
+    BENCHMARKS[name] = benchmark
+
+
+def run(names: typing.Iterable[str],
+        repeat: int = 5,
+        min_time: float = 0.05) -> typing.Dict[str, float]:
+    """Time the benchmarks, returning the fastest time per call of each in
+    nanoseconds.
+
+    :param names: The names of the benchmarks to run
+    :param repeat: The number of times to repeat each measurement
+    :param min_time: The minimum duration of each measurement in seconds
+
+    """
+    results = {}
+    for name in names:
+        timer = timeit.Timer(BENCHMARKS[name], timer=time.perf_counter)
+        number = 1
+        while timer.timeit(number) < min_time:
+            number *= 2
+        results[name] = min(timer.repeat(repeat, number)) / number * 1e9
+    return results
+
+
+def compare(results: typing.Dict[str, float],
+            baseline: typing.Dict[str, float],
+            threshold: float) -> typing.List[typing.Tuple[str, float]]:
+    """Return the benchmarks that are slower than their baseline by more
+    than the threshold, with the relative change of each.
+
+    :param results: The results of the current run
+    :param baseline: The results of the baseline run
+    :param threshold: The allowed relative slowdown, such as ``0.1``
+
+    """
+    regressions = []
+    for name, value in sorted(results.items()):
+        if baseline.get(name):
+            change = value / baseline[name] - 1
+            if change > threshold:
+                regressions.append((name, change))
+    return regressions
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    """Run the benchmarks from the command line, returning the exit code"""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Run the pamqp benchmarks')
+    parser.add_argument('-o', '--output', help='Write the results to a file')
+    parser.add_argument('-b', '--baseline', help='Baseline results to compare')
+    parser.add_argument('-t', '--threshold', type=float, default=0.1,
+                        help='Allowed slowdown versus the baseline')
+    parser.add_argument('-k', '--filter', default='',
+                        help='Only run benchmarks with names containing it')
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)['results']
+
+    names = sorted(name for name in BENCHMARKS if args.filter in name)
+    results = run(names, args.repeat, args.min_time)
+    for name in names:
+        line = '{:<60} {:>12.1f} ns'.format(name, results[name])
+        if baseline.get(name):
+            line += ' {:>+8.1%}'.format(results[name] / baseline[name] - 1)
+        sys.stdout.write(line + '\n')
+
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump({'python': platform.python_version(),
+                       'platform': platform.platform(),
+                       'results': results}, handle, indent=2, sort_keys=True)
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, change in regressions:
+        sys.stderr.write(
+            'Regression: {} is {:.1%} slower\n'.format(name, change))
+    return 1 if regressions else 0
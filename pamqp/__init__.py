@@ -6,6 +6,7 @@ __since__ = '2011-09-23'
 __version__ = version = '3.2.1'
 
 __all__ = [
-    'body', 'decode', 'commands', 'constants', 'encode', 'exceptions', 'frame',
-    'header', 'heartbeat'
+    'aio', 'body', 'decode', 'commands', 'connection', 'constants',
+    'delivery', 'encode', 'exceptions', 'frame', 'header', 'heartbeat',
+    'message'
 ]
@@ -0,0 +1,207 @@
+# -*- encoding: utf-8 -*-
+"""
+The :py:mod:`pamqp.aio` module contains an :class:`asyncio.BufferedProtocol`
+implementation that unmarshals AMQP frames as they are received, reading the
+data from the socket directly into the receive buffer of a
+:class:`pamqp.frame.FrameReader`.
+
+Decoded frames are either passed to a callback as they are unmarshaled or
+retrieved by iterating asynchronously over the protocol:
+
+.. code-block:: python
+
+    transport, protocol = await loop.create_connection(
+        aio.FrameProtocol, 'localhost', 5672)
+    protocol.write(header.ProtocolHeader(), 0)
+    async for channel_id, frame_value in protocol:
+        ...
+
+To bound the memory used when frames are received faster than they are
+processed, reading from the transport is paused when the number of queued
+frames or buffered bytes reaches its high watermark and resumed once it drops
+to its low watermark. While reading is paused by the buffered bytes, frames
+are left in the receive buffer until they are retrieved, so they keep
+counting towards the watermark.
+
+"""
+import asyncio
+import collections
+import logging
+import typing
+
+from pamqp import constants, exceptions, frame
+
+LOGGER = logging.getLogger(__name__)
+
+FrameCallback = typing.Callable[[int, frame.FrameTypes], None]
+
+
+class FrameProtocol(asyncio.BufferedProtocol):
+    """Receive and send AMQP frames over an asyncio transport
+
+    :param on_frame: A callback that is invoked with the channel id and frame
+        for each frame received. If it is not specified, frames are queued
+        for retrieval by iterating over the protocol.
+    :param buffer_size: The initial size of the receive buffer
+    :param high_water: The number of queued frames to pause reading at, or
+        ``0`` for no limit
+    :param low_water: The number of queued frames to resume reading at,
+        defaulting to a quarter of ``high_water``
+    :param high_water_bytes: The number of buffered bytes to pause reading
+        at, or ``0`` for no limit
+    :param low_water_bytes: The number of buffered bytes to resume reading
+        at, defaulting to a quarter of ``high_water_bytes``
+    :raises: ValueError
+
+    """
+    def __init__(self,
+                 on_frame: typing.Optional[FrameCallback] = None,
+                 buffer_size: int = constants.FRAME_MAX_SIZE,
+                 high_water: int = 0,
+                 low_water: typing.Optional[int] = None,
+                 high_water_bytes: int = 0,
+                 low_water_bytes: typing.Optional[int] = None):
+        low_water = high_water // 4 if low_water is None else low_water
+        if not 0 <= low_water <= high_water:
+            raise ValueError('high_water ({}) must be >= low_water ({}) '
+                             '>= 0'.format(high_water, low_water))
+        self.reader = frame.FrameReader(buffer_size)
+        self.reader.set_watermarks(high_water_bytes, low_water_bytes,
+                                   self._update_reading, self._update_reading)
+        self.transport: typing.Optional[asyncio.Transport] = None
+        self._on_frame = on_frame
+        self._frames: typing.Deque[typing.Tuple[int, frame.FrameTypes]] = \
+            collections.deque()
+        self._high_water = high_water
+        self._low_water = low_water
+        self._closed = False
+        self._exception: typing.Optional[BaseException] = None
+        self._frames_paused = False
+        self._reading_paused = False
+        self._receiving = False
+        self._waiter: typing.Optional[asyncio.Future] = None
+
+    def __aiter__(self) -> 'FrameProtocol':
+        """Iterate over the frames as they are received"""
+        return self
+
+    async def __anext__(self) -> typing.Tuple[int, frame.FrameTypes]:
+        """Return the next frame received, waiting for it if needed
+
+        :raises: StopAsyncIteration
+        :raises: pamqp.exceptions.AMQPError
+        :raises: pamqp.exceptions.UnmarshalingException
+
+        """
+        while not self._frames:
+            if self._exception is not None:
+                raise self._exception
+            self._read_frames(1)  # Frames left in the receive buffer
+            if self._frames or self._exception is not None:
+                continue
+            elif self._closed:
+                raise StopAsyncIteration
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        value = self._frames.popleft()
+        if self._frames_paused and len(self._frames) <= self._low_water:
+            self._frames_paused = False
+            self._update_reading()
+        return value
+
+    @property
+    def reading_paused(self) -> bool:
+        """Return if reading from the transport is paused"""
+        return self._reading_paused
+
+    def buffer_updated(self, nbytes: int) -> None:
+        """Unmarshal the frames in the data read into the receive buffer"""
+        self._receiving = True
+        try:
+            self.reader.buffer_updated(nbytes)
+            self._read_frames()
+        finally:
+            self._receiving = False
+        self._update_reading()
+        self._wakeup()
+
+    def connection_lost(self, exc: typing.Optional[Exception]) -> None:
+        """Stop iterating when the connection is closed"""
+        self._closed = True
+        if exc is not None and self._exception is None:
+            self._exception = exc
+        self._wakeup()
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Keep a reference to the transport for writing frames"""
+        self.transport = transport
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        """Return the free space in the receive buffer to read data into"""
+        return self.reader.get_buffer(sizehint)
+
+    def write(self, frame_value: frame.FrameTypes, channel_id: int) -> None:
+        """Marshal a frame and write it to the transport
+
+        :raises: ValueError
+
+        """
+        self.transport.write(frame.marshal(frame_value, channel_id))
+
+    def _read_frames(self, limit: typing.Optional[int] = None) -> None:
+        """Pass the frames in the receive buffer to the callback or queue
+        them. Frames are only queued while reading is not paused by the
+        buffered bytes, unless a limit on the number of frames to queue is
+        specified.
+
+        :param limit: The maximum number of frames to read
+
+        """
+        try:
+            while limit is None or limit > 0:
+                if limit is None and self._on_frame is None and \
+                        self.reader.paused:
+                    break
+                value = self.reader.read()
+                if value is None:
+                    break
+                elif self._on_frame is not None:
+                    self._on_frame(*value)
+                else:
+                    self._frames.append(value)
+                if limit is not None:
+                    limit -= 1
+        except (exceptions.AMQPError,
+                exceptions.UnmarshalingException) as error:
+            LOGGER.error('Closing the connection due to %s', error)
+            self._exception = error
+            self.transport.close()
+            return
+        if self._high_water and not self._frames_paused and \
+                len(self._frames) >= self._high_water:
+            self._frames_paused = True
+            self._update_reading()
+
+    def _update_reading(self) -> None:
+        """Pause or resume reading from the transport when either the queued
+        frames or the buffered bytes cross their watermarks. The transport
+        is updated once the received data has been processed.
+
+        """
+        if self._receiving:
+            return
+        paused = self._frames_paused or self.reader.paused
+        if paused != self._reading_paused and self.transport is not None:
+            self._reading_paused = paused
+            if paused:
+                self.transport.pause_reading()
+            else:
+                self.transport.resume_reading()
+
+    def _wakeup(self) -> None:
+        """Wake up the coroutine waiting for frames"""
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
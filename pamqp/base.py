@@ -2,6 +2,10 @@
 Base classes for the representation of frames and data structures.
 
 """
+import collections
+import contextlib
+import contextvars
+import copy
 import logging
 import struct
 import typing
@@ -10,6 +14,128 @@ from pamqp import common, decode, encode
 
 LOGGER = logging.getLogger(__name__)
 
+PROPERTIES_CACHE: typing.Optional['PropertiesCache'] = None
+"""The cache of marshaled Basic.Properties values, if enabled."""
+
+
+def cache_properties(maxsize: int = 128) \
+        -> typing.Optional['PropertiesCache']:
+    """Toggle caching of marshaled Basic.Properties values
+
+    When enabled, marshaling a Basic.Properties object with the same property
+    values as a recently marshaled one returns the previously encoded value
+    instead of encoding each property again. The cache is returned so that
+    its hit and miss counters can be used to tune its size.
+
+    :param maxsize: The maximum number of values to cache, ``0`` disables
+        the cache
+
+    """
+    global PROPERTIES_CACHE
+
+    PROPERTIES_CACHE = PropertiesCache(maxsize) if maxsize > 0 else None
+    return PROPERTIES_CACHE
+
+
+VALIDATION_MODES = ('strict', 'construct-only', 'marshal-only', 'off')
+"""The validation modes that can be set with :func:`set_validation_mode`"""
+
+VALIDATION_MODE = 'strict'
+"""The current validation mode, see :func:`set_validation_mode`"""
+
+VALIDATE_ON_CONSTRUCT = True
+"""Toggle validating commands when they are created, unless overridden by
+:func:`validation_mode`, see :func:`validate_on_construct`."""
+
+VALIDATE_ON_MARSHAL = True
+"""Toggle validating method frames and properties when they are marshaled,
+unless overridden by :func:`validation_mode`, see
+:func:`validate_on_marshal`."""
+
+_CONSTRUCT_MODES = frozenset({'strict', 'construct-only'})
+_MARSHAL_MODES = frozenset({'strict', 'marshal-only'})
+
+_SCOPED_MODE: 'contextvars.ContextVar[typing.Optional[str]]' = \
+    contextvars.ContextVar('validation_mode', default=None)
+
+
+def set_validation_mode(mode: str) -> None:
+    """Set when commands are validated against the protocol specification
+
+    - ``strict`` validates commands when they are created and again when they
+      are marshaled, the default
+    - ``construct-only`` validates commands when they are created
+    - ``marshal-only`` validates method frames and properties when they are
+      marshaled, allowing invalid values to be assigned in between
+    - ``off`` does not validate commands, for publishers that only marshal
+      values known to be valid
+
+    :param mode: The validation mode
+    :raises ValueError: when the mode is not one of :data:`VALIDATION_MODES`
+
+    """
+    global VALIDATE_ON_CONSTRUCT, VALIDATE_ON_MARSHAL, VALIDATION_MODE
+
+    if mode not in VALIDATION_MODES:
+        raise ValueError('Invalid validation mode: {!r}'.format(mode))
+    VALIDATION_MODE = mode
+    VALIDATE_ON_CONSTRUCT = mode in _CONSTRUCT_MODES
+    VALIDATE_ON_MARSHAL = mode in _MARSHAL_MODES
+
+
+@contextlib.contextmanager
+def validation_mode(mode: str) -> typing.Iterator[None]:
+    """Context manager that sets the validation mode for the commands created
+    and marshaled in its block, restoring the previous mode on exit:
+
+    .. code-block:: python
+
+        with base.validation_mode('off'):
+            writer.write(commands.Basic.Publish(exchange, routing_key), 1)
+
+    The mode is stored in a :class:`contextvars.ContextVar`, so it only
+    applies to the current thread or :mod:`asyncio` task, overriding the mode
+    set with :func:`set_validation_mode`.
+
+    :param mode: The validation mode
+    :raises ValueError: when the mode is not one of :data:`VALIDATION_MODES`
+
+    """
+    if mode not in VALIDATION_MODES:
+        raise ValueError('Invalid validation mode: {!r}'.format(mode))
+    token = _SCOPED_MODE.set(mode)
+    try:
+        yield
+    finally:
+        _SCOPED_MODE.reset(token)
+
+
+def get_validation_mode() -> str:
+    """Return the validation mode for the current context, as set by
+    :func:`validation_mode` or :func:`set_validation_mode`.
+
+    """
+    mode = _SCOPED_MODE.get()
+    return VALIDATION_MODE if mode is None else mode
+
+
+def validate_on_construct() -> bool:
+    """Return if commands are validated when they are created in the current
+    context.
+
+    """
+    mode = _SCOPED_MODE.get()
+    return VALIDATE_ON_CONSTRUCT if mode is None else mode in _CONSTRUCT_MODES
+
+
+def validate_on_marshal() -> bool:
+    """Return if method frames and properties are validated when they are
+    marshaled in the current context.
+
+    """
+    mode = _SCOPED_MODE.get()
+    return VALIDATE_ON_MARSHAL if mode is None else mode in _MARSHAL_MODES
+
 
 class _AMQData:
     """Base class for AMQ methods and properties for encoding and decoding"""
@@ -73,59 +199,44 @@ class Frame(_AMQData):
     valid_responses: typing.List = []
 
     def marshal(self) -> bytes:
-        """Dynamically encode the frame by taking the list of attributes and
-        encode them item by item getting the value form the object attribute
-        and the data type from the class attribute.
-
-        """
-        self.validate()
-        byte, offset, output, processing_bitset = -1, 0, [], False
-        for argument in self.__slots__:
-            data_type = self.amqp_type(argument)
-            if not processing_bitset and data_type == 'bit':
-                byte, offset, processing_bitset = 0, 0, True
-            data_value = getattr(self, argument, 0)
-            if processing_bitset:
-                if data_type != 'bit':
-                    processing_bitset = False
-                    output.append(encode.octet(byte))
-                else:
-                    byte = encode.bit(data_value, byte, offset)
-                    offset += 1
-                    if offset == 8:  # pragma: nocover
-                        output.append(encode.octet(byte))
-                        processing_bitset = False
-                    continue  # pragma: nocover
-            output.append(encode.by_type(data_value, data_type))
-        if processing_bitset:
-            output.append(encode.octet(byte))
-        return b''.join(output)
+        """Encode the frame by taking the list of attributes and encoding them
+        using the codec compiled for the class from the attribute data types.
 
-    def unmarshal(self, data: bytes) -> None:
-        """Dynamically decode the frame data applying the values to the method
-        object by iterating through the attributes in order and decoding them.
+        """
+        if validate_on_marshal():
+            self.validate()
+        return _codec(self.__class__).marshal(self)
+
+    def marshal_into(self, buffer: typing.Union[bytearray, memoryview],
+                     offset: int = 0) -> int:
+        """Encode the frame into a writable buffer at the offset, returning
+        the number of bytes written. The buffer must have room for at least
+        :meth:`~pamqp.base.Frame.sizeof` bytes from the offset.
+
+        :param buffer: The buffer to encode the frame into
+        :param offset: The position in the buffer to encode the frame at
+
+        """
+        if validate_on_marshal():
+            self.validate()
+        return _codec(self.__class__).marshal_into(self, buffer, offset)
+
+    def sizeof(self) -> int:
+        """Return the number of bytes the frame is encoded as, without
+        encoding it.
+
+        """
+        return _codec(self.__class__).sizeof(self)
+
+    def unmarshal(self, data: decode.Buffer, offset: int = 0) -> None:
+        """Decode the frame data applying the values to the method object
+        using the codec compiled for the class from the attribute data types.
 
         :param data: The raw AMQP frame data
+        :param offset: The position of the frame arguments in the data
 
         """
-        offset, processing_bitset = 0, False
-        for argument in self.__slots__:
-            data_type = self.amqp_type(argument)
-            if offset == 7 and processing_bitset:  # pragma: nocover
-                data = data[1:]
-                offset = 0
-            if processing_bitset and data_type != 'bit':
-                offset = 0
-                processing_bitset = False
-                data = data[1:]
-            consumed, value = decode.by_type(data, data_type, offset)
-            if data_type == 'bit':
-                offset += 1
-                processing_bitset = True
-                consumed = 0
-            setattr(self, argument, value)
-            if consumed:
-                data = data[consumed:]
+        _codec(self.__class__).unmarshal(self, data, offset)
 
     def validate(self) -> None:
         """Validate the frame data ensuring all domains or attributes adhere
@@ -136,6 +247,189 @@ class Frame(_AMQData):
         """
 
 
+class _Codec:
+    """Marshaling and unmarshaling instructions compiled from the attribute
+    list and attribute data types of a :class:`Frame` class.
+
+    Consecutive fixed-width values and bits are packed and unpacked with a
+    single :class:`struct.Struct` while strings and field tables are encoded
+    and decoded by calling the :mod:`pamqp.encode` and :mod:`pamqp.decode`
+    functions for their data type directly.
+
+    :param frame_class: The frame class to compile the codec for
+
+    """
+    __slots__ = ['steps']
+
+    def __init__(self, frame_class: typing.Type[Frame]):
+        self.steps: typing.List[tuple] = []
+        fields: typing.List[typing.Union[str, typing.List[str]]] = []
+        data_types: typing.List[str] = []
+        bits: typing.Optional[typing.List[str]] = None
+        for argument in frame_class.__slots__:
+            data_type = frame_class.amqp_type(argument)
+            if data_type == 'bit':
+                if bits is None or len(bits) == 8:
+                    bits = []
+                    fields.append(bits)
+                    data_types.append(data_type)
+                bits.append(argument)
+                continue
+            bits = None
+            if data_type in _FIXED_WIDTH:
+                fields.append(argument)
+                data_types.append(data_type)
+                continue
+            self._add_fixed_width_step(fields, data_types)
+            fields, data_types = [], []
+            self.steps.append((None, argument, data_type,
+                               encode.METHODS[data_type],
+                               decode.METHODS[data_type]))
+        self._add_fixed_width_step(fields, data_types)
+
+    def marshal(self, frame: Frame) -> bytes:
+        """Encode the attribute values of the frame
+
+        :param frame: The frame to encode
+        :raises: TypeError
+
+        """
+        output = []
+        for packer, fields, data_types, encoder, _decoder in self.steps:
+            if packer is None:
+                output.append(encoder(getattr(frame, fields, 0)))
+                continue
+            values = self._values(frame, fields)
+            try:
+                output.append(packer.pack(*values))
+            except struct.error:  # Raise the encoder error for the value
+                self._raise_encoder_error(values, data_types)
+                raise
+        return b''.join(output)
+
+    def marshal_into(self, frame: Frame,
+                     buffer: typing.Union[bytearray, memoryview],
+                     offset: int) -> int:
+        """Encode the attribute values of the frame into the buffer at the
+        offset, returning the number of bytes written.
+
+        :param frame: The frame to encode
+        :param buffer: The buffer to encode the frame into
+        :param offset: The position in the buffer to encode the frame at
+        :raises: TypeError
+
+        """
+        position = offset
+        for packer, fields, data_types, _encoder, _decoder in self.steps:
+            if packer is None:
+                position += encode.encode_into(
+                    buffer, position, getattr(frame, fields, 0), data_types)
+                continue
+            values = self._values(frame, fields)
+            try:
+                packer.pack_into(buffer, position, *values)
+            except struct.error:  # Raise the encoder error for the value
+                self._raise_encoder_error(values, data_types)
+                raise
+            position += packer.size
+        return position - offset
+
+    def sizeof(self, frame: Frame) -> int:
+        """Return the number of bytes the attribute values of the frame are
+        encoded as.
+
+        :param frame: The frame to size
+
+        """
+        size = 0
+        for packer, fields, data_types, _encoder, _decoder in self.steps:
+            if packer is None:
+                size += encode.sizeof(getattr(frame, fields, 0), data_types)
+            else:
+                size += packer.size
+        return size
+
+    def unmarshal(self, frame: Frame, data: decode.Buffer,
+                  offset: int) -> None:
+        """Decode the data applying the values to the frame
+
+        :param frame: The frame to apply the values to
+        :param data: The raw AMQP frame data
+        :param offset: The position of the frame arguments in the data
+
+        """
+        for packer, fields, _data_types, _encoder, decoder in self.steps:
+            if packer is None:
+                consumed, value = decoder(data, offset)
+                setattr(frame, fields, value)
+                offset += consumed
+                continue
+            for field, value in zip(fields, packer.unpack_from(data, offset)):
+                if field.__class__ is str:
+                    setattr(frame, field, value)
+                else:
+                    for position, argument in enumerate(field):
+                        setattr(frame, argument,
+                                (value & (1 << position)) != 0)
+            offset += packer.size
+
+    @staticmethod
+    def _raise_encoder_error(values: list,
+                             data_types: typing.List[str]) -> None:
+        """Raise the error of the encoder for the first value that the
+        fixed-width data type can not encode.
+
+        :raises: TypeError
+
+        """
+        for value, data_type in zip(values, data_types):
+            encode.by_type(value, _FIXED_WIDTH[data_type][1])
+
+    @staticmethod
+    def _values(frame: Frame, fields: list) -> list:
+        """Return the values of fixed-width fields, packing bits into bytes
+        """
+        values = []
+        for field in fields:
+            if field.__class__ is str:
+                values.append(getattr(frame, field, 0))
+            else:
+                byte = 0
+                for position, argument in enumerate(field):
+                    byte = encode.bit(getattr(frame, argument, 0), byte,
+                                      position)
+                values.append(byte)
+        return values
+
+    def _add_fixed_width_step(self, fields: list,
+                              data_types: typing.List[str]) -> None:
+        """Add a step packing the fixed-width fields with a single struct"""
+        if fields:
+            packer = struct.Struct('>' + ''.join(
+                _FIXED_WIDTH[data_type][0] for data_type in data_types))
+            self.steps.append((packer, fields, data_types, None, None))
+
+
+_FIXED_WIDTH = {
+    'bit': ('B', 'octet'),
+    'long': ('L', 'long'),
+    'longlong': ('q', 'longlong'),
+    'octet': ('B', 'octet'),
+    'short': ('H', 'short'),
+}  # Struct format characters and encoders for fixed-width data types
+
+_CODECS: typing.Dict[type, _Codec] = {}
+
+
+def _codec(frame_class: typing.Type[Frame]) -> _Codec:
+    """Return the codec for the frame class, compiling it on first use"""
+    try:
+        return _CODECS[frame_class]
+    except KeyError:
+        codec = _CODECS[frame_class] = _Codec(frame_class)
+        return codec
+
+
 class BasicProperties(_AMQData):
     """Provide a base object that marshals and unmarshals the Basic.Properties
     object values.
@@ -151,6 +445,26 @@ class BasicProperties(_AMQData):
             getattr(self, k, None) == getattr(other, k, None)
             for k in self.__slots__)
 
+    @staticmethod
+    def encode_flags(flags: int) -> bytes:
+        """Encode the property flags, continuing into additional flag words
+        when there are more than 15 flags.
+
+        :param flags: The property flags to encode
+
+        """
+        flag_pieces = []
+        while True:
+            remainder = flags >> 16
+            partial_flags = flags & 0xFFFE
+            if remainder != 0:  # pragma: nocover
+                partial_flags |= 1
+            flag_pieces.append(struct.pack('>H', partial_flags))
+            flags = remainder
+            if not flags:  # pragma: nocover
+                break
+        return b''.join(flag_pieces)
+
     def encode_property(self, name: str, value: common.FieldValue) -> bytes:
         """Encode a single property value
 
@@ -167,6 +481,31 @@ class BasicProperties(_AMQData):
         data structure needed for the ContentHeader.
 
         """
+        if validate_on_marshal():
+            self.validate()
+        if PROPERTIES_CACHE is not None:
+            return PROPERTIES_CACHE.marshal(self)
+        return self._marshal()
+
+    def freeze(self) -> 'BasicProperties':
+        """Return an immutable copy of the properties that is marshaled once,
+        returning the pre-encoded value each time it is marshaled. The field
+        tables and arrays in the copied headers are read-only.
+
+        """
+        if validate_on_marshal():
+            self.validate()
+        frozen_class = _frozen_class(self.__class__)
+        frozen = frozen_class.__new__(frozen_class)
+        for property_name in self.__slots__:
+            object.__setattr__(
+                frozen, property_name,
+                _freeze(copy.deepcopy(getattr(self, property_name))))
+        object.__setattr__(frozen, '_marshaled', self._marshal())
+        return frozen
+
+    def _marshal(self) -> bytes:
+        """Encode the property flags and values"""
         flags = 0
         parts = []
         for property_name in self.__slots__:
@@ -175,29 +514,26 @@ class BasicProperties(_AMQData):
                 flags = flags | self.flags[property_name]
                 parts.append(
                     self.encode_property(property_name, property_value))
-        flag_pieces = []
-        while True:
-            remainder = flags >> 16
-            partial_flags = flags & 0xFFFE
-            if remainder != 0:  # pragma: nocover
-                partial_flags |= 1
-            flag_pieces.append(struct.pack('>H', partial_flags))
-            flags = remainder
-            if not flags:  # pragma: nocover
-                break
-        return b''.join(flag_pieces + parts)
+        return self.encode_flags(flags) + b''.join(parts)
 
-    def unmarshal(self, flags: int, data: bytes) -> None:
+    def unmarshal(self,
+                  flags: int,
+                  data: decode.Buffer,
+                  offset: int = 0) -> None:
         """Dynamically decode the frame data applying the values to the method
         object by iterating through the attributes in order and decoding them.
 
+        :param flags: The property flags indicating which values are set
+        :param data: The raw AMQP property data
+        :param offset: The position of the property values in the data
+
         """
         for property_name in self.__slots__:
             if flags & self.flags[property_name]:
                 data_type = getattr(self.__class__, '_' + property_name)
-                consumed, value = decode.by_type(data, data_type)
+                consumed, value = decode.METHODS[data_type](data, offset)
                 setattr(self, property_name, value)
-                data = data[consumed:]
+                offset += consumed
 
     def validate(self) -> None:
         """Validate the frame data ensuring all domains or attributes adhere
@@ -211,3 +547,153 @@ class BasicProperties(_AMQData):
         if self.delivery_mode is not None and self.delivery_mode not in [1, 2]:
             raise ValueError('Invalid delivery_mode value: {}'.format(
                 self.delivery_mode))
+
+
+class _FrozenBasicProperties:
+    """Mixin for immutable, pre-encoded Basic.Properties values returned by
+    :meth:`BasicProperties.freeze`.
+
+    """
+    def __copy__(self) -> '_FrozenBasicProperties':
+        return self
+
+    def __deepcopy__(self, memo: dict) -> '_FrozenBasicProperties':
+        return self
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError('{} is frozen'.format(self.name))
+
+    def __setattr__(self, name: str, value: common.FieldValue) -> None:
+        raise AttributeError('{} is frozen'.format(self.name))
+
+    def marshal(self) -> bytes:
+        """Return the pre-encoded properties"""
+        return self._marshaled
+
+
+def _read_only(self: typing.Any, *args: typing.Any,
+               **kwargs: typing.Any) -> typing.NoReturn:
+    """Reject changes to the values of frozen properties"""
+    raise TypeError('{} is frozen'.format(type(self).__name__))
+
+
+class _FrozenDict(dict):
+    """Read-only field table of frozen properties, encoded as a dict"""
+    __delitem__ = __ior__ = __setitem__ = clear = pop = popitem = \
+        setdefault = update = _read_only
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (dict(self),)
+
+
+class _FrozenList(list):
+    """Read-only field array of frozen properties, encoded as a list"""
+    __delitem__ = __iadd__ = __imul__ = __setitem__ = append = clear = \
+        extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (list(self),)
+
+
+def _freeze(value: common.FieldValue) -> common.FieldValue:
+    """Return the value with its field tables and arrays made read-only"""
+    if isinstance(value, dict):
+        return _FrozenDict(
+            [(key, _freeze(item)) for key, item in value.items()])
+    elif isinstance(value, list):
+        return _FrozenList([_freeze(item) for item in value])
+    return value
+
+
+_FROZEN_CLASSES: typing.Dict[type, type] = {}
+
+
+def _frozen_class(properties_class: type) -> type:
+    """Return the frozen variant of a properties class"""
+    try:
+        return _FROZEN_CLASSES[properties_class]
+    except KeyError:
+        value = _FROZEN_CLASSES[properties_class] = type(
+            properties_class.__name__,
+            (_FrozenBasicProperties, properties_class),
+            {'__module__': properties_class.__module__,
+             '__qualname__': properties_class.__qualname__})
+        return value
+
+
+class PropertiesCache:
+    """Least recently used cache of marshaled Basic.Properties values, keyed
+    on the property values.
+
+    :param maxsize: The maximum number of values to cache
+
+    """
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._values: typing.Dict[tuple, bytes] = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached values"""
+        return len(self._values)
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the ratio of cache hits to total lookups"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self) -> None:
+        """Remove all cached values and reset the counters"""
+        self._values.clear()
+        self.hits = self.misses = 0
+
+    def marshal(self, properties: BasicProperties) -> bytes:
+        """Return the marshaled properties, encoding and caching them if
+        they are not in the cache. The field table encoding options are part
+        of the key, so changing them does not return stale values.
+
+        :param properties: The properties to marshal
+
+        """
+        ordered = not encode.SORT_TABLE_KEYS
+        try:
+            key = (properties.__class__, encode.SORT_TABLE_KEYS,
+                   encode.DEPRECATED_RABBITMQ_SUPPORT,
+                   tuple([_cache_key(getattr(properties, property_name),
+                                     ordered)
+                          for property_name in properties.__slots__]))
+            value = self._values[key]
+        except KeyError:
+            self.misses += 1
+            value = self._values[key] = properties._marshal()
+            if len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+            return value
+        except TypeError:  # A property value is not hashable
+            self.misses += 1
+            return properties._marshal()
+        self.hits += 1
+        self._values.move_to_end(key)
+        return value
+
+
+def _cache_key(value: common.FieldValue,
+               ordered: bool = False) -> typing.Hashable:
+    """Return a hashable representation of a property value, including the
+    data types so that values encoded differently do not compare as equal.
+    When field table keys are encoded in insertion order, the order of the
+    keys is part of the key.
+
+    """
+    value_class = value.__class__
+    if value_class is dict:
+        items = [(key, _cache_key(item, ordered))
+                 for key, item in value.items()]
+        return dict, tuple(items) if ordered else frozenset(items)
+    elif value_class is list:
+        return list, tuple([_cache_key(item, ordered) for item in value])
+    elif value_class is bytearray:
+        return bytearray, bytes(value)
+    return value_class, value
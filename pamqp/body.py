@@ -6,30 +6,90 @@ message body will be returned from the library as an instance of the body
 class.
 
 """
+import io
+import mmap
+import tempfile
+import typing
+
+Value = typing.Union[bytes, bytearray, memoryview, mmap.mmap]
+"""Data types that can be used as a message body. When marshaled with
+:func:`pamqp.frame.marshal_segments` the value is sent without being copied.
+
+"""
+
+Source = typing.Union[Value, typing.BinaryIO]
+"""Data types that can be used as a message body, including binary file
+objects which are read from their current position when marshaled.
+
+"""
+
+
+def allocate(size: int, spill_threshold: typing.Optional[int] = None) \
+        -> typing.Union[bytearray, mmap.mmap]:
+    """Allocate a buffer to reassemble a message body of the specified size
+    into. If the size is larger than ``spill_threshold``, the buffer is a
+    memory-mapped anonymous temporary file so that large bodies do not need
+    to be held in memory.
+
+    :param size: The size of the message body
+    :param spill_threshold: The body size above which to use a temporary
+        file, or :data:`None` to always allocate a :class:`bytearray`
+
+    """
+    if spill_threshold is None or size <= spill_threshold:
+        return bytearray(size)
+    with tempfile.TemporaryFile() as handle:
+        handle.truncate(size)
+        return mmap.mmap(handle.fileno(), size)
+
+
+def size(value: Source) -> int:
+    """Return the size of a message body value in bytes. For file objects,
+    this is the number of bytes from the current position to the end of the
+    file.
+
+    :param value: The message body value
+
+    """
+    if isinstance(value, memoryview):
+        return value.nbytes
+    elif not hasattr(value, 'readinto'):
+        return len(value)
+    position = value.tell()
+    end = value.seek(0, io.SEEK_END)
+    value.seek(position)
+    return end - position
 
 
 class ContentBody:
     """ContentBody carries the value for an AMQP message body frame
 
+    If the value is a file object, it is read from its current position when
+    the content body is marshaled. Use :func:`pamqp.frame.stream_body` or
+    :meth:`pamqp.frame.FrameWriter.write_body` to read and marshal it one
+    frame at a time instead.
+
     :param value: The value for the ContentBody frame
 
     """
     name = 'ContentBody'
 
-    def __init__(self, value: bytes):
+    def __init__(self, value: Source):
         """Create a new instance of a ContentBody object"""
         self.value = value
 
     def __len__(self) -> int:
         """Return the length of the content body value"""
-        return len(self.value) if self.value else 0
+        return size(self.value) if self.value else 0
 
-    def marshal(self) -> bytes:
+    def marshal(self) -> Value:
         """Return the marshaled content body. This method is here for API
         compatibility, there is no special marshaling for the payload in a
         content frame.
 
         """
+        if hasattr(self.value, 'readinto'):
+            return self.value.read()
         return self.value
 
     def unmarshal(self, data: bytes) -> None:
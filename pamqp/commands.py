@@ -328,7 +328,8 @@ class Connection:
             self.virtual_host = virtual_host
             self.capabilities = capabilities
             self.insist = insist
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -369,7 +370,8 @@ class Connection:
         def __init__(self, known_hosts: str = '') -> None:
             """Initialize the :class:`Connection.OpenOk` class"""
             self.known_hosts = known_hosts
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -579,7 +581,8 @@ class Channel:
         def __init__(self, out_of_band: str = '0') -> None:
             """Initialize the :class:`Channel.Open` class"""
             self.out_of_band = out_of_band
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -616,7 +619,8 @@ class Channel:
         def __init__(self, channel_id: str = '0') -> None:
             """Initialize the :class:`Channel.OpenOk` class"""
             self.channel_id = channel_id
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -849,7 +853,8 @@ class Exchange:
             self.internal = internal
             self.nowait = nowait
             self.arguments = arguments or {}
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -931,7 +936,8 @@ class Exchange:
             self.exchange = exchange
             self.if_unused = if_unused
             self.nowait = nowait
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -1026,7 +1032,8 @@ class Exchange:
             self.routing_key = routing_key
             self.nowait = nowait
             self.arguments = arguments or {}
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -1127,7 +1134,8 @@ class Exchange:
             self.routing_key = routing_key
             self.nowait = nowait
             self.arguments = arguments or {}
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -1255,7 +1263,8 @@ class Queue:
             self.auto_delete = auto_delete
             self.nowait = nowait
             self.arguments = arguments or {}
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -1312,7 +1321,8 @@ class Queue:
             self.queue = queue
             self.message_count = message_count
             self.consumer_count = consumer_count
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -1392,7 +1402,8 @@ class Queue:
             self.routing_key = routing_key
             self.nowait = nowait
             self.arguments = arguments or {}
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -1471,7 +1482,8 @@ class Queue:
             self.ticket = ticket
             self.queue = queue
             self.nowait = nowait
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -1569,7 +1581,8 @@ class Queue:
             self.if_unused = if_unused
             self.if_empty = if_empty
             self.nowait = nowait
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -1667,7 +1680,8 @@ class Queue:
             self.exchange = exchange
             self.routing_key = routing_key
             self.arguments = arguments or {}
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -1860,7 +1874,8 @@ class Basic:
             self.exclusive = exclusive
             self.nowait = nowait
             self.arguments = arguments or {}
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -2035,7 +2050,8 @@ class Basic:
             self.routing_key = routing_key
             self.mandatory = mandatory
             self.immediate = immediate
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -2102,7 +2118,8 @@ class Basic:
             self.reply_text = reply_text or ''
             self.exchange = exchange or ''
             self.routing_key = routing_key
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -2173,7 +2190,8 @@ class Basic:
             self.redelivered = redelivered or False
             self.exchange = exchange or ''
             self.routing_key = routing_key
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -2233,7 +2251,8 @@ class Basic:
             self.ticket = ticket
             self.queue = queue
             self.no_ack = no_ack
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -2305,7 +2324,8 @@ class Basic:
             self.exchange = exchange or ''
             self.routing_key = routing_key
             self.message_count = message_count
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -2346,7 +2366,8 @@ class Basic:
         def __init__(self, cluster_id: str = '') -> None:
             """Initialize the :class:`Basic.GetEmpty` class"""
             self.cluster_id = cluster_id
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
         def validate(self) -> None:
             """Validate the frame data ensuring all domains or attributes
@@ -2671,7 +2692,8 @@ class Basic:
             self.user_id = user_id
             self.app_id = app_id
             self.cluster_id = cluster_id
-            self.validate()
+            if base.validate_on_construct():
+                self.validate()
 
 
 class Tx:
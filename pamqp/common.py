@@ -55,6 +55,7 @@ class Struct:
     byte = struct.Struct('B')
     double = struct.Struct('>d')
     float = struct.Struct('>f')
+    frame_header = struct.Struct('>BHI')
     integer = struct.Struct('>I')
     uint = struct.Struct('>i')
     long_long_int = struct.Struct('>q')
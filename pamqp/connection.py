@@ -0,0 +1,316 @@
+# -*- encoding: utf-8 -*-
+"""
+The :py:mod:`pamqp.connection` module contains a sans-IO implementation of
+the AMQP connection and channel state machines. The
+:class:`~pamqp.connection.Connection` class performs no I/O itself. Data
+received from the socket is passed to
+:meth:`~pamqp.connection.Connection.data_received`, which returns the frames
+that were received, and the data to send to the broker is retrieved by
+calling :meth:`~pamqp.connection.Connection.data_to_send`.
+
+The connection negotiation (``Connection.Start`` → ``Connection.StartOk``
+→ ``Connection.Tune`` → ``Connection.TuneOk`` → ``Connection.Open``) is
+handled automatically, as are the responses to ``Connection.Close`` and
+``Channel.Close`` sent by the broker. Synchronous methods are tracked per
+channel, matching responses against the ``valid_responses`` of the pending
+method, and a synchronous method is held back until the response to the
+previous one has been received.
+
+"""
+import collections
+import functools
+import logging
+import typing
+
+from pamqp import (base, commands, common, constants, exceptions, frame,
+                   header, heartbeat)
+
+LOGGER = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+CLOSING = 'closing'
+OPEN = 'open'
+OPENING = 'opening'
+STARTING = 'starting'
+TUNING = 'tuning'
+
+
+class Channel:
+    """Track the state of a channel and its pending synchronous method
+
+    Channels are created with :meth:`Connection.open_channel` and should not
+    be created directly.
+
+    :param connection: The connection the channel belongs to
+    :param channel_id: The channel id
+
+    """
+    def __init__(self, connection: 'Connection', channel_id: int):
+        self.connection = connection
+        self.channel_id = channel_id
+        self.state = CLOSED
+        self._pending: typing.Optional[base.Frame] = None
+        self._blocked: typing.Deque[base.Frame] = collections.deque()
+
+    @property
+    def pending(self) -> typing.Optional[base.Frame]:
+        """Return the synchronous method awaiting a response, if any"""
+        return self._pending
+
+    def send(self, frame_value: frame.FrameTypes) -> None:
+        """Send a frame on the channel. If a synchronous method is awaiting a
+        response, the next synchronous method and every frame sent after it
+        are held back until the response is received, so frames are always
+        sent in order.
+
+        :param frame_value: The frame to send
+        :raises: pamqp.exceptions.AMQPChannelError
+
+        """
+        if self.state == CLOSED and not isinstance(frame_value,
+                                                   commands.Channel.Open):
+            raise exceptions.AMQPChannelError(
+                'Channel {} is closed'.format(self.channel_id))
+        held_back = self._pending is not None and \
+            _awaits_response(frame_value)
+        if self._blocked or held_back:
+            self._blocked.append(frame_value)
+            return
+        self._send(frame_value)
+
+    def receive(self, frame_value: frame.FrameTypes) -> None:
+        """Process a frame received on the channel. Frames that are not a
+        response to the pending synchronous method are ignored.
+
+        :param frame_value: The frame that was received
+
+        """
+        if isinstance(frame_value, commands.Channel.Close):
+            self._closed()
+            self.connection.send(commands.Channel.CloseOk(), self.channel_id)
+        elif isinstance(frame_value, commands.Channel.Flow):
+            self.connection.send(
+                commands.Channel.FlowOk(frame_value.active), self.channel_id)
+        elif self._pending is not None and \
+                frame_value.name in _responses(self._pending.__class__):
+            self._response(frame_value)
+
+    def _closed(self) -> None:
+        """Mark the channel as closed, discarding held back methods"""
+        self.state = CLOSED
+        self._pending = None
+        self._blocked.clear()
+        self.connection.channels.pop(self.channel_id, None)
+
+    def _response(self, frame_value: base.Frame) -> None:
+        """Process the response to the pending synchronous method, sending
+        the held back frames up to and including the next synchronous method.
+
+        """
+        self._pending = None
+        if isinstance(frame_value, commands.Channel.OpenOk):
+            self.state = OPEN
+        elif isinstance(frame_value, commands.Channel.CloseOk):
+            self._closed()
+            return
+        while self._blocked and self._pending is None:
+            self._send(self._blocked.popleft())
+
+    def _send(self, frame_value: frame.FrameTypes) -> None:
+        """Send a frame, recording it as pending if it awaits a response"""
+        if _awaits_response(frame_value):
+            self._pending = frame_value
+        self.connection.send(frame_value, self.channel_id)
+
+
+class Connection:
+    """Sans-IO AMQP connection state machine
+
+    :param username: The username to authenticate with
+    :param password: The password to authenticate with
+    :param virtual_host: The virtual host to open
+    :param client_properties: The client properties to send to the broker
+    :param channel_max: The maximum number of channels, ``0`` for no limit
+    :param frame_max: The maximum frame size, ``0`` for no limit
+    :param heartbeat: The heartbeat interval in seconds, :data:`None` to use
+        the interval proposed by the broker or ``0`` to disable heartbeats
+    :param locale: The message locale
+
+    """
+    def __init__(self,
+                 username: str = constants.DEFAULT_USER,
+                 password: str = constants.DEFAULT_PASS,
+                 virtual_host: str = constants.DEFAULT_VHOST,
+                 client_properties: common.Arguments = None,
+                 channel_max: int = 0,
+                 frame_max: int = constants.FRAME_MAX_SIZE,
+                 heartbeat: typing.Optional[int] = None,
+                 locale: str = 'en_US'):
+        self.username = username
+        self.password = password
+        self.virtual_host = virtual_host
+        self.client_properties = client_properties or {}
+        self.channel_max = channel_max
+        self.frame_max = frame_max
+        self.heartbeat = heartbeat
+        self.locale = locale
+        self.blocked = False
+        self.channels: typing.Dict[int, Channel] = {}
+        self.server_properties: common.FieldTable = {}
+        self.state = CLOSED
+        self._reader = frame.FrameReader()
+        self._writer = frame.FrameWriter()
+
+    def close(self,
+              reply_code: int = constants.REPLY_SUCCESS,
+              reply_text: str = 'Normal shutdown') -> None:
+        """Start closing the connection
+
+        :param reply_code: The reply code
+        :param reply_text: The reply text
+
+        """
+        self.state = CLOSING
+        self.send(commands.Connection.Close(reply_code, reply_text, 0, 0), 0)
+
+    def connect(self) -> None:
+        """Start the connection negotiation by sending the protocol header"""
+        self.state = STARTING
+        self.send(header.ProtocolHeader(), 0)
+
+    def data_received(self, data: bytes) \
+            -> typing.List[typing.Tuple[int, frame.FrameTypes]]:
+        """Process data received from the broker, returning the frames that
+        were received as a list of channel id and frame tuples.
+
+        :param data: The data that was received
+        :raises: pamqp.exceptions.UnmarshalingException
+        :raises: pamqp.exceptions.AMQPFrameError
+        :raises: pamqp.exceptions.AMQPUnexpectedFrame
+
+        """
+        self._reader.feed(data)
+        received = []
+        for channel_id, frame_value in self._reader:
+            if channel_id == 0:
+                self._receive(frame_value)
+            elif channel_id in self.channels:
+                self.channels[channel_id].receive(frame_value)
+            received.append((channel_id, frame_value))
+        return received
+
+    def data_to_send(self) -> bytearray:
+        """Return the data to send to the broker"""
+        return self._writer.detach()
+
+    def open_channel(self, channel_id: typing.Optional[int] = None) \
+            -> Channel:
+        """Open a channel, using the lowest available channel id if one is
+        not specified.
+
+        :param channel_id: The channel id to use
+        :raises: pamqp.exceptions.AMQPChannelError
+
+        """
+        if self.state != OPEN:
+            raise exceptions.AMQPChannelError('Connection is not open')
+        channel_max = self.channel_max or 65535
+        if channel_id is None:
+            channel_id = next(
+                (value for value in range(1, channel_max + 1)
+                 if value not in self.channels), 0)
+        if not 0 < channel_id <= channel_max or channel_id in self.channels:
+            raise exceptions.AMQPChannelError(
+                'Channel id {} is not available'.format(channel_id))
+        channel = self.channels[channel_id] = Channel(self, channel_id)
+        channel.send(commands.Channel.Open())
+        channel.state = OPENING
+        return channel
+
+    def send(self, frame_value: frame.FrameTypes, channel_id: int) -> None:
+        """Marshal a frame to be sent to the broker
+
+        :param frame_value: The frame to send
+        :param channel_id: The channel to send the frame on
+
+        """
+        self._writer.write(frame_value, channel_id)
+
+    def _receive(self, frame_value: frame.FrameTypes) -> None:
+        """Process a frame received on channel 0
+
+        :raises: pamqp.exceptions.AMQPUnexpectedFrame
+
+        """
+        if isinstance(frame_value, heartbeat.Heartbeat):
+            return
+        elif isinstance(frame_value, commands.Connection.Start) and \
+                self.state == STARTING:
+            self.server_properties = frame_value.server_properties
+            self.state = TUNING
+            self.send(
+                commands.Connection.StartOk(
+                    client_properties=self.client_properties,
+                    response='\0{}\0{}'.format(self.username, self.password),
+                    locale=self.locale), 0)
+        elif isinstance(frame_value, commands.Connection.Tune) and \
+                self.state == TUNING:
+            self.channel_max = _negotiate(self.channel_max,
+                                          frame_value.channel_max)
+            self.frame_max = _negotiate(self.frame_max,
+                                        frame_value.frame_max)
+            if self.heartbeat is None:
+                self.heartbeat = frame_value.heartbeat
+            elif self.heartbeat:  # 0 disables heartbeats
+                self.heartbeat = _negotiate(self.heartbeat,
+                                            frame_value.heartbeat)
+            self._reader.channel_max = self._writer.channel_max = \
+                self.channel_max
+            self._reader.frame_max = self._writer.frame_max = self.frame_max
+            self.state = OPENING
+            self.send(
+                commands.Connection.TuneOk(self.channel_max, self.frame_max,
+                                           self.heartbeat), 0)
+            self.send(commands.Connection.Open(self.virtual_host), 0)
+        elif isinstance(frame_value, commands.Connection.OpenOk) and \
+                self.state == OPENING:
+            self.state = OPEN
+        elif isinstance(frame_value, commands.Connection.Close):
+            self._closed()
+            self.send(commands.Connection.CloseOk(), 0)
+        elif isinstance(frame_value, commands.Connection.CloseOk) and \
+                self.state == CLOSING:
+            self._closed()
+        elif isinstance(frame_value, commands.Connection.Blocked):
+            self.blocked = True
+        elif isinstance(frame_value, commands.Connection.Unblocked):
+            self.blocked = False
+        else:
+            raise exceptions.AMQPUnexpectedFrame(frame_value)
+
+    def _closed(self) -> None:
+        """Mark the connection and all of its channels as closed"""
+        self.state = CLOSED
+        for channel in list(self.channels.values()):
+            channel._closed()
+
+
+def _awaits_response(frame_value: frame.FrameTypes) -> bool:
+    """Return if the frame is a synchronous method the peer will respond to
+    """
+    return isinstance(frame_value, base.Frame) and \
+        frame_value.synchronous and \
+        not getattr(frame_value, 'nowait', False)
+
+
+def _negotiate(client_value: int, server_value: int) -> int:
+    """Negotiate a value where 0 means there is no limit"""
+    if not client_value or not server_value:
+        return client_value or server_value
+    return min(client_value, server_value)
+
+
+@functools.lru_cache(maxsize=None)
+def _responses(frame_class: type) -> typing.FrozenSet[str]:
+    """Return the names of the valid responses for a method class"""
+    return frozenset(getattr(frame_class, 'valid_responses', []))
@@ -3,21 +3,68 @@
 Functions for decoding data of various types including field tables and arrays
 
 """
+import collections.abc
 import datetime
 import decimal as _decimal
+import struct
+import threading
 import typing
 
 from pamqp import common
 
+Buffer = typing.Union[bytes, bytearray, memoryview]
+"""Binary data types that values can be decoded from"""
 
-def by_type(value: bytes,
+LAZY_FIELD_TABLES = False
+"""Toggle decoding field table values when they are first accessed."""
+
+SHORT_STRING_CACHE: typing.Optional['StringCache'] = None
+"""The cache of decoded short strings and field table keys, if enabled."""
+
+
+def cache_short_strings(maxsize: int = 1024) \
+        -> typing.Optional['StringCache']:
+    """Toggle caching of decoded short strings and field table keys
+
+    When enabled, exchange names, routing keys, consumer tags and field table
+    keys that were recently decoded are returned from the cache instead of
+    being decoded again, sharing a single :class:`str` object between all of
+    the values decoded from the same data. The cache is returned so that its
+    hit and miss counters can be used to tune its size.
+
+    :param maxsize: The maximum number of values to cache, ``0`` disables
+        the cache
+
+    """
+    global SHORT_STRING_CACHE
+
+    SHORT_STRING_CACHE = StringCache(maxsize) if maxsize > 0 else None
+    return SHORT_STRING_CACHE
+
+
+def lazy_field_tables(enabled: bool = True) -> None:
+    """Toggle the lazy decoding of field tables
+
+    If called with `True`, :func:`field_table` will return a
+    :class:`LazyFieldTable` that only decodes a value when it is first
+    accessed instead of a :class:`dict`.
+
+    :param enabled: Specify if field tables are decoded lazily
+
+    """
+    global LAZY_FIELD_TABLES
+
+    LAZY_FIELD_TABLES = enabled
+
+
+def by_type(value: Buffer,
             data_type: str,
             offset: int = 0) -> typing.Tuple[int, common.FieldValue]:
     """Decodes values using the specified type
 
     :param value: The binary value to decode
     :param data_type: The data type name of the value
-    :param offset: The starting position of the data in the byte stream
+    :param offset: The position of the bit when decoding a bit value
     :rtype: :class:`tuple` (:class:`int`, :const:`pamqp.common.FieldValue`)
     :raises ValueError: when the data type is unknown
 
@@ -30,254 +77,280 @@ def by_type(value: bytes,
     return decoder(value)
 
 
-def bit(value: bytes, position: int) -> typing.Tuple[int, bool]:
+def bit(value: Buffer, position: int,
+        offset: int = 0) -> typing.Tuple[int, bool]:
     """Decode a bit value, returning bytes consumed and the value.
 
     :param value: The binary value to decode
     :param position: The position in the byte of the bit value
+    :param offset: The position of the byte in the binary value
     :rtype: :class:`tuple` (:class:`int`, :class:`bool`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
-    bit_buffer = common.Struct.byte.unpack_from(value)[0]
+    bit_buffer = common.Struct.byte.unpack_from(value, offset)[0]
     try:
         return 0, (bit_buffer & (1 << position)) != 0
     except TypeError:
         raise ValueError('Could not unpack bit value')
 
 
-def boolean(value: bytes) -> typing.Tuple[int, bool]:
+def boolean(value: Buffer, offset: int = 0) -> typing.Tuple[int, bool]:
     """Decode a boolean value, returning bytes consumed and the value.
 
     :param value: The binary value to decode
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :class:`bool`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
     try:
-        return 1, bool(common.Struct.byte.unpack_from(value[0:1])[0])
+        return 1, bool(common.Struct.byte.unpack_from(value, offset)[0])
     except TypeError:
         raise ValueError('Could not unpack boolean value')
 
 
-def byte_array(value: bytes) -> typing.Tuple[int, bytearray]:
+def byte_array(value: Buffer, offset: int = 0) -> typing.Tuple[int, bytearray]:
     """Decode a byte_array value, returning bytes consumed and the value.
 
     :param value: The binary value to decode
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :class:`bytearray`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
     try:
-        length = common.Struct.integer.unpack(value[0:4])[0]
-        return length + 4, bytearray(value[4:length + 4])
+        length = common.Struct.integer.unpack_from(value, offset)[0]
+        return length + 4, bytearray(value[offset + 4:offset + length + 4])
     except TypeError:
         raise ValueError('Could not unpack byte array value')
 
 
-def decimal(value: bytes) -> typing.Tuple[int, _decimal.Decimal]:
+def decimal(value: Buffer, offset: int = 0) \
+        -> typing.Tuple[int, _decimal.Decimal]:
     """Decode a decimal value, returning bytes consumed and the value.
 
     :param value: The binary value to decode
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :class:`decimal.Decimal`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
     try:
-        decimals = common.Struct.byte.unpack(value[0:1])[0]
-        raw = common.Struct.integer.unpack(value[1:5])[0]
+        decimals = common.Struct.byte.unpack_from(value, offset)[0]
+        raw = common.Struct.integer.unpack_from(value, offset + 1)[0]
         return 5, _decimal.Decimal(raw) * (_decimal.Decimal(10)**-decimals)
     except TypeError:
         raise ValueError('Could not unpack decimal value')
 
 
-def double(value: bytes) -> typing.Tuple[int, float]:
+def double(value: Buffer, offset: int = 0) -> typing.Tuple[int, float]:
     """Decode a double value, returning bytes consumed and the value.
 
     :param value: The binary value to decode
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :class:`float`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
     try:
-        return 8, common.Struct.double.unpack_from(value)[0]
+        return 8, common.Struct.double.unpack_from(value, offset)[0]
     except TypeError:
         raise ValueError('Could not unpack double value')
 
 
-def floating_point(value: bytes) -> typing.Tuple[int, float]:
+def floating_point(value: Buffer, offset: int = 0) -> typing.Tuple[int, float]:
     """Decode a floating point value, returning bytes consumed and the value.
 
     :param value: The binary value to decode
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :class:`float`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
     try:
-        return 4, common.Struct.float.unpack_from(value)[0]
+        return 4, common.Struct.float.unpack_from(value, offset)[0]
     except TypeError:
         raise ValueError('Could not unpack floating point value')
 
 
-def long_int(value: bytes) -> typing.Tuple[int, int]:
+def long_int(value: Buffer, offset: int = 0) -> typing.Tuple[int, int]:
     """Decode a long integer value, returning bytes consumed and the value.
 
     :param value: The binary value to decode
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :class:`int`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
     try:
-        return 4, common.Struct.long.unpack(value[0:4])[0]
+        return 4, common.Struct.long.unpack_from(value, offset)[0]
     except TypeError:
         raise ValueError('Could not unpack long integer value')
 
 
-def long_uint(value: bytes) -> typing.Tuple[int, int]:
+def long_uint(value: Buffer, offset: int = 0) -> typing.Tuple[int, int]:
     """Decode an unsigned long integer value, returning bytes consumed and
     the value.
 
     :param value: The binary value to decode
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :class:`int`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
     try:
-        return 4, common.Struct.ulong.unpack(value[0:4])[0]
+        return 4, common.Struct.ulong.unpack_from(value, offset)[0]
     except TypeError:
         raise ValueError('Could not unpack unsigned long integer value')
 
 
-def long_long_int(value: bytes) -> typing.Tuple[int, int]:
+def long_long_int(value: Buffer, offset: int = 0) -> typing.Tuple[int, int]:
     """Decode a long-long integer value, returning bytes consumed and the
     value.
 
     :param value: The binary value to decode
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :class:`int`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
     try:
-        return 8, common.Struct.long_long_int.unpack(value[0:8])[0]
+        return 8, common.Struct.long_long_int.unpack_from(value, offset)[0]
     except TypeError:
         raise ValueError('Could not unpack long-long integer value')
 
 
-def long_str(value: bytes) -> typing.Tuple[int, typing.Union[str, bytes]]:
+def long_str(value: Buffer, offset: int = 0) \
+        -> typing.Tuple[int, typing.Union[str, bytes]]:
     """Decode a string value, returning bytes consumed and the value.
 
     :param value: The binary value to decode
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :class:`str`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
     try:
-        length = common.Struct.integer.unpack(value[0:4])[0]
-        return length + 4, value[4:length + 4].decode('utf-8')
+        length = common.Struct.integer.unpack_from(value, offset)[0]
+        raw = value[offset + 4:offset + length + 4]
+        return length + 4, str(raw, 'utf-8')
     except TypeError:
         raise ValueError('Could not unpack long string value')
     except UnicodeDecodeError:
-        return length + 4, value[4:length + 4]
+        return length + 4, bytes(raw)
 
 
-def octet(value: bytes) -> typing.Tuple[int, int]:
+def octet(value: Buffer, offset: int = 0) -> typing.Tuple[int, int]:
     """Decode an octet value, returning bytes consumed and the value.
 
     :param value: The binary value to decode
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :class:`int`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
     try:
-        return 1, common.Struct.byte.unpack(value[0:1])[0]
+        return 1, common.Struct.byte.unpack_from(value, offset)[0]
     except TypeError:
         raise ValueError('Could not unpack octet value')
 
 
-def short_int(value: bytes) -> typing.Tuple[int, int]:
+def short_int(value: Buffer, offset: int = 0) -> typing.Tuple[int, int]:
     """Decode a short integer value, returning bytes consumed and the value.
 
     :param value: The binary value to decode
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :class:`int`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
     try:
-        return 2, common.Struct.short.unpack_from(value[0:2])[0]
+        return 2, common.Struct.short.unpack_from(value, offset)[0]
     except TypeError:
         raise ValueError('Could not unpack short integer value')
 
 
-def short_uint(value: bytes) -> typing.Tuple[int, int]:
+def short_uint(value: Buffer, offset: int = 0) -> typing.Tuple[int, int]:
     """Decode an unsigned short integer value, returning bytes consumed and
     the value.
 
     :param value: The binary value to decode
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :class:`int`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
     try:
-        return 2, common.Struct.ushort.unpack_from(value[0:2])[0]
+        return 2, common.Struct.ushort.unpack_from(value, offset)[0]
     except TypeError:
         raise ValueError('Could not unpack unsigned short integer value')
 
 
-def short_short_int(value: bytes) -> typing.Tuple[int, int]:
+def short_short_int(value: Buffer, offset: int = 0) -> typing.Tuple[int, int]:
     """Decode a short-short integer value, returning bytes consumed and the
     value.
 
     :param value: The binary value to decode
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :class:`int`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
     try:
-        return 1, common.Struct.short_short_int.unpack_from(value[0:1])[0]
+        return 1, common.Struct.short_short_int.unpack_from(value, offset)[0]
     except TypeError:
         raise ValueError('Could not unpack short-short integer value')
 
 
-def short_short_uint(value: bytes) -> typing.Tuple[int, int]:
+def short_short_uint(value: Buffer, offset: int = 0) \
+        -> typing.Tuple[int, int]:
     """Decode a unsigned short-short integer value, returning bytes consumed
     and the value.
 
     :param value: The binary value to decode
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :class:`int`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
     try:
-        return 1, common.Struct.short_short_uint.unpack_from(value[0:1])[0]
+        return 1, common.Struct.short_short_uint.unpack_from(value, offset)[0]
     except TypeError:
         raise ValueError('Could not unpack unsigned short-short integer value')
 
 
-def short_str(value: bytes) -> typing.Tuple[int, str]:
+def short_str(value: Buffer, offset: int = 0) -> typing.Tuple[int, str]:
     """Decode a string value, returning bytes consumed and the value.
 
     :param value: The binary value to decode
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :class:`str`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
     try:
-        length = common.Struct.byte.unpack(value[0:1])[0]
-        return length + 1, value[1:length + 1].decode('utf-8')
+        length = common.Struct.byte.unpack_from(value, offset)[0]
     except TypeError:
         raise ValueError('Could not unpack short string value')
+    data = value[offset + 1:offset + length + 1]
+    if SHORT_STRING_CACHE is None:
+        return length + 1, str(data, 'utf-8')
+    return length + 1, SHORT_STRING_CACHE.decode(data)
 
 
-def timestamp(value: bytes) -> typing.Tuple[int, datetime.datetime]:
+def timestamp(value: Buffer, offset: int = 0) \
+        -> typing.Tuple[int, datetime.datetime]:
     """Decode a timestamp value, returning bytes consumed and the value.
 
     :param value: The binary value to decode
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :class:`datetime.datetime`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
     try:
-        temp = common.Struct.timestamp.unpack(value[0:8])
+        temp = common.Struct.timestamp.unpack_from(value, offset)
         ts_value = temp[0]
 
         # Anything above the year 2106 is likely milliseconds
@@ -289,75 +362,222 @@ def timestamp(value: bytes) -> typing.Tuple[int, datetime.datetime]:
         raise ValueError('Could not unpack timestamp value')
 
 
-def embedded_value(value: bytes) -> typing.Tuple[int, common.FieldValue]:
+def embedded_value(value: Buffer, offset: int = 0) \
+        -> typing.Tuple[int, common.FieldValue]:
     """Dynamically decode a value based upon the starting byte
 
     :param value: The binary value to decode
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :const:`pamqp.common.FieldValue`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
-    if not value:
+    if not value or offset >= len(value):
         return 0, None
     try:
-        bytes_consumed, temp = TABLE_MAPPING[value[0:1]](value[1:])
+        decoder = _TABLE_TYPES[value[offset]]
     except KeyError:
-        raise ValueError('Unknown type: {!r}'.format(value[:1]))
+        raise ValueError('Unknown type: {!r}'.format(
+            bytes(value[offset:offset + 1])))
+    bytes_consumed, temp = decoder(value, offset + 1)
     return bytes_consumed + 1, temp
 
 
-def field_array(value: bytes) -> typing.Tuple[int, common.FieldArray]:
+def field_array(value: Buffer, offset: int = 0) \
+        -> typing.Tuple[int, common.FieldArray]:
     """Decode a field array value, returning bytes consumed and the value.
 
     :param value: The binary value to decode
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :const:`pamqp.common.FieldArray`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
     try:
-        length = common.Struct.integer.unpack(value[0:4])[0]
-        offset = 4
+        length = common.Struct.integer.unpack_from(value, offset)[0]
+        position = offset + 4
         data = []
-        field_array_end = offset + length
-        while offset < field_array_end:
-            consumed, result = embedded_value(value[offset:])
-            offset += consumed
+        field_array_end = position + length
+        while position < field_array_end:
+            consumed, result = embedded_value(value, position)
+            position += consumed
             data.append(result)
-        return offset, data
+        return position - offset, data
     except TypeError:
         raise ValueError('Could not unpack data')
 
 
-def field_table(value: bytes) -> typing.Tuple[int, common.FieldTable]:
-    """Decode a field array value, returning bytes consumed and the value.
+def field_table(value: Buffer, offset: int = 0) \
+        -> typing.Tuple[int, common.FieldTable]:
+    """Decode a field table value, returning bytes consumed and the value.
+
+    If lazy decoding is enabled with :func:`lazy_field_tables`, the value is
+    returned as a :class:`LazyFieldTable`.
 
     :param value: The binary value to decode
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :const:`pamqp.common.FieldTable`)
     :raises ValueError: when the binary data can not be unpacked
 
     """
+    if LAZY_FIELD_TABLES:
+        table = LazyFieldTable(value, offset)
+        return len(table.encoded), table
     try:
-        length = common.Struct.integer.unpack(value[0:4])[0]
-        offset = 4
+        length = common.Struct.integer.unpack_from(value, offset)[0]
+        position = offset + 4
         data = {}
-        field_table_end = offset + length
-        while offset < field_table_end:
-            key_length = common.Struct.byte.unpack_from(value, offset)[0]
-            offset += 1
-            key = value[offset:offset + key_length].decode('utf-8')
-            offset += key_length
-            consumed, result = embedded_value(value[offset:])
-            offset += consumed
+        field_table_end = position + length
+        while position < field_table_end:
+            key_length = common.Struct.byte.unpack_from(value, position)[0]
+            position += 1
+            key = value[position:position + key_length]
+            key = str(key, 'utf-8') if SHORT_STRING_CACHE is None \
+                else SHORT_STRING_CACHE.decode(key)
+            position += key_length
+            consumed, result = embedded_value(value, position)
+            position += consumed
             data[key] = result
-        return field_table_end, data
+        return field_table_end - offset, data
     except TypeError:
         raise ValueError('Could not unpack data')
 
 
-def void(_: bytes) -> typing.Tuple[int, None]:
+class LazyFieldTable(collections.abc.Mapping):
+    """Read-only field table that decodes values when they are accessed
+
+    The keys of the table and the offsets of their values are indexed when
+    the table is created, but the values are only decoded the first time
+    they are accessed. As the table can not be modified, it is encoded by
+    :func:`pamqp.encode.field_table` by writing out the data it was decoded
+    from.
+
+    :param value: The binary value to decode
+    :param offset: The position of the field table in the binary value
+    :raises ValueError: when the binary data can not be unpacked
+    :raises struct.error: when the binary data is truncated
+
+    """
+    __slots__ = ['encoded', '_offsets', '_values']
+
+    def __init__(self, value: Buffer, offset: int = 0):
+        try:
+            length = common.Struct.integer.unpack_from(value, offset)[0]
+        except TypeError:
+            raise ValueError('Could not unpack data')
+        self.encoded = bytes(value[offset:offset + length + 4])
+        self._offsets: typing.Dict[str, int] = {}
+        self._values: common.FieldTable = {}
+        position, end = 4, length + 4
+        if len(self.encoded) < end:
+            raise struct.error('Field table data is truncated')
+        while position < end:
+            key_length = self.encoded[position]
+            position += 1
+            if position + key_length >= end:
+                raise struct.error('Field table data is truncated')
+            key = self.encoded[position:position + key_length]
+            key = str(key, 'utf-8') if SHORT_STRING_CACHE is None \
+                else SHORT_STRING_CACHE.decode(key)
+            position += key_length
+            self._offsets[key] = position
+            try:
+                size = _TABLE_SIZES[self.encoded[position]]
+            except KeyError:
+                raise ValueError('Unknown type: {!r}'.format(
+                    self.encoded[position:position + 1]))
+            if size is None:  # The value has a long integer length prefix
+                size = common.Struct.integer.unpack_from(
+                    self.encoded, position + 1)[0] + 4
+            position += size + 1
+        if position > end:
+            raise struct.error('Field table data is truncated')
+
+    def __getitem__(self, key: str) -> common.FieldValue:
+        """Return the value for the key, decoding it on first access
+
+        :raises: KeyError
+
+        """
+        try:
+            return self._values[key]
+        except KeyError:
+            value = self._values[key] = embedded_value(
+                self.encoded, self._offsets[key])[1]
+            return value
+
+    def __iter__(self) -> typing.Iterator[str]:
+        """Iterate over the keys of the table"""
+        return iter(self._offsets)
+
+    def __len__(self) -> int:
+        """Return the number of keys in the table"""
+        return len(self._offsets)
+
+    def __repr__(self) -> str:
+        """Return the representation of the table"""
+        return '<LazyFieldTable {!r}>'.format(dict(self))
+
+
+class StringCache:
+    """Bounded cache of decoded UTF-8 strings keyed on their encoded value.
+    When the cache is full, the oldest value is removed.
+
+    :param maxsize: The maximum number of values to cache
+
+    """
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._values: typing.Dict[bytes, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached values"""
+        return len(self._values)
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the ratio of cache hits to total lookups"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self) -> None:
+        """Remove all cached values and reset the counters"""
+        with self._lock:
+            self._values.clear()
+        self.hits = self.misses = 0
+
+    def decode(self, value: Buffer) -> str:
+        """Return the decoded string for the value, decoding and caching it if
+        it is not in the cache.
+
+        :param value: The UTF-8 encoded string
+        :raises UnicodeDecodeError: when the value is not valid UTF-8
+
+        """
+        key = bytes(value)
+        try:
+            result = self._values[key]
+        except KeyError:
+            self.misses += 1
+            result = key.decode('ascii') if key.isascii() \
+                else key.decode('utf-8')
+            with self._lock:  # Only one thread may evict the oldest value
+                if len(self._values) >= self.maxsize:
+                    del self._values[next(iter(self._values))]
+                self._values[key] = result
+            return result
+        self.hits += 1
+        return result
+
+
+def void(_: Buffer, offset: int = 0) -> typing.Tuple[int, None]:
     """Return a void, no data to decode
 
     :param _: The empty bytes object to ignore
+    :param offset: The position of the value in the binary value
     :rtype: :class:`tuple` (:class:`int`, :const:`None`)
 
     """
@@ -405,3 +625,29 @@ TABLE_MAPPING = {
     b'\x00': void,  # While not documented, have seen this in the wild
     b'x': byte_array,
 }  # Define a mapping for use in `field_array()` and `field_table()`
+
+# Allow for embedded value types to be looked up by their ordinal value
+_TABLE_TYPES = {key[0]: decoder for key, decoder in TABLE_MAPPING.items()}
+
+# Encoded sizes of embedded values by type, None if length prefixed
+_TABLE_SIZES: typing.Dict[int, typing.Optional[int]] = {
+    ord('t'): 1,
+    ord('b'): 1,
+    ord('B'): 1,
+    ord('s'): 2,
+    ord('u'): 2,
+    ord('I'): 4,
+    ord('i'): 4,
+    ord('l'): 8,
+    ord('L'): 8,
+    ord('f'): 4,
+    ord('d'): 8,
+    ord('D'): 5,
+    ord('S'): None,
+    ord('A'): None,
+    ord('T'): 8,
+    ord('F'): None,
+    ord('V'): 0,
+    0: 0,
+    ord('x'): None,
+}
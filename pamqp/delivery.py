@@ -0,0 +1,365 @@
+# -*- encoding: utf-8 -*-
+"""
+The :py:mod:`pamqp.delivery` module contains helpers for tracking the
+delivery tags of the messages received and published on a channel.
+
+:class:`~pamqp.delivery.AckCoalescer` collects the acknowledgements for the
+messages delivered to a consumer and settles contiguous ranges of delivery
+tags with a single ``Basic.Ack`` or ``Basic.Nack`` frame with ``multiple``
+set. It does not perform any I/O or keep any timers of its own: each method
+returns the ``(channel_id, frame)`` tuples to send, and
+:meth:`~pamqp.delivery.AckCoalescer.poll` should be called periodically to
+flush acknowledgements that have been held longer than ``max_delay``.
+
+.. code-block:: python
+
+    coalescer = delivery.AckCoalescer(max_batch=256, max_delay=0.05)
+    for channel_id, frame_value in coalescer.ack(1, delivery_tag):
+        writer.write(frame_value, channel_id)
+
+:class:`~pamqp.delivery.ConfirmTracker` tracks the messages published on a
+channel in publisher confirm mode, resolving the ``Basic.Ack`` and
+``Basic.Nack`` frames sent by the broker to the ranges of delivery tags they
+confirm.
+
+.. code-block:: python
+
+    tracker = delivery.ConfirmTracker()
+    tracker.publish(lambda tag, acked: future.set_result(acked))
+    writer.write_message(1, 'exchange', 'routing-key', properties, body,
+                         frame_max)
+    ...
+    tracker.process(frame_value)  # When Basic.Ack or Basic.Nack is received
+
+"""
+import bisect
+import time
+import typing
+
+from pamqp import commands
+
+ConfirmCallback = typing.Callable[[int, bool], typing.Any]
+
+Settlement = typing.Tuple[int, typing.Union[commands.Basic.Ack,
+                                            commands.Basic.Nack]]
+
+_ACK = 1
+_NACK = 2
+_REQUEUE = 3
+_SENT = 0
+
+
+class _ChannelAcks:
+    """The delivery tags settled on a channel that have not been sent yet"""
+    __slots__ = ['base', 'pending', 'settled', 'since']
+
+    def __init__(self):
+        self.base = 0
+        self.pending = 0
+        self.settled: typing.Dict[int, int] = {}
+        self.since: typing.Optional[float] = None
+
+
+class AckCoalescer:
+    """Coalesce the acknowledgements of delivered messages into as few
+    ``Basic.Ack`` and ``Basic.Nack`` frames as possible.
+
+    Settled delivery tags are held per channel. When they are flushed, each
+    contiguous range of tags above the last tag sent that share the same
+    disposition is settled with a single frame with ``multiple`` set. Tags
+    that are still separated from that range by unsettled tags are settled
+    individually.
+
+    A channel is flushed when ``max_batch`` tags are pending, when the
+    oldest pending tag was settled ``max_delay`` seconds ago or when a tag
+    closes the gap in front of tags that were settled out of order.
+
+    :param max_batch: The number of pending tags that triggers a flush
+    :param max_delay: The number of seconds a settled tag may be held for
+
+    """
+    def __init__(self, max_batch: int = 128, max_delay: float = 0.1):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._channels: typing.Dict[int, _ChannelAcks] = {}
+
+    def __len__(self) -> int:
+        """Return the number of settled delivery tags that are not sent"""
+        return sum(state.pending for state in self._channels.values())
+
+    def ack(self, channel_id: int, delivery_tag: int,
+            now: typing.Optional[float] = None) -> typing.List[Settlement]:
+        """Acknowledge a delivered message, returning the frames to send
+
+        :param channel_id: The channel the message was delivered on
+        :param delivery_tag: The delivery tag of the message
+        :param now: The current :func:`time.monotonic` time
+        :raises: ValueError
+
+        """
+        return self._settle(channel_id, delivery_tag, _ACK, now)
+
+    def discard(self, channel_id: int) -> None:
+        """Discard the pending tags for a channel that was closed
+
+        :param channel_id: The channel id
+
+        """
+        self._channels.pop(channel_id, None)
+
+    def flush(self, channel_id: typing.Optional[int] = None) \
+            -> typing.List[Settlement]:
+        """Return the frames to settle all of the pending tags, for a single
+        channel or for every channel.
+
+        :param channel_id: The channel to flush, or :data:`None` for all
+
+        """
+        if channel_id is not None:
+            if channel_id not in self._channels:
+                return []
+            return self._flush(channel_id, self._channels[channel_id])
+        frames = []
+        for channel_id, state in self._channels.items():
+            frames += self._flush(channel_id, state)
+        return frames
+
+    def nack(self,
+             channel_id: int,
+             delivery_tag: int,
+             requeue: bool = True,
+             now: typing.Optional[float] = None) -> typing.List[Settlement]:
+        """Reject a delivered message, returning the frames to send
+
+        :param channel_id: The channel the message was delivered on
+        :param delivery_tag: The delivery tag of the message
+        :param requeue: Requeue the message
+        :param now: The current :func:`time.monotonic` time
+        :raises: ValueError
+
+        """
+        return self._settle(channel_id, delivery_tag,
+                            _REQUEUE if requeue else _NACK, now)
+
+    def poll(self, now: typing.Optional[float] = None) \
+            -> typing.List[Settlement]:
+        """Return the frames for the channels with tags that have been held
+        for ``max_delay`` seconds or longer.
+
+        :param now: The current :func:`time.monotonic` time
+
+        """
+        now = time.monotonic() if now is None else now
+        frames = []
+        for channel_id, state in self._channels.items():
+            if state.since is not None and \
+                    now - state.since >= self.max_delay:
+                frames += self._flush(channel_id, state)
+        return frames
+
+    def _settle(self, channel_id: int, delivery_tag: int, disposition: int,
+                now: typing.Optional[float]) -> typing.List[Settlement]:
+        """Add a settled tag, flushing the channel if needed
+
+        :raises: ValueError
+
+        """
+        state = self._channels.get(channel_id)
+        if state is None:
+            state = self._channels[channel_id] = _ChannelAcks()
+        if delivery_tag <= state.base or delivery_tag in state.settled:
+            raise ValueError('Delivery tag {} on channel {} is already '
+                             'settled'.format(delivery_tag, channel_id))
+        now = time.monotonic() if now is None else now
+        state.settled[delivery_tag] = disposition
+        state.pending += 1
+        if state.since is None:
+            state.since = now
+        fills_gap = delivery_tag == state.base + 1 and \
+            delivery_tag + 1 in state.settled
+        if state.pending >= self.max_batch or \
+                now - state.since >= self.max_delay or fills_gap:
+            return self._flush(channel_id, state)
+        return []
+
+    @staticmethod
+    def _flush(channel_id: int,
+               state: _ChannelAcks) -> typing.List[Settlement]:
+        """Return the frames to settle the pending tags for a channel"""
+        frames = []
+        settled = state.settled
+        disposition, count, last = _SENT, 0, 0
+        delivery_tag = state.base + 1
+        while delivery_tag in settled:
+            value = settled.pop(delivery_tag)
+            if value != _SENT:  # Tags sent individually don't break a range
+                if value != disposition and count:
+                    frames.append(
+                        (channel_id, _frame(disposition, last, count > 1)))
+                    count = 0
+                disposition, last = value, delivery_tag
+                count += 1
+            delivery_tag += 1
+        if count:
+            frames.append((channel_id, _frame(disposition, last, count > 1)))
+        state.base = delivery_tag - 1
+        for delivery_tag in sorted(settled):
+            if settled[delivery_tag] != _SENT:
+                frames.append(
+                    (channel_id,
+                     _frame(settled[delivery_tag], delivery_tag, False)))
+                settled[delivery_tag] = _SENT
+        state.pending, state.since = 0, None
+        return frames
+
+
+class ConfirmTracker:
+    """Track the messages published on a channel in publisher confirm mode
+
+    The delivery tags of the unconfirmed messages are stored as a set of
+    intervals, kept in two sorted lists of the first and last tag of each
+    interval. Messages are confirmed in roughly the order they are published,
+    so the set usually holds a handful of intervals no matter how many
+    messages are unconfirmed, and the interval holding a tag is found with a
+    binary search.
+
+    A callback can be registered for each published message, which is
+    invoked with the delivery tag and :data:`True` if the message was acked
+    or :data:`False` if it was nacked by the broker.
+
+    """
+    def __init__(self):
+        self._callbacks: typing.Dict[int, ConfirmCallback] = {}
+        self._firsts: typing.List[int] = []
+        self._lasts: typing.List[int] = []
+        self._next_tag = 1
+
+    def __contains__(self, delivery_tag: int) -> bool:
+        """Return if the message with the delivery tag is unconfirmed"""
+        index = bisect.bisect_right(self._firsts, delivery_tag) - 1
+        return index >= 0 and delivery_tag <= self._lasts[index]
+
+    def __len__(self) -> int:
+        """Return the number of unconfirmed messages"""
+        return sum(self._lasts) - sum(self._firsts) + len(self._firsts)
+
+    @property
+    def next_delivery_tag(self) -> int:
+        """Return the delivery tag of the next message to be published"""
+        return self._next_tag
+
+    def confirm(self, delivery_tag: int, multiple: bool = False,
+                acked: bool = True) -> typing.List[typing.Tuple[int, int]]:
+        """Mark messages as confirmed, returning the ranges of delivery tags
+        that were confirmed as a list of first and last tag tuples and
+        invoking the callbacks registered for them.
+
+        :param delivery_tag: The delivery tag from the Basic.Ack or
+            Basic.Nack frame
+        :param multiple: Confirm all messages up to and including the tag
+        :param acked: :data:`True` if the messages were acked, :data:`False`
+            if they were nacked
+
+        """
+        if multiple:
+            if not delivery_tag:  # Zero confirms all unconfirmed messages
+                delivery_tag = self._next_tag - 1
+            ranges = self._remove_through(delivery_tag)
+        else:
+            ranges = self._remove(delivery_tag)
+        if self._callbacks:
+            for first, last in ranges:
+                self._invoke(first, last, acked)
+        return ranges
+
+    def process(self, frame_value: typing.Union[commands.Basic.Ack,
+                                                commands.Basic.Nack]) \
+            -> typing.List[typing.Tuple[int, int]]:
+        """Process a Basic.Ack or Basic.Nack frame received from the broker,
+        returning the ranges of delivery tags that were confirmed.
+
+        :param frame_value: The Basic.Ack or Basic.Nack frame
+
+        """
+        return self.confirm(frame_value.delivery_tag, frame_value.multiple,
+                            isinstance(frame_value, commands.Basic.Ack))
+
+    def publish(self, callback: typing.Optional[ConfirmCallback] = None) \
+            -> int:
+        """Record a published message, returning its delivery tag
+
+        :param callback: The callback to invoke when the message is
+            confirmed
+
+        """
+        delivery_tag, self._next_tag = self._next_tag, self._next_tag + 1
+        if self._lasts and self._lasts[-1] == delivery_tag - 1:
+            self._lasts[-1] = delivery_tag
+        else:
+            self._firsts.append(delivery_tag)
+            self._lasts.append(delivery_tag)
+        if callback is not None:
+            self._callbacks[delivery_tag] = callback
+        return delivery_tag
+
+    def reset(self) -> None:
+        """Discard the unconfirmed messages and restart the delivery tags at
+        1, as when confirm mode is enabled on a new channel.
+
+        """
+        self._callbacks.clear()
+        self._firsts.clear()
+        self._lasts.clear()
+        self._next_tag = 1
+
+    def _invoke(self, first: int, last: int, acked: bool) -> None:
+        """Invoke the callbacks for a confirmed range of delivery tags"""
+        if last - first >= len(self._callbacks):
+            delivery_tags = sorted(tag for tag in self._callbacks
+                                   if first <= tag <= last)
+        else:
+            delivery_tags = range(first, last + 1)
+        for delivery_tag in delivery_tags:
+            callback = self._callbacks.pop(delivery_tag, None)
+            if callback is not None:
+                callback(delivery_tag, acked)
+
+    def _remove(self, delivery_tag: int) -> typing.List[typing.Tuple[int,
+                                                                     int]]:
+        """Remove a single delivery tag from the set"""
+        index = bisect.bisect_right(self._firsts, delivery_tag) - 1
+        if index < 0 or delivery_tag > self._lasts[index]:
+            return []
+        first, last = self._firsts[index], self._lasts[index]
+        if first == last:
+            del self._firsts[index], self._lasts[index]
+        elif delivery_tag == first:
+            self._firsts[index] = delivery_tag + 1
+        elif delivery_tag == last:
+            self._lasts[index] = delivery_tag - 1
+        else:  # Split the interval around the tag
+            self._lasts[index] = delivery_tag - 1
+            self._firsts.insert(index + 1, delivery_tag + 1)
+            self._lasts.insert(index + 1, last)
+        return [(delivery_tag, delivery_tag)]
+
+    def _remove_through(self, delivery_tag: int) \
+            -> typing.List[typing.Tuple[int, int]]:
+        """Remove all of the delivery tags up to and including the tag"""
+        index = bisect.bisect_right(self._firsts, delivery_tag)
+        ranges = list(zip(self._firsts[:index], self._lasts[:index]))
+        if ranges and ranges[-1][1] > delivery_tag:
+            ranges[-1] = ranges[-1][0], delivery_tag
+            index -= 1
+            self._firsts[index] = delivery_tag + 1
+        del self._firsts[:index], self._lasts[:index]
+        return ranges
+
+
+def _frame(disposition: int, delivery_tag: int, multiple: bool) \
+        -> typing.Union[commands.Basic.Ack, commands.Basic.Nack]:
+    """Return the frame to settle the delivery tag with"""
+    if disposition == _ACK:
+        return commands.Basic.Ack(delivery_tag, multiple)
+    return commands.Basic.Nack(delivery_tag, multiple,
+                               disposition == _REQUEUE)
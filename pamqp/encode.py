@@ -8,16 +8,26 @@ import datetime
 import decimal as _decimal
 import logging
 import struct
+import threading
 import time
 import typing
 
-from pamqp import common
+from pamqp import common, decode
 
 LOGGER = logging.getLogger(__name__)
 
 DEPRECATED_RABBITMQ_SUPPORT = False
 """Toggle to support older versions of RabbitMQ."""
 
+SORT_TABLE_KEYS = True
+"""Toggle encoding field table keys in sorted order instead of insertion
+order."""
+
+TABLE_KEY_CACHE_SIZE = 256
+"""The maximum number of encoded field table keys to cache."""
+
+_Widths = typing.Sequence[typing.Tuple[bytes, struct.Struct]]
+
 
 def support_deprecated_rabbitmq(enabled: bool = True) -> None:
     """Toggle the data types available in field-tables
@@ -33,6 +43,41 @@ def support_deprecated_rabbitmq(enabled: bool = True) -> None:
     DEPRECATED_RABBITMQ_SUPPORT = enabled
 
 
+def sort_table_keys(enabled: bool = True) -> None:
+    """Toggle sorting field table keys when encoding field tables
+
+    AMQP does not require the keys of a field table to be in any order, so
+    if called with `False`, field tables are encoded in the insertion order
+    of their keys, avoiding sorting the keys of every table encoded.
+
+    :param enabled: Specify if field table keys are sorted
+
+    """
+    global SORT_TABLE_KEYS
+
+    SORT_TABLE_KEYS = enabled
+
+
+def cache_table_keys(maxsize: int = 256) -> None:
+    """Set the maximum number of encoded field table keys to cache,
+    clearing the cache.
+
+    Keys such as ``x-death`` or ``content-type`` are repeated in the headers
+    of many messages, so their encoded values are cached instead of being
+    encoded again for every field table. When the cache is full, the oldest
+    key is removed.
+
+    :param maxsize: The maximum number of keys to cache, ``0`` disables the
+        cache
+
+    """
+    global TABLE_KEY_CACHE_SIZE
+
+    TABLE_KEY_CACHE_SIZE = maxsize
+    with _table_keys_lock:
+        _table_keys.clear()
+
+
 def by_type(value: common.FieldValue, data_type: str) -> bytes:
     """Takes a value of any type and tries to encode it with the specified
     encoder.
@@ -255,11 +300,14 @@ def timestamp(value: typing.Union[datetime.datetime, time.struct_time]) \
             type(value)))
 
 
-def field_array(value: common.FieldArray) -> bytes:
+def field_array(value: common.FieldArray,
+                sort_keys: typing.Optional[bool] = None) -> bytes:
     """Encode a field array from a list of values
 
     :param value: Value to encode
     :type value: :const:`pamqp.common.FieldArray`
+    :param sort_keys: Sort the keys of field tables in the array, defaults to
+        :data:`~pamqp.encode.SORT_TABLE_KEYS`
     :raises TypeError: when the value is not the correct type
 
     """
@@ -268,37 +316,87 @@ def field_array(value: common.FieldArray) -> bytes:
             type(value)))
     data = []
     for item in value:
-        data.append(encode_table_value(item))
+        data.append(encode_table_value(item) if sort_keys is None
+                    else _nested_table_value(item, sort_keys))
     output = b''.join(data)
     return common.Struct.integer.pack(len(output)) + output
 
 
-def field_table(value: common.FieldTable) -> bytes:
+def field_table(value: common.FieldTable,
+                sort_keys: typing.Optional[bool] = None) -> bytes:
     """Encode a field table from a dict
 
     :param value: Value to encode
     :type value: :const:`pamqp.common.FieldTable`
+    :param sort_keys: Encode the keys of the table and of the tables nested
+        in it in sorted order instead of insertion order, defaults to
+        :data:`~pamqp.encode.SORT_TABLE_KEYS`
     :raises TypeError: when the value is not the correct type
 
     """
-    if not value:  # If there is no value, return a standard 4 null bytes
+    if isinstance(value, decode.LazyFieldTable):
+        return value.encoded
+    elif not value:  # If there is no value, return a standard 4 null bytes
         return common.Struct.integer.pack(0)
     elif not isinstance(value, dict):
         raise TypeError('dict required, received {}'.format(type(value)))
+    items: typing.Iterable = value.items()
+    if SORT_TABLE_KEYS if sort_keys is None else sort_keys:
+        items = sorted(items)
     data = []
-    for key, value in sorted(value.items()):
-        if len(key) > 128:  # field names have 128 char max
-            LOGGER.warning('Truncating key %s to 128 bytes', key)
-            key = key[0:128]
-        data.append(short_string(key))
+    for key, value in items:
+        data.append(_table_key(key))
         try:
-            data.append(encode_table_value(value))
+            data.append(encode_table_value(value) if sort_keys is None
+                        else _nested_table_value(value, sort_keys))
         except TypeError as err:
             raise TypeError('{} error: {}/'.format(key, err))
     output = b''.join(data)
     return common.Struct.integer.pack(len(output)) + output
 
 
+def _nested_table_value(value: common.FieldValue, sort_keys: bool) -> bytes:
+    """Encode a field table or array value, passing the option to sort keys
+    on to nested field tables and arrays.
+
+    :raises: TypeError
+
+    """
+    try:
+        encoder = _table_encoders[type(value)]
+    except KeyError:
+        encoder = _table_encoder(value)
+    if encoder is _table_field_table:
+        return b'F' + field_table(value, sort_keys)
+    elif encoder is _table_field_array:
+        return b'A' + field_array(value, sort_keys)
+    return encoder(value)
+
+
+def _table_key(key: str) -> bytes:
+    """Encode a field table key, truncating it to the maximum length of 128
+    characters and caching the encoded value.
+
+    :raises: TypeError
+
+    """
+    try:
+        return _table_keys[key]
+    except KeyError:
+        pass
+    value = key
+    if len(value) > 128:  # field names have 128 char max
+        LOGGER.warning('Truncating key %s to 128 bytes', value)
+        value = value[0:128]
+    data = short_string(value)
+    if TABLE_KEY_CACHE_SIZE > 0:
+        with _table_keys_lock:  # Only one thread may evict the oldest key
+            if len(_table_keys) >= TABLE_KEY_CACHE_SIZE:
+                del _table_keys[next(iter(_table_keys))]
+            _table_keys[key] = data
+    return data
+
+
 def table_integer(value: int) -> bytes:
     """Determines the best type of numeric type to encode value as, preferring
     the smallest data size first.
@@ -308,21 +406,8 @@ def table_integer(value: int) -> bytes:
         acceptable range for the data type
 
     """
-    if DEPRECATED_RABBITMQ_SUPPORT:
-        return _deprecated_table_integer(value)
-    if -128 <= value <= 127:
-        return b'b' + octet(value)
-    elif -32768 <= value <= 32767:
-        return b's' + short_int(value)
-    elif 0 <= value <= 65535:
-        return b'u' + short_uint(value)
-    elif -2147483648 <= value <= 2147483647:
-        return b'I' + long_int(value)
-    elif 0 <= value <= 4294967295:
-        return b'i' + long_uint(value)
-    elif -9223372036854775808 <= value <= 9223372036854775807:
-        return b'l' + long_long_int(value)
-    raise TypeError('Unsupported numeric value: {}'.format(value))
+    prefix, encoder = _integer_width(value)
+    return prefix + encoder.pack(value)
 
 
 def _deprecated_table_integer(value: int) -> bytes:
@@ -334,15 +419,32 @@ def _deprecated_table_integer(value: int) -> bytes:
         acceptable range for the data type
 
     """
-    if -128 <= value <= 127:
-        return b'b' + octet(value)
-    elif -32768 <= value <= 32767:
-        return b's' + short_int(value)
-    elif -2147483648 <= value <= 2147483647:
-        return b'I' + long_int(value)
-    elif -9223372036854775808 <= value <= 9223372036854775807:
-        return b'l' + long_long_int(value)
-    raise TypeError('Unsupported numeric value: {}'.format(value))
+    prefix, encoder = _integer_width(value, _SIGNED_INTEGERS)
+    return prefix + encoder.pack(value)
+
+
+def _integer_width(value: int,
+                   widths: typing.Optional[_Widths] = None) \
+        -> typing.Tuple[bytes, struct.Struct]:
+    """Return the field type prefix and struct to encode an integer with,
+    indexed by the bit length of its magnitude.
+
+    :raises: TypeError
+
+    """
+    if not isinstance(value, int):
+        raise TypeError('int required, received {}'.format(type(value)))
+    elif value < 0:
+        widths, magnitude = _SIGNED_INTEGERS, ~value
+    else:
+        magnitude = value
+        if widths is None:
+            widths = _SIGNED_INTEGERS if DEPRECATED_RABBITMQ_SUPPORT \
+                else _INTEGERS
+    try:
+        return widths[magnitude.bit_length()]
+    except IndexError:
+        raise TypeError('Unsupported numeric value: {}'.format(value))
 
 
 def _string(encoder: struct.Struct, value: str) -> bytes:
@@ -363,6 +465,10 @@ def encode_table_value(
 ) -> bytes:
     """Takes a value of any type and tries to encode it with the proper encoder
 
+    The encoder is looked up by the type of the value, falling back to the
+    encoder registered for the closest base class of the value's type. Use
+    :func:`~pamqp.encode.register_table_type` to add encoders for other types.
+
     :param value: Value to encode
     :type value: :const:`pamqp.common.FieldArray` or
                  :const:`pamqp.common.FieldTable` or
@@ -370,29 +476,355 @@ def encode_table_value(
     :raises TypeError: when the type of the value is not supported
 
     """
-    if isinstance(value, bool):
-        return b't' + boolean(value)
-    elif isinstance(value, int):
-        return table_integer(value)
-    elif isinstance(value, _decimal.Decimal):
-        return b'D' + decimal(value)
-    elif isinstance(value, float):
-        return b'f' + floating_point(value)
-    elif isinstance(value, str):
-        return b'S' + long_string(value)
-    elif isinstance(value, (datetime.datetime, time.struct_time)):
-        return b'T' + timestamp(value)
-    elif isinstance(value, dict):
-        return b'F' + field_table(value)
-    elif isinstance(value, list):
-        return b'A' + field_array(value)
-    elif isinstance(value, bytearray):
-        return b'x' + byte_array(value)
-    elif value is None:
-        return b'V'
-    raise TypeError('Unknown type: {} ({!r})'.format(type(value), value))
+    try:
+        encoder = _table_encoders[type(value)]
+    except KeyError:
+        encoder = _table_encoder(value)
+    return encoder(value)
+
+
+def register_table_type(value_type: type,
+                        encoder: typing.Callable[[typing.Any], bytes]) \
+        -> None:
+    """Register the encoder used to encode values of a type, and of its
+    subclasses, in field tables and arrays. The encoder must return the
+    encoded value including its field type prefix, for example:
+
+    .. code-block:: python
+
+        encode.register_table_type(
+            uuid.UUID, lambda value: encode.encode_table_value(str(value)))
+
+    :param value_type: The type of value to encode
+    :param encoder: The function to encode values of the type with
+
+    """
+    TABLE_TYPES[value_type] = encoder
+    _table_encoders.clear()
+    _table_encoders.update(TABLE_TYPES)
+
+
+def _table_encoder(value: typing.Any) -> typing.Callable[[typing.Any], bytes]:
+    """Return the encoder registered for the closest base class of the type
+    of the value, caching it for the type.
+
+    :raises: TypeError
+
+    """
+    value_type = type(value)
+    for base_type in value_type.__mro__:
+        if base_type in TABLE_TYPES:
+            encoder = _table_encoders[value_type] = TABLE_TYPES[base_type]
+            return encoder
+    raise TypeError('Unknown type: {} ({!r})'.format(value_type, value))
+
+
+def _table_boolean(value: bool) -> bytes:
+    return b't\x01' if value else b't\x00'
+
+
+def _table_byte_array(value: bytearray) -> bytes:
+    return b'x' + byte_array(value)
+
+
+def _table_decimal(value: _decimal.Decimal) -> bytes:
+    return b'D' + decimal(value)
+
+
+def _table_field_array(value: common.FieldArray) -> bytes:
+    return b'A' + field_array(value)
+
+
+def _table_field_table(value: common.FieldTable) -> bytes:
+    return b'F' + field_table(value)
+
+
+def _table_floating_point(value: float) -> bytes:
+    return b'f' + floating_point(value)
+
+
+def _table_long_string(value: str) -> bytes:
+    return b'S' + _string(common.Struct.integer, value)
+
+
+def _table_timestamp(
+        value: typing.Union[datetime.datetime, time.struct_time]) -> bytes:
+    return b'T' + timestamp(value)
+
+
+def _table_void(_value: None) -> bytes:
+    return b'V'
+
+
+def sizeof(value: common.FieldValue, data_type: str) -> int:
+    """Return the number of bytes a value is encoded as for the specified
+    data type, without encoding it. Use with
+    :func:`~pamqp.encode.encode_into` to encode values into a buffer
+    allocated once:
+
+    .. code-block:: python
+
+        buffer = bytearray(encode.sizeof(value, 'table'))
+        encode.encode_into(buffer, 0, value, 'table')
+
+    :param value: The value to size
+    :type value: :const:`pamqp.common.FieldValue`
+    :param data_type: The data type name to size the value as
+    :raises TypeError: when the :data:`data_type` or the type of a field table
+        or array value is unknown
+
+    """
+    try:
+        sizer = _SIZES[data_type]
+    except KeyError:
+        raise TypeError('Unknown type: {}'.format(data_type))
+    return sizer(value)
+
+
+def encode_into(buffer: typing.Union[bytearray, memoryview], offset: int,
+                value: common.FieldValue, data_type: str) -> int:
+    """Encode a value as the specified data type into a writable buffer at
+    the offset, returning the number of bytes written. Strings, byte arrays,
+    field tables and field arrays are written in place instead of being
+    joined from their encoded parts, so the buffer must have room for at
+    least :func:`~pamqp.encode.sizeof` bytes from the offset.
+
+    :param buffer: The buffer to encode the value into
+    :param offset: The position in the buffer to encode the value at
+    :param value: The value to encode
+    :type value: :const:`pamqp.common.FieldValue`
+    :param data_type: The data type name to use for encoding
+    :raises TypeError: when the :data:`data_type` is unknown or the value is
+        not the correct type
+
+    """
+    writer = _WRITERS.get(data_type)
+    if writer is not None:
+        return writer(buffer, offset, value)
+    data = by_type(value, data_type)
+    if data is None:  # void
+        return 0
+    buffer[offset:offset + len(data)] = data
+    return len(data)
+
+
+def _byte_array_into(buffer: typing.Union[bytearray, memoryview],
+                     offset: int, value: bytearray) -> int:
+    """Encode a byte array into the buffer, returning the bytes written"""
+    if not isinstance(value, bytearray):
+        raise TypeError('bytearray required, received {}'.format(type(value)))
+    common.Struct.integer.pack_into(buffer, offset, len(value))
+    buffer[offset + 4:offset + 4 + len(value)] = value
+    return 4 + len(value)
+
+
+def _field_array_into(buffer: typing.Union[bytearray, memoryview],
+                      offset: int, value: common.FieldArray) -> int:
+    """Encode a field array into the buffer, returning the bytes written"""
+    if not isinstance(value, list):
+        raise TypeError('list of values required, received {}'.format(
+            type(value)))
+    position = offset + 4
+    for item in value:
+        position += _table_value_into(buffer, position, item)
+    common.Struct.integer.pack_into(buffer, offset, position - offset - 4)
+    return position - offset
+
+
+def _field_table_into(buffer: typing.Union[bytearray, memoryview],
+                      offset: int, value: common.FieldTable) -> int:
+    """Encode a field table into the buffer, returning the bytes written"""
+    if isinstance(value, decode.LazyFieldTable):
+        data = value.encoded
+        buffer[offset:offset + len(data)] = data
+        return len(data)
+    elif not value:
+        common.Struct.integer.pack_into(buffer, offset, 0)
+        return 4
+    elif not isinstance(value, dict):
+        raise TypeError('dict required, received {}'.format(type(value)))
+    items: typing.Iterable = value.items()
+    if SORT_TABLE_KEYS:
+        items = sorted(items)
+    position = offset + 4
+    for key, item in items:
+        data = _table_key(key)
+        buffer[position:position + len(data)] = data
+        position += len(data)
+        try:
+            position += _table_value_into(buffer, position, item)
+        except TypeError as err:
+            raise TypeError('{} error: {}/'.format(key, err))
+    common.Struct.integer.pack_into(buffer, offset, position - offset - 4)
+    return position - offset
+
+
+def _string_into(buffer: typing.Union[bytearray, memoryview], offset: int,
+                 encoder: struct.Struct, value: str) -> int:
+    """Encode a string into the buffer, returning the bytes written"""
+    if not isinstance(value, str):
+        raise TypeError('str required, received {}'.format(type(value)))
+    data = value.encode('utf-8')
+    size = encoder.size + len(data)
+    buffer[offset:offset + size] = encoder.pack(len(data)) + data
+    return size
+
+
+def _table_value_into(buffer: typing.Union[bytearray, memoryview],
+                      offset: int, value: common.FieldValue) -> int:
+    """Encode a field table or array value into the buffer, returning the
+    bytes written.
+
+    """
+    try:
+        encoder = _table_encoders[type(value)]
+    except KeyError:
+        encoder = _table_encoder(value)
+    if encoder not in _TABLE_WRITERS:
+        data = encoder(value)
+        buffer[offset:offset + len(data)] = data
+        return len(data)
+    prefix, writer = _TABLE_WRITERS[encoder]
+    buffer[offset] = prefix
+    return 1 + writer(buffer, offset + 1, value)
+
+
+def _field_array_size(value: common.FieldArray) -> int:
+    """Return the encoded size of a field array"""
+    if not isinstance(value, list):
+        raise TypeError('list of values required, received {}'.format(
+            type(value)))
+    return 4 + sum(_table_value_size(item) for item in value)
+
+
+def _field_table_size(value: common.FieldTable) -> int:
+    """Return the encoded size of a field table"""
+    if isinstance(value, decode.LazyFieldTable):
+        return len(value.encoded)
+    elif not value:
+        return 4
+    elif not isinstance(value, dict):
+        raise TypeError('dict required, received {}'.format(type(value)))
+    size = 4
+    for key, item in value.items():
+        size += len(_table_key(key)) + _table_value_size(item)
+    return size
+
+
+def _string_size(value: str) -> int:
+    """Return the number of bytes a string is encoded as in UTF-8"""
+    if not isinstance(value, str):
+        raise TypeError('str required, received {}'.format(type(value)))
+    return len(value) if value.isascii() else len(value.encode('utf-8'))
 
 
+def _table_value_size(value: common.FieldValue) -> int:
+    """Return the encoded size of a field table or array value"""
+    try:
+        encoder = _table_encoders[type(value)]
+    except KeyError:
+        encoder = _table_encoder(value)
+    sizer = _TABLE_SIZES.get(encoder)
+    if sizer is None:
+        return len(encoder(value))
+    return sizer(value)
+
+
+def _integer_widths(
+        *ranges: typing.Tuple[int, bytes, struct.Struct]) -> _Widths:
+    """Return the field type prefix and struct for each bit length, from
+    ranges of the number of bit lengths, prefix and struct.
+
+    """
+    return tuple((prefix, packer)
+                 for count, prefix, packer in ranges
+                 for _offset in range(count))
+
+
+_INTEGERS = _integer_widths((8, b'b', common.Struct.short_short_int),
+                            (8, b's', common.Struct.short),
+                            (1, b'u', common.Struct.ushort),
+                            (15, b'I', common.Struct.long),
+                            (1, b'i', common.Struct.ulong),
+                            (31, b'l', common.Struct.long_long_int))
+
+_SIGNED_INTEGERS = _integer_widths((8, b'b', common.Struct.short_short_int),
+                                   (8, b's', common.Struct.short),
+                                   (16, b'I', common.Struct.long),
+                                   (32, b'l', common.Struct.long_long_int))
+
+TABLE_TYPES: typing.Dict[type, typing.Callable[[typing.Any], bytes]] = {
+    bool: _table_boolean,
+    int: table_integer,
+    _decimal.Decimal: _table_decimal,
+    float: _table_floating_point,
+    str: _table_long_string,
+    datetime.datetime: _table_timestamp,
+    time.struct_time: _table_timestamp,
+    dict: _table_field_table,
+    decode.LazyFieldTable: _table_field_table,
+    list: _table_field_array,
+    bytearray: _table_byte_array,
+    type(None): _table_void,
+}
+"""Field table and array encoders by value type, see
+:func:`~pamqp.encode.register_table_type`"""
+
+_table_encoders = dict(TABLE_TYPES)
+
+_table_keys: typing.Dict[str, bytes] = {}
+_table_keys_lock = threading.Lock()
+
+_TABLE_SIZES: typing.Dict[typing.Callable, typing.Callable[[typing.Any],
+                                                           int]] = {
+    _table_boolean: lambda _value: 2,
+    _table_byte_array: lambda value: 5 + len(value),
+    _table_decimal: lambda _value: 6,
+    _table_field_array: lambda value: 1 + _field_array_size(value),
+    _table_field_table: lambda value: 1 + _field_table_size(value),
+    _table_floating_point: lambda _value: 5,
+    _table_long_string: lambda value: 5 + _string_size(value),
+    _table_timestamp: lambda _value: 9,
+    _table_void: lambda _value: 1,
+    table_integer: lambda value: 1 + _integer_width(value)[1].size,
+}  # Encoded sizes of field table and array values by encoder
+
+_TABLE_WRITERS: typing.Dict[typing.Callable, typing.Tuple[
+    int, typing.Callable[[typing.Any, int, typing.Any], int]]] = {
+    _table_byte_array: (ord('x'), _byte_array_into),
+    _table_field_array: (ord('A'), _field_array_into),
+    _table_field_table: (ord('F'), _field_table_into),
+    _table_long_string: (
+        ord('S'), lambda buffer, offset, value: _string_into(
+            buffer, offset, common.Struct.integer, value)),
+}  # Field table and array values written in place, by encoder
+
+_SIZES: typing.Dict[str, typing.Callable[[typing.Any], int]] = {
+    'bytearray': lambda value: 4 + len(value),
+    'double': lambda _value: 8,
+    'field_array': _field_array_size,
+    'long': lambda _value: 4,
+    'longlong': lambda _value: 8,
+    'longstr': lambda value: 4 + _string_size(value),
+    'octet': lambda _value: 1,
+    'short': lambda _value: 2,
+    'shortstr': lambda value: 1 + _string_size(value),
+    'table': _field_table_size,
+    'timestamp': lambda _value: 8,
+    'void': lambda _value: 0,
+}  # Encoded sizes of values by data type
+
+_WRITERS: typing.Dict[str, typing.Callable[[typing.Any, int, typing.Any],
+                                           int]] = {
+    'bytearray': _byte_array_into,
+    'field_array': _field_array_into,
+    'longstr': lambda buffer, offset, value: _string_into(
+        buffer, offset, common.Struct.integer, value),
+    'shortstr': lambda buffer, offset, value: _string_into(
+        buffer, offset, common.Struct.byte, value),
+    'table': _field_table_into,
+}  # Values written in place, by data type
+
 METHODS = {
     'bytearray': byte_array,
     'double': double,
@@ -8,6 +8,7 @@ marshal will take an object created from the specification file and turn it
 into a raw byte stream.
 
 """
+import functools
 import logging
 import struct
 import typing
@@ -17,10 +18,17 @@ from pamqp import (base, body, commands, common, constants, decode, exceptions,
 
 LOGGER = logging.getLogger(__name__)
 UNMARSHAL_FAILURE = 0, 0, None
+_CHANNEL_MAX = 65535
+_CONTENT_HEADER = struct.Struct('>HxxQ')
+_EMPTY_FRAME_HEADER = bytes(constants.FRAME_HEADER_SIZE)
+_MIN_READ_SIZE = 65536
+_EMPTY_PROPERTIES = commands.Basic.Properties()
 
 FrameTypes = typing.Union[base.Frame, body.ContentBody, header.ContentHeader,
                           header.ProtocolHeader, heartbeat.Heartbeat]
 
+FrameSink = typing.Callable[[FrameTypes], typing.Any]
+
 
 def marshal(frame_value: FrameTypes, channel_id: int) -> bytes:
     """Marshal a frame to be sent over the wire.
@@ -41,10 +49,139 @@ def marshal(frame_value: FrameTypes, channel_id: int) -> bytes:
     raise ValueError('Could not determine frame type: {}'.format(frame_value))
 
 
-def unmarshal(data_in: bytes) -> typing.Tuple[int, int, FrameTypes]:
+def marshal_many(
+        frames: typing.Iterable[typing.Tuple[FrameTypes, int]]) -> bytearray:
+    """Marshal multiple frames to be sent over the wire as a single
+    :class:`bytearray` value.
+
+    :param frames: An iterable of frame and channel id tuples
+    :raises: ValueError
+
+    """
+    writer = FrameWriter()
+    for frame_value, channel_id in frames:
+        writer.write(frame_value, channel_id)
+    return writer.detach()
+
+
+def marshal_message(channel_id: int,
+                    exchange: str,
+                    routing_key: str,
+                    properties: typing.Optional[header.BasicProperties],
+                    body_value: body.Value,
+                    frame_max: int,
+                    mandatory: bool = False) -> bytearray:
+    """Marshal the Basic.Publish, ContentHeader and ContentBody frames needed
+    to publish a message as a single :class:`bytearray` value, splitting the
+    body into as many body frames as needed to stay within ``frame_max``.
+
+    :param channel_id: The channel to publish the message on
+    :param exchange: The exchange to publish to
+    :param routing_key: The message routing key
+    :param properties: The message properties
+    :param body_value: The message body
+    :param frame_max: The maximum frame size negotiated for the connection
+    :param mandatory: Indicate mandatory routing
+    :raises: ValueError
+
+    """
+    writer = FrameWriter()
+    writer.write_message(channel_id, exchange, routing_key, properties,
+                         body_value, frame_max, mandatory)
+    return writer.detach()
+
+
+def marshal_body_segments(channel_id: int, value: body.Value,
+                          frame_max: int) -> typing.List[decode.Buffer]:
+    """Marshal a message body as content body frames split at
+    ``frame_max``, returning a list of buffer segments suitable for
+    :meth:`socket.socket.sendmsg` or :meth:`io.BufferedWriter.writelines`.
+    The body segments are :class:`memoryview` slices of the value, so the
+    body is not copied.
+
+    :param channel_id: The channel to send the body on
+    :param value: The message body
+    :param frame_max: The maximum frame size negotiated for the connection,
+        or ``0`` if there is no limit
+    :raises: ValueError
+
+    """
+    segments: typing.List[decode.Buffer] = []
+    data = memoryview(value).cast('B')
+    frame_size = _body_frame_size(frame_max, len(data))
+    for offset in range(0, len(data), frame_size):
+        chunk = data[offset:offset + frame_size]
+        segments += [
+            common.Struct.frame_header.pack(constants.FRAME_BODY, channel_id,
+                                            len(chunk)), chunk,
+            constants.FRAME_END_CHAR
+        ]
+    return segments
+
+
+def marshal_segments(frame_value: FrameTypes,
+                     channel_id: int) -> typing.List[decode.Buffer]:
+    """Marshal a frame to be sent over the wire as a list of buffer segments
+    suitable for :meth:`socket.socket.sendmsg` or
+    :meth:`io.BufferedWriter.writelines`. Content body frames reference the
+    body value with a :class:`memoryview` instead of copying it, except for
+    file object bodies, which are read into memory.
+
+    :raises: ValueError
+
+    """
+    if isinstance(frame_value, body.ContentBody):
+        payload = memoryview(frame_value.marshal()).cast('B')
+        return [
+            common.Struct.frame_header.pack(constants.FRAME_BODY, channel_id,
+                                            len(payload)), payload,
+            constants.FRAME_END_CHAR
+        ]
+    return [marshal(frame_value, channel_id)]
+
+
+def stream_body(channel_id: int, value: body.Source,
+                frame_max: int) -> typing.Iterator[bytearray]:
+    """Marshal a message body as content body frames split at
+    ``frame_max``, yielding one frame at a time. When the value is a file
+    object, only the data for the current frame is read from it, so the
+    memory used does not grow with the size of the body.
+
+    :param channel_id: The channel to send the body on
+    :param value: The message body
+    :param frame_max: The maximum frame size negotiated for the connection,
+        or ``0`` if there is no limit
+    :raises: ValueError
+
+    """
+    remaining = body.size(value)
+    frame_size = _body_frame_size(frame_max, remaining)
+    data = None if hasattr(value, 'readinto') else memoryview(value).cast('B')
+    for offset in range(0, remaining, frame_size):
+        length = min(frame_size, remaining - offset)
+        frame_value = bytearray(length + constants.FRAME_HEADER_SIZE + 1)
+        common.Struct.frame_header.pack_into(frame_value, 0,
+                                             constants.FRAME_BODY,
+                                             channel_id, length)
+        frame_value[-1] = constants.FRAME_END
+        with memoryview(frame_value) as view:
+            payload = view[constants.FRAME_HEADER_SIZE:-1]
+            if data is None:
+                _read_into(value, payload)
+            else:
+                payload[:] = data[offset:offset + length]
+            payload.release()
+        yield frame_value
+
+
+def unmarshal(data_in: decode.Buffer) -> typing.Tuple[int, int, FrameTypes]:
     """Takes in binary data and maps builds the appropriate frame type,
     returning a frame object.
 
+    The data may be a :class:`bytes`, :class:`bytearray` or
+    :class:`memoryview` object. The frame is decoded in place, without
+    copying the frame payload out of the data.
+
     :returns: tuple of  bytes consumed, channel, and a frame object
     :raises: exceptions.UnmarshalingException
 
@@ -73,7 +210,8 @@ def unmarshal(data_in: bytes) -> typing.Tuple[int, int, FrameTypes]:
 
     if data_in[byte_count - 1] != constants.FRAME_END:
         raise exceptions.UnmarshalingException('Unknown', 'Last byte error')
-    frame_data = data_in[constants.FRAME_HEADER_SIZE:byte_count - 1]
+    frame_data = memoryview(data_in)[
+        constants.FRAME_HEADER_SIZE:byte_count - 1]
     if frame_type == constants.FRAME_METHOD:
         return byte_count, channel_id, _unmarshal_method_frame(frame_data)
     elif frame_type == constants.FRAME_HEADER:
@@ -84,10 +222,624 @@ def unmarshal(data_in: bytes) -> typing.Tuple[int, int, FrameTypes]:
         'Unknown', 'Unknown frame type: {}'.format(frame_type))
 
 
-def frame_parts(data: bytes) -> typing.Tuple[int, int, typing.Optional[int]]:
+class FrameReader:
+    """Incrementally unmarshal frames from a stream of bytes.
+
+    Data received from the socket is passed to :meth:`FrameReader.feed` and
+    the decoded frames are retrieved by iterating over the reader, which
+    yields ``(channel_id, frame)`` tuples until the buffer no longer holds a
+    complete frame. Partial frames are retained until the rest of their data
+    is fed.
+
+    The received data is kept in a single :class:`bytearray` with read and
+    write offsets into it, so consuming a frame does not copy the remaining
+    data. The buffer is only compacted when there is not enough room left at
+    the end of it for newly fed data.
+
+    Data can also be received directly into the buffer, without being
+    copied, by reading into the view returned by
+    :meth:`FrameReader.get_buffer` and then calling
+    :meth:`FrameReader.buffer_updated` with the number of bytes read.
+
+    Once the connection is tuned, set ``frame_max`` and ``channel_max`` to
+    the negotiated values to reject frames that exceed them as soon as their
+    header is received, instead of buffering the rest of the frame.
+
+    The amount of buffered data can be bounded with
+    :meth:`FrameReader.set_watermarks`, which signals when reading from the
+    socket should be paused and resumed.
+
+    :param buffer_size: The initial size of the receive buffer
+    :param frame_max: The maximum frame size, or ``0`` if there is no limit
+    :param channel_max: The maximum channel id, or ``0`` if there is no limit
+
+    """
+    def __init__(self,
+                 buffer_size: int = constants.FRAME_MAX_SIZE,
+                 frame_max: int = 0,
+                 channel_max: int = 0):
+        self.frame_max = frame_max
+        self.channel_max = channel_max
+        self._buffer = bytearray(buffer_size)
+        self._read_offset = 0
+        self._write_offset = 0
+        self._view: typing.Optional[memoryview] = None
+        self._high_water = 0
+        self._low_water = 0
+        self._paused = False
+        self._pause_reading: typing.Optional[typing.Callable[[], None]] = None
+        self._resume_reading: typing.Optional[typing.Callable[[], None]] = \
+            None
+
+    def __iter__(self) -> typing.Iterator[typing.Tuple[int, FrameTypes]]:
+        """Iterate over the complete frames currently in the buffer"""
+        while True:
+            value = self.read()
+            if value is None:
+                return
+            yield value
+
+    def __len__(self) -> int:
+        """Return the number of buffered bytes that are not yet consumed"""
+        return self._write_offset - self._read_offset
+
+    def buffer_updated(self, byte_count: int) -> None:
+        """Indicate that data was written into the view returned by
+        :meth:`FrameReader.get_buffer`.
+
+        :param byte_count: The number of bytes written
+
+        """
+        self._release_view()
+        self._write_offset += byte_count
+        if self._high_water:
+            self._check_watermarks()
+
+    def feed(self, data: bytes) -> None:
+        """Append data received from the peer to the buffer
+
+        :param data: The data to append
+
+        """
+        length = len(data)
+        self._release_view()
+        self._reserve(length)
+        self._buffer[self._write_offset:self._write_offset + length] = data
+        self._write_offset += length
+        if self._high_water:
+            self._check_watermarks()
+
+    def get_buffer(self, size_hint: int = -1) -> memoryview:
+        """Return a writable view of the free space at the end of the buffer
+        to read data received from the peer into. The view is valid until
+        :meth:`FrameReader.buffer_updated` or :meth:`FrameReader.feed` is
+        called.
+
+        :param size_hint: The minimum amount of free space to return
+
+        """
+        self._release_view()
+        self._reserve(max(size_hint, _MIN_READ_SIZE))
+        self._view = memoryview(self._buffer)[self._write_offset:]
+        return self._view
+
+    @property
+    def paused(self) -> bool:
+        """Return if reading was paused because the buffered data reached the
+        high watermark.
+
+        """
+        return self._paused
+
+    def read(self) -> typing.Optional[typing.Tuple[int, FrameTypes]]:
+        """Unmarshal the next frame in the buffer, returning a tuple of the
+        channel and frame object or :data:`None` if a complete frame has not
+        been received yet.
+
+        :raises: exceptions.UnmarshalingException
+        :raises: exceptions.AMQPFrameError
+        :raises: exceptions.AMQPChannelError
+
+        """
+        offset, available = self._read_offset, len(self)
+        # Protocol headers and empty frames are both 8 bytes long
+        if available < constants.FRAME_HEADER_SIZE + 1:
+            return None
+        if self._buffer[offset:offset + 4] == constants.AMQP:
+            byte_count = 8
+        else:
+            _frame_type, channel_id, frame_size = \
+                common.Struct.frame_header.unpack_from(self._buffer, offset)
+            byte_count = constants.FRAME_HEADER_SIZE + frame_size + 1
+            if self.frame_max and byte_count > self.frame_max:
+                raise exceptions.AMQPFrameError(
+                    'Frame size {} exceeds frame_max {}'.format(
+                        byte_count, self.frame_max))
+            elif self.channel_max and channel_id > self.channel_max:
+                raise exceptions.AMQPChannelError(
+                    'Channel {} exceeds channel_max {}'.format(
+                        channel_id, self.channel_max))
+            elif byte_count > available:
+                return None
+        with memoryview(self._buffer) as view:
+            consumed, channel_id, value = unmarshal(
+                view[offset:offset + byte_count])
+        self._consume(consumed)
+        return channel_id, value
+
+    def set_watermarks(
+            self,
+            high: int = 0,
+            low: typing.Optional[int] = None,
+            pause_reading: typing.Optional[typing.Callable[[], None]] = None,
+            resume_reading: typing.Optional[typing.Callable[[], None]] = None
+    ) -> None:
+        """Set the high and low watermarks for the number of buffered bytes.
+
+        When the buffered data reaches the high watermark and holds at least
+        one complete frame, ``pause_reading`` is invoked. Once enough frames
+        are read for the buffered data to drop to the low watermark, or only
+        a partial frame is left, ``resume_reading`` is invoked. The callbacks
+        can be the methods of the same name of an :class:`asyncio.Transport`.
+
+        :param high: The high watermark, or ``0`` to disable the watermarks
+        :param low: The low watermark, defaulting to a quarter of ``high``
+        :param pause_reading: Invoked when reading should be paused, keeping
+            the current callback if not specified
+        :param resume_reading: Invoked when reading can resume, keeping the
+            current callback if not specified
+        :raises: ValueError
+
+        """
+        low = high // 4 if low is None else low
+        if not 0 <= low <= high:
+            raise ValueError('high ({}) must be >= low ({}) >= 0'.format(
+                high, low))
+        self._high_water, self._low_water = high, low
+        if pause_reading is not None:
+            self._pause_reading = pause_reading
+        if resume_reading is not None:
+            self._resume_reading = resume_reading
+        self._check_watermarks()
+
+    def _consume(self, byte_count: int) -> None:
+        """Advance the read offset, rewinding both offsets when all of the
+        buffered data has been consumed.
+
+        """
+        self._read_offset += byte_count
+        if self._read_offset == self._write_offset:
+            self._read_offset = self._write_offset = 0
+        if self._paused:
+            self._check_watermarks()
+
+    def _check_watermarks(self) -> None:
+        """Pause or resume reading when the buffered data crosses the
+        watermarks. Reading is never left paused with only a partial frame
+        buffered, as it could not be consumed without reading more data.
+
+        """
+        if not self._paused:
+            if self._high_water and len(self) >= self._high_water and \
+                    self._frame_buffered():
+                self._paused = True
+                if self._pause_reading is not None:
+                    self._pause_reading()
+        elif not self._high_water or len(self) <= self._low_water or \
+                not self._frame_buffered():
+            self._paused = False
+            if self._resume_reading is not None:
+                self._resume_reading()
+
+    def _frame_buffered(self) -> bool:
+        """Return if the buffer holds at least one complete frame"""
+        available = len(self)
+        if available < constants.FRAME_HEADER_SIZE + 1:
+            return False
+        elif self._buffer[self._read_offset:self._read_offset + 4] == \
+                constants.AMQP:
+            return True
+        frame_size = common.Struct.integer.unpack_from(
+            self._buffer, self._read_offset + 3)[0]
+        return constants.FRAME_HEADER_SIZE + frame_size + 1 <= available
+
+    def _release_view(self) -> None:
+        """Release the view returned by get_buffer so the buffer can be
+        resized.
+
+        """
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+
+    def _reserve(self, length: int) -> None:
+        """Ensure there are at least ``length`` bytes available at the end of
+        the buffer, compacting or growing the buffer as needed.
+
+        """
+        if self._write_offset + length <= len(self._buffer):
+            return
+        pending = len(self)
+        if self._read_offset:  # Move the unconsumed data to the front
+            self._buffer[0:pending] = \
+                self._buffer[self._read_offset:self._write_offset]
+            self._read_offset, self._write_offset = 0, pending
+        if pending + length > len(self._buffer):
+            size = max(pending + length, len(self._buffer) * 2)
+            self._buffer.extend(bytes(size - len(self._buffer)))
+
+
+class FrameWriter:
+    """Marshal frames directly into a single growable buffer.
+
+    Each frame is appended to the buffer by :meth:`FrameWriter.write`,
+    reserving room for the frame header which is packed in place once the
+    size of the frame payload is known. The marshaled frames can then be
+    retrieved as a copy using :meth:`FrameWriter.getvalue`, as a
+    :class:`memoryview` of the buffer using :meth:`FrameWriter.getbuffer` or
+    without copying using :meth:`FrameWriter.detach`, and the buffer reused
+    after calling :meth:`FrameWriter.clear`.
+
+    Once the connection is tuned, set ``frame_max`` and ``channel_max`` to
+    the negotiated values. Content bodies written with
+    :meth:`FrameWriter.write` are then split into as many body frames as
+    needed, and frames that would still exceed the limits raise
+    :exc:`ValueError` instead of being rejected by the broker.
+
+    :param frame_max: The maximum frame size, or ``0`` if there is no limit
+    :param channel_max: The maximum channel id, or ``0`` if there is no limit
+
+    """
+    def __init__(self, frame_max: int = 0, channel_max: int = 0):
+        self.frame_max = frame_max
+        self.channel_max = channel_max
+        self._buffer = bytearray()
+
+    def __len__(self) -> int:
+        """Return the number of bytes written to the buffer"""
+        return len(self._buffer)
+
+    def clear(self) -> None:
+        """Remove all of the marshaled frames from the buffer"""
+        del self._buffer[:]
+
+    def detach(self) -> bytearray:
+        """Return the buffer of marshaled frames without copying it, starting
+        a new buffer for the frames written after it.
+
+        """
+        value, self._buffer = self._buffer, bytearray()
+        return value
+
+    def getbuffer(self) -> memoryview:
+        """Return a :class:`memoryview` of the marshaled frames, suitable for
+        passing to :meth:`socket.socket.sendmsg`. The view must be released
+        before more frames are written or the buffer is cleared.
+
+        """
+        return memoryview(self._buffer)
+
+    def getvalue(self) -> bytes:
+        """Return a copy of the marshaled frames"""
+        return bytes(self._buffer)
+
+    def write(self, frame_value: FrameTypes, channel_id: int) -> None:
+        """Marshal a frame, appending it to the buffer
+
+        :raises: ValueError
+
+        """
+        if isinstance(frame_value, (header.ProtocolHeader,
+                                    heartbeat.Heartbeat)):
+            self._buffer += frame_value.marshal()
+            return
+        elif isinstance(frame_value, base.Frame):
+            frame_type = constants.FRAME_METHOD
+        elif isinstance(frame_value, header.ContentHeader):
+            frame_type = constants.FRAME_HEADER
+        elif isinstance(frame_value, body.ContentBody):
+            if self.frame_max and body.size(frame_value.value) > \
+                    self.frame_max - constants.FRAME_HEADER_SIZE - 1:
+                return self.write_body(channel_id, frame_value.value,
+                                       self.frame_max)
+            frame_type = constants.FRAME_BODY
+        else:
+            raise ValueError(
+                'Could not determine frame type: {}'.format(frame_value))
+        self._check_channel(channel_id)
+        offset = len(self._buffer)
+        self._buffer += _EMPTY_FRAME_HEADER
+        try:
+            if frame_type == constants.FRAME_METHOD:
+                self._buffer += common.Struct.integer.pack(frame_value.index)
+            self._buffer += frame_value.marshal()
+            self._finish_frame(frame_type, channel_id, offset)
+        except Exception:
+            del self._buffer[offset:]
+            raise
+
+    def write_body(self, channel_id: int, value: body.Value,
+                   frame_max: int) -> None:
+        """Append as many content body frames as needed to send the value
+        without exceeding ``frame_max``, copying each slice of the value
+        directly into the buffer.
+
+        :param channel_id: The channel to send the body on
+        :param value: The message body
+        :param frame_max: The maximum frame size negotiated for the
+            connection, or ``0`` if there is no limit. The ``frame_max`` of
+            the writer is used instead when it is lower.
+        :raises: ValueError
+
+        """
+        self._check_channel(channel_id)
+        if self.frame_max and not 0 < frame_max <= self.frame_max:
+            frame_max = self.frame_max
+        if hasattr(value, 'readinto'):
+            return self._write_file_body(channel_id, value, frame_max)
+        with memoryview(value) as view, view.cast('B') as data:
+            length = len(data)
+            frame_size = _body_frame_size(frame_max, length)
+            for offset in range(0, length, frame_size):
+                chunk = data[offset:offset + frame_size]
+                self._buffer += common.Struct.frame_header.pack(
+                    constants.FRAME_BODY, channel_id, len(chunk))
+                self._buffer += chunk
+                self._buffer += constants.FRAME_END_CHAR
+                chunk.release()
+
+    def write_message(self,
+                      channel_id: int,
+                      exchange: str,
+                      routing_key: str,
+                      properties: typing.Optional[header.BasicProperties],
+                      body_value: body.Value,
+                      frame_max: int,
+                      mandatory: bool = False) -> None:
+        """Append the Basic.Publish, ContentHeader and ContentBody frames
+        needed to publish a message. The encoded Basic.Publish frame payload
+        is cached for recently used exchange and routing key values.
+
+        :param channel_id: The channel to publish the message on
+        :param exchange: The exchange to publish to
+        :param routing_key: The message routing key
+        :param properties: The message properties
+        :param body_value: The message body
+        :param frame_max: The maximum frame size negotiated for the
+            connection, or ``0`` if there is no limit. The ``frame_max`` of
+            the writer is used instead when it is lower.
+        :param mandatory: Indicate mandatory routing
+        :raises: ValueError
+
+        """
+        self._check_channel(channel_id)
+        offset = len(self._buffer)
+        try:
+            self._buffer += common.Struct.frame_header.pack(
+                constants.FRAME_METHOD, channel_id, 0)
+            self._buffer += _publish_payload(exchange, routing_key, mandatory,
+                                             base.get_validation_mode())
+            self._finish_frame(constants.FRAME_METHOD, channel_id, offset)
+            header_offset = len(self._buffer)
+            self._buffer += _EMPTY_FRAME_HEADER
+            self._buffer += _CONTENT_HEADER.pack(commands.Basic.frame_id,
+                                                 body.size(body_value))
+            self._buffer += (properties or _EMPTY_PROPERTIES).marshal()
+            self._finish_frame(constants.FRAME_HEADER, channel_id,
+                               header_offset)
+            self.write_body(channel_id, body_value, frame_max)
+        except Exception:
+            del self._buffer[offset:]
+            raise
+
+    def _write_file_body(self, channel_id: int, value: typing.BinaryIO,
+                         frame_max: int) -> None:
+        """Read the content body frames from a file object directly into the
+        buffer.
+
+        :raises: ValueError
+
+        """
+        remaining = body.size(value)
+        frame_size = _body_frame_size(frame_max, remaining)
+        while remaining:
+            length = min(frame_size, remaining)
+            offset = len(self._buffer)
+            self._buffer += common.Struct.frame_header.pack(
+                constants.FRAME_BODY, channel_id, length)
+            self._buffer.extend(bytes(length))
+            with memoryview(self._buffer) as view:
+                payload = view[offset + constants.FRAME_HEADER_SIZE:]
+                try:
+                    _read_into(value, payload)
+                finally:
+                    payload.release()
+            self._buffer += constants.FRAME_END_CHAR
+            remaining -= length
+
+    def _check_channel(self, channel_id: int) -> None:
+        """Ensure the channel id does not exceed channel_max
+
+        :raises: ValueError
+
+        """
+        if self.channel_max and channel_id > self.channel_max:
+            raise ValueError('Channel {} exceeds channel_max {}'.format(
+                channel_id, self.channel_max))
+
+    def _finish_frame(self, frame_type: int, channel_id: int,
+                      offset: int) -> None:
+        """Pack the header of the frame starting at offset and append the
+        frame end byte.
+
+        :raises: ValueError
+
+        """
+        frame_size = len(self._buffer) - offset - constants.FRAME_HEADER_SIZE
+        if self.frame_max and \
+                frame_size + constants.FRAME_HEADER_SIZE + 1 > self.frame_max:
+            raise ValueError('Frame size {} exceeds frame_max {}'.format(
+                frame_size + constants.FRAME_HEADER_SIZE + 1, self.frame_max))
+        common.Struct.frame_header.pack_into(self._buffer, offset, frame_type,
+                                             channel_id, frame_size)
+        self._buffer += constants.FRAME_END_CHAR
+
+
+class ChannelRouter:
+    """Route unmarshaled frames to the sink registered for their channel.
+
+    A sink is any callable that accepts the frame, such as the ``append``
+    method of a :class:`collections.deque`, a callback or the
+    :meth:`~pamqp.message.MessageAssembler.feed` method of a message
+    assembler. Sinks are kept in a list indexed by channel id, which is
+    bounded by the ``channel_max`` negotiated with ``Connection.Tune``.
+
+    Channel 0 carries the ``Connection.*`` methods and heartbeats, which are
+    routed to the ``connection_sink``. Heartbeats are routed to the
+    ``heartbeat_sink`` instead when one is specified.
+
+    .. code-block:: python
+
+        router = frame.ChannelRouter(tune.channel_max, connection.receive)
+        router.register(1, assembler.feed)
+        router.route_all(reader)
+
+    :param channel_max: The maximum channel id, or ``0`` if there is no limit
+    :param connection_sink: The sink for frames received on channel 0
+    :param heartbeat_sink: The sink for heartbeat frames
+    :param default_sink: A callback that is invoked with the channel id and
+        frame for frames received on a channel without a registered sink
+
+    """
+    def __init__(self,
+                 channel_max: int = 0,
+                 connection_sink: typing.Optional[FrameSink] = None,
+                 heartbeat_sink: typing.Optional[FrameSink] = None,
+                 default_sink: typing.Optional[
+                     typing.Callable[[int, FrameTypes], typing.Any]] = None):
+        self.channel_max = channel_max or _CHANNEL_MAX
+        self.default_sink = default_sink
+        self.heartbeat_sink = heartbeat_sink
+        self._sinks: typing.List[typing.Optional[FrameSink]] = \
+            [connection_sink]
+
+    def __contains__(self, channel_id: int) -> bool:
+        """Return if a sink is registered for the channel"""
+        return 0 <= channel_id < len(self._sinks) and \
+            self._sinks[channel_id] is not None
+
+    def register(self, channel_id: int, sink: FrameSink) -> None:
+        """Register the sink for the frames received on a channel
+
+        :param channel_id: The channel id
+        :param sink: The sink to route the channel's frames to
+        :raises: ValueError
+
+        """
+        if not 0 < channel_id <= self.channel_max:
+            raise ValueError('Channel id {} is outside of 1-{}'.format(
+                channel_id, self.channel_max))
+        elif channel_id in self:
+            raise ValueError(
+                'Channel {} already has a sink registered'.format(channel_id))
+        if channel_id >= len(self._sinks):
+            self._sinks.extend([None] * (channel_id + 1 - len(self._sinks)))
+        self._sinks[channel_id] = sink
+
+    def unregister(self, channel_id: int) -> None:
+        """Remove the sink registered for a channel
+
+        :param channel_id: The channel id
+
+        """
+        if 0 < channel_id < len(self._sinks):
+            self._sinks[channel_id] = None
+
+    def route(self, channel_id: int, frame_value: FrameTypes) -> None:
+        """Pass a frame to the sink registered for its channel
+
+        :param channel_id: The channel the frame was received on
+        :param frame_value: The frame to route
+        :raises: pamqp.exceptions.AMQPChannelError
+
+        """
+        if channel_id == 0 and self.heartbeat_sink is not None and \
+                frame_value.__class__ is heartbeat.Heartbeat:
+            return self.heartbeat_sink(frame_value)
+        try:
+            sink = self._sinks[channel_id]
+        except IndexError:
+            sink = None
+        if sink is not None:
+            sink(frame_value)
+        elif self.default_sink is not None:
+            self.default_sink(channel_id, frame_value)
+        else:
+            raise exceptions.AMQPChannelError(
+                'Received {} on channel {} without a sink'.format(
+                    frame_value.name, channel_id))
+
+    def route_all(
+            self,
+            frames: typing.Iterable[typing.Tuple[int, FrameTypes]]) -> None:
+        """Route each ``(channel_id, frame)`` tuple, such as those returned by
+        iterating over a :class:`FrameReader`.
+
+        :param frames: The frames to route
+        :raises: pamqp.exceptions.AMQPChannelError
+
+        """
+        route = self.route
+        for channel_id, frame_value in frames:
+            route(channel_id, frame_value)
+
+
+def _body_frame_size(frame_max: int, length: int) -> int:
+    """Return the maximum content body frame payload size for frame_max
+
+    :raises: ValueError
+
+    """
+    if not frame_max:
+        return max(length, 1)
+    elif frame_max <= constants.FRAME_HEADER_SIZE + 1:
+        raise ValueError('Invalid frame_max: {}'.format(frame_max))
+    return frame_max - constants.FRAME_HEADER_SIZE - 1
+
+
+def _read_into(value: typing.BinaryIO, view: memoryview) -> None:
+    """Fill the view with data read from the file object
+
+    :raises: ValueError
+
+    """
+    offset = 0
+    while offset < len(view):
+        count = value.readinto(view[offset:])
+        if not count:
+            raise ValueError('Unexpected end of message body')
+        offset += count
+
+
+@functools.lru_cache(maxsize=1024)
+def _publish_payload(exchange: str, routing_key: str, mandatory: bool,
+                     validation_mode: str) -> bytes:
+    """Return the method frame payload for a Basic.Publish. The validation
+    mode is part of the cache key so that a payload cached without being
+    validated is not returned once validation is enabled.
+
+    """
+    value = commands.Basic.Publish(exchange=exchange,
+                                   routing_key=routing_key,
+                                   mandatory=mandatory)
+    return common.Struct.integer.pack(value.index) + value.marshal()
+
+
+def frame_parts(data: decode.Buffer) \
+        -> typing.Tuple[int, int, typing.Optional[int]]:
     """Attempt to decode a low-level frame, returning frame parts"""
     try:  # Get the Frame Type, Channel Number and Frame Size
-        return struct.unpack('>BHI', data[0:constants.FRAME_HEADER_SIZE])
+        return common.Struct.frame_header.unpack_from(data)
     except struct.error:  # Did not receive a full frame
         return UNMARSHAL_FAILURE
 
@@ -95,15 +847,18 @@ def frame_parts(data: bytes) -> typing.Tuple[int, int, typing.Optional[int]]:
 def _marshal(frame_type: int, channel_id: int, payload: bytes) -> bytes:
     """Marshal the low-level AMQ frame"""
     return b''.join([
-        struct.pack('>BHI', frame_type, channel_id, len(payload)), payload,
-        constants.FRAME_END_CHAR
+        common.Struct.frame_header.pack(frame_type, channel_id, len(payload)),
+        payload, constants.FRAME_END_CHAR
     ])
 
 
 def _marshal_content_body_frame(value: body.ContentBody,
                                 channel_id: int) -> bytes:
     """Marshal as many content body frames as needed to transmit the content"""
-    return _marshal(constants.FRAME_BODY, channel_id, value.marshal())
+    payload = value.marshal()
+    if isinstance(payload, memoryview):  # Size the frame in bytes, not items
+        payload = payload.cast('B')
+    return _marshal(constants.FRAME_BODY, channel_id, payload)
 
 
 def _marshal_content_header_frame(value: header.ContentHeader,
@@ -118,7 +873,7 @@ def _marshal_method_frame(value: base.Frame, channel_id: int) -> bytes:
                     common.Struct.integer.pack(value.index) + value.marshal())
 
 
-def _unmarshal_protocol_header_frame(data_in: bytes) \
+def _unmarshal_protocol_header_frame(data_in: decode.Buffer) \
         -> typing.Optional[header.ProtocolHeader]:
     """Attempt to unmarshal a protocol header frame
 
@@ -137,26 +892,27 @@ def _unmarshal_protocol_header_frame(data_in: bytes) \
     return None
 
 
-def _unmarshal_method_frame(frame_data: bytes) -> base.Frame:
+def _unmarshal_method_frame(frame_data: decode.Buffer) -> base.Frame:
     """Attempt to unmarshal a method frame
 
     :raises: pamqp.exceptions.UnmarshalingException
 
     """
-    bytes_used, method_index = decode.long_int(frame_data[0:4])
+    bytes_used, method_index = decode.long_int(frame_data)
     try:
         method = commands.INDEX_MAPPING[method_index]()
     except KeyError:
         raise exceptions.UnmarshalingException(
             'Unknown', 'Unknown method index: {}'.format(str(method_index)))
     try:
-        method.unmarshal(frame_data[bytes_used:])
+        method.unmarshal(frame_data, bytes_used)
     except struct.error as error:
         raise exceptions.UnmarshalingException(method, error)
     return method
 
 
-def _unmarshal_header_frame(frame_data: bytes) -> header.ContentHeader:
+def _unmarshal_header_frame(frame_data: decode.Buffer) \
+        -> header.ContentHeader:
     """Attempt to unmarshal a header frame
 
     :raises: pamqp.exceptions.UnmarshalingException
@@ -170,8 +926,8 @@ def _unmarshal_header_frame(frame_data: bytes) -> header.ContentHeader:
     return content_header
 
 
-def _unmarshal_body_frame(frame_data: bytes) -> body.ContentBody:
+def _unmarshal_body_frame(frame_data: decode.Buffer) -> body.ContentBody:
     """Attempt to unmarshal a body frame"""
     content_body = body.ContentBody(b'')
-    content_body.unmarshal(frame_data)
+    content_body.unmarshal(bytes(frame_data))
     return content_body
@@ -9,10 +9,28 @@ binary data into AMQP Header frames.
 import struct
 import typing
 
-from pamqp import commands, constants, decode
+from pamqp import commands, common, constants, decode
 
 BasicProperties = typing.Optional[commands.Basic.Properties]
 
+LAZY_PROPERTIES = False
+"""Toggle decoding Basic.Properties values when they are first accessed."""
+
+
+def lazy_properties(enabled: bool = True) -> None:
+    """Toggle the lazy decoding of content header properties
+
+    If called with `True`, unmarshaled content headers will have a
+    :class:`LazyProperties` object that only decodes a property value when
+    it is first accessed.
+
+    :param enabled: Specify if properties are decoded lazily
+
+    """
+    global LAZY_PROPERTIES
+
+    LAZY_PROPERTIES = enabled
+
 
 class ProtocolHeader:
     """Class that represents the AMQP Protocol Header"""
@@ -92,30 +110,121 @@ class ContentHeader:
         return struct.pack('>HxxQ', commands.Basic.frame_id,
                            self.body_size) + self.properties.marshal()
 
-    def unmarshal(self, data: bytes) -> None:
+    def unmarshal(self, data: decode.Buffer) -> None:
         """Dynamically decode the frame data applying the values to the method
         object by iterating through the attributes in order and decoding them.
 
         :param data: The raw frame data to unmarshal
 
         """
-        self.class_id, self.weight, self.body_size = struct.unpack(
-            '>HHQ', data[0:12])
-        offset, flags = self._get_flags(data[12:])
-        self.properties.unmarshal(flags, data[12 + offset:])
+        self.class_id, self.weight, self.body_size = struct.unpack_from(
+            '>HHQ', data)
+        offset, flags = self._get_flags(data, 12)
+        if LAZY_PROPERTIES:
+            self.properties = LazyProperties()
+        self.properties.unmarshal(flags, data, 12 + offset)
 
     @staticmethod
-    def _get_flags(data: bytes) -> typing.Tuple[int, int]:
+    def _get_flags(data: decode.Buffer,
+                   offset: int = 0) -> typing.Tuple[int, int]:
         """Decode the flags from the data returning the bytes consumed and
         flags.
 
         """
         bytes_consumed, flags, flagword_index = 0, 0, 0
         while True:
-            consumed, partial_flags = decode.short_int(data)
+            consumed, partial_flags = decode.short_uint(
+                data, offset + bytes_consumed)
             bytes_consumed += consumed
             flags |= (partial_flags << (flagword_index * 16))
             if not partial_flags & 1:  # pragma: nocover
                 break
             flagword_index += 1  # pragma: nocover
         return bytes_consumed, flags
+
+
+class LazyProperties(commands.Basic.Properties):
+    """Basic.Properties that are decoded as they are accessed
+
+    When unmarshaled, the offset of each property value is recorded and the
+    value is only decoded the first time it is accessed. If none of the
+    properties are assigned and the message headers are not accessed,
+    marshaling the properties returns the data they were unmarshaled from
+    without encoding them again.
+
+    """
+    def __init__(self) -> None:
+        """Initialize the LazyProperties class without any properties set"""
+        self.__dict__.update(_flags=0, _offsets={}, _data=None)
+
+    def __getattr__(self, name: str) -> common.FieldValue:
+        """Decode the value of a property that has not been accessed yet
+
+        :raises: AttributeError
+
+        """
+        if name not in self.flags:
+            raise AttributeError(name)
+        offset = self.__dict__.get('_offsets', {}).get(name)
+        if offset is None:
+            value = _PROPERTY_DEFAULTS.get(name)
+        else:
+            if name == 'headers':  # The value may be changed in place
+                self.__dict__['_modified'] = True
+            value = decode.METHODS[self.amqp_type(name)](
+                self.__dict__['_data'], offset)[1]
+        object.__setattr__(self, name, value)
+        return value
+
+    def __setattr__(self, name: str, value: common.FieldValue) -> None:
+        """Set a property value, marking the properties as modified"""
+        self.__dict__['_modified'] = True
+        object.__setattr__(self, name, value)
+
+    def marshal(self) -> bytes:
+        """Return the data the properties were unmarshaled from if they were
+        not modified, otherwise encode them.
+
+        """
+        if self.__dict__.get('_data') is None or \
+                self.__dict__.get('_modified'):
+            return super().marshal()
+        return self.encode_flags(self.__dict__['_flags']) + \
+            self.__dict__['_data']
+
+    def unmarshal(self,
+                  flags: int,
+                  data: decode.Buffer,
+                  offset: int = 0) -> None:
+        """Record the offsets of the property values in the frame data
+        without decoding them.
+
+        :param flags: The property flags indicating which values are set
+        :param data: The raw AMQP property data
+        :param offset: The position of the property values in the data
+        :raises struct.error: when the property data is truncated
+
+        """
+        value = bytes(data[offset:])
+        offsets, position = {}, 0
+        for property_name in self.__slots__:
+            if flags & self.flags[property_name]:
+                if position >= len(value):
+                    raise struct.error('Property data is truncated')
+                offsets[property_name] = position
+                data_type = self.amqp_type(property_name)
+                if data_type == 'shortstr':
+                    position += value[position] + 1
+                elif data_type in {'longstr', 'table'}:
+                    position += common.Struct.integer.unpack_from(
+                        value, position)[0] + 4
+                else:
+                    position += _PROPERTY_SIZES[data_type]
+        if position > len(value):
+            raise struct.error('Property data is truncated')
+        self.__dict__.update(_flags=flags, _offsets=offsets, _data=value,
+                             _modified=False)
+
+
+_PROPERTY_DEFAULTS = {'cluster_id': ''}
+_PROPERTY_SIZES = {'octet': 1, 'timestamp': 8}
@@ -2,8 +2,30 @@
 """
 AMQP Heartbeat Frame, used to create new Heartbeat frames for sending to a peer
 
+:class:`~pamqp.heartbeat.HeartbeatScheduler` decides when to send heartbeats
+on many connections and when their peers should be considered dead, using a
+single timer wheel instead of a timer per connection. It does not perform any
+I/O: :meth:`~pamqp.heartbeat.HeartbeatScheduler.received` and
+:meth:`~pamqp.heartbeat.HeartbeatScheduler.sent` are called when data is
+read from or written to a connection, and
+:meth:`~pamqp.heartbeat.HeartbeatScheduler.tick` is called periodically,
+returning the connections to send a heartbeat on and the connections whose
+peer has stopped sending data.
+
+.. code-block:: python
+
+    scheduler = heartbeat.HeartbeatScheduler()
+    scheduler.add(connection, tune.heartbeat)
+    ...
+    send, dead = scheduler.tick()
+    for connection in send:
+        connection.write(heartbeat.Heartbeat.value)
+
 """
+import math
 import struct
+import time
+import typing
 
 from pamqp import constants
 
@@ -22,3 +44,149 @@ class Heartbeat(object):
     def marshal(cls) -> bytes:
         """Return the binary frame content"""
         return cls.value
+
+
+class _Activity:
+    """The heartbeat interval and activity timestamps of a connection"""
+    __slots__ = ['interval', 'received', 'sent', 'slot']
+
+    def __init__(self, interval: float, now: float):
+        self.interval = interval
+        self.received = now
+        self.sent = now
+        self.slot = 0
+
+
+class HeartbeatScheduler:
+    """Schedule the heartbeats for any number of connections
+
+    A heartbeat should be sent on a connection when no other frame was sent
+    for the negotiated heartbeat interval, and the peer is considered dead
+    when nothing was received from it for two intervals.
+
+    Recording activity only updates a timestamp. Each connection is kept in
+    the slot of the timer wheel for its next deadline, and when the slot is
+    reached its timestamps are checked and it is moved to the slot of its
+    new deadline.
+
+    :param resolution: The number of seconds per slot of the timer wheel
+    :param slots: The number of slots in the timer wheel
+
+    """
+    def __init__(self, resolution: float = 1.0, slots: int = 512):
+        self.resolution = resolution
+        self._connections: typing.Dict[typing.Hashable, _Activity] = {}
+        self._tick: typing.Optional[int] = None
+        self._wheel: typing.List[typing.Set[typing.Hashable]] = \
+            [set() for _ in range(slots)]
+
+    def __contains__(self, key: typing.Hashable) -> bool:
+        """Return if heartbeats are scheduled for the connection"""
+        return key in self._connections
+
+    def __len__(self) -> int:
+        """Return the number of connections heartbeats are scheduled for"""
+        return len(self._connections)
+
+    def add(self,
+            key: typing.Hashable,
+            interval: float,
+            now: typing.Optional[float] = None) -> None:
+        """Schedule heartbeats for a connection. Heartbeats are not scheduled
+        if the interval is ``0``, as heartbeats were disabled when the
+        connection was tuned.
+
+        :param key: The connection or a hashable value identifying it
+        :param interval: The negotiated heartbeat interval in seconds
+        :param now: The current :func:`time.monotonic` time
+
+        """
+        if not interval:
+            return
+        now = time.monotonic() if now is None else now
+        if self._tick is None:
+            self._tick = int(now / self.resolution)
+        self.remove(key)
+        activity = self._connections[key] = _Activity(interval, now)
+        self._schedule(key, activity, now + interval)
+
+    def received(self, key: typing.Hashable,
+                 now: typing.Optional[float] = None) -> None:
+        """Record that data was received on a connection
+
+        :param key: The connection or a hashable value identifying it
+        :param now: The current :func:`time.monotonic` time
+
+        """
+        activity = self._connections.get(key)
+        if activity is not None:
+            activity.received = time.monotonic() if now is None else now
+
+    def remove(self, key: typing.Hashable) -> None:
+        """Stop scheduling heartbeats for a connection
+
+        :param key: The connection or a hashable value identifying it
+
+        """
+        activity = self._connections.pop(key, None)
+        if activity is not None:
+            self._wheel[activity.slot].discard(key)
+
+    def sent(self, key: typing.Hashable,
+             now: typing.Optional[float] = None) -> None:
+        """Record that a frame was sent on a connection
+
+        :param key: The connection or a hashable value identifying it
+        :param now: The current :func:`time.monotonic` time
+
+        """
+        activity = self._connections.get(key)
+        if activity is not None:
+            activity.sent = time.monotonic() if now is None else now
+
+    def tick(self, now: typing.Optional[float] = None) \
+            -> typing.Tuple[typing.List[typing.Hashable],
+                            typing.List[typing.Hashable]]:
+        """Advance the timer wheel, returning the connections a heartbeat
+        should be sent on and the connections whose peer is considered dead.
+        The heartbeats are recorded as sent and the dead connections are
+        removed from the scheduler.
+
+        :param now: The current :func:`time.monotonic` time
+
+        """
+        now = time.monotonic() if now is None else now
+        send: typing.List[typing.Hashable] = []
+        dead: typing.List[typing.Hashable] = []
+        if self._tick is None:
+            return send, dead
+        current = int(now / self.resolution)
+        if current - self._tick >= len(self._wheel):
+            ticks = range(len(self._wheel))
+        else:
+            ticks = range(self._tick + 1, current + 1)
+        self._tick = max(self._tick, current)
+        for tick in ticks:
+            slot = tick % len(self._wheel)
+            keys, self._wheel[slot] = self._wheel[slot], set()
+            for key in keys:
+                activity = self._connections[key]
+                if now - activity.received >= activity.interval * 2:
+                    del self._connections[key]
+                    dead.append(key)
+                    continue
+                elif now - activity.sent >= activity.interval:
+                    activity.sent = now
+                    send.append(key)
+                self._schedule(
+                    key, activity,
+                    min(activity.sent + activity.interval,
+                        activity.received + activity.interval * 2))
+        return send, dead
+
+    def _schedule(self, key: typing.Hashable, activity: _Activity,
+                  deadline: float) -> None:
+        """Add the connection to the slot for its next deadline"""
+        tick = max(math.ceil(deadline / self.resolution), self._tick + 1)
+        activity.slot = tick % len(self._wheel)
+        self._wheel[activity.slot].add(key)
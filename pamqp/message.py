@@ -0,0 +1,121 @@
+# -*- encoding: utf-8 -*-
+"""
+The :py:mod:`pamqp.message` module contains the
+:class:`~pamqp.message.MessageAssembler` class, which reassembles the
+``Basic.Deliver``, ``Basic.GetOk`` or ``Basic.Return`` method frame, the
+content header frame and the content body frames received on a channel into
+a :class:`~pamqp.message.Message`.
+
+The message body is allocated once, using the body size from the content
+header, and each body frame is copied into it at its offset:
+
+.. code-block:: python
+
+    assembler = message.MessageAssembler()
+    for channel_id, frame_value in reader:
+        value = assembler.feed(frame_value)
+        if value is not None:
+            process(value.method, value.properties, value.body)
+
+"""
+import mmap
+import typing
+
+from pamqp import body, commands, exceptions, frame, header
+
+Body = typing.Union[bytearray, mmap.mmap]
+"""Data types a reassembled message body is returned as"""
+
+MethodTypes = typing.Union[commands.Basic.Deliver, commands.Basic.GetOk,
+                           commands.Basic.Return]
+
+_METHODS = (commands.Basic.Deliver, commands.Basic.GetOk,
+            commands.Basic.Return)
+
+
+class Message:
+    """A message reassembled from its method, content header and content
+    body frames
+
+    :param method: The method frame the message was delivered with
+    :param properties: The message properties
+    :param body: The message body
+
+    """
+    __slots__ = ['method', 'properties', 'body']
+
+    def __init__(self, method: MethodTypes,
+                 properties: commands.Basic.Properties,
+                 body: Body):
+        self.method = method
+        self.properties = properties
+        self.body = body
+
+    def __repr__(self) -> str:
+        return '<Message method={} body_size={}>'.format(
+            self.method.name, len(self.body))
+
+
+class MessageAssembler:
+    """Reassemble the messages received on a channel. Frames that are not part
+    of a message are ignored, so every frame received on the channel can be
+    passed to :meth:`~pamqp.message.MessageAssembler.feed`.
+
+    :param spill_threshold: The body size above which to reassemble the body
+        in a memory-mapped temporary file, see :func:`pamqp.body.allocate`
+
+    """
+    def __init__(self, spill_threshold: typing.Optional[int] = None):
+        self.spill_threshold = spill_threshold
+        self._method: typing.Optional[MethodTypes] = None
+        self._properties: typing.Optional[commands.Basic.Properties] = None
+        self._body: typing.Optional[Body] = None
+        self._offset = 0
+
+    @property
+    def in_progress(self) -> bool:
+        """Return if a message is partially assembled"""
+        return self._method is not None
+
+    def feed(self, frame_value: frame.FrameTypes) \
+            -> typing.Optional[Message]:
+        """Add a frame to the message being assembled, returning the message
+        when it is complete.
+
+        :param frame_value: The frame received on the channel
+        :raises: pamqp.exceptions.AMQPUnexpectedFrame
+
+        """
+        if isinstance(frame_value, body.ContentBody):
+            if self._body is None:
+                raise exceptions.AMQPUnexpectedFrame(frame_value)
+            end = self._offset + len(frame_value.value)
+            if end > len(self._body):
+                raise exceptions.AMQPUnexpectedFrame(frame_value)
+            self._body[self._offset:end] = frame_value.value
+            self._offset = end
+        elif isinstance(frame_value, header.ContentHeader):
+            if self._method is None or self._body is not None:
+                raise exceptions.AMQPUnexpectedFrame(frame_value)
+            self._properties = frame_value.properties
+            self._body = body.allocate(frame_value.body_size,
+                                       self.spill_threshold)
+        elif isinstance(frame_value, _METHODS):
+            if self._method is not None:
+                raise exceptions.AMQPUnexpectedFrame(frame_value)
+            self._method = frame_value
+            return None
+        else:
+            return None
+        if self._offset < len(self._body):
+            return None
+        message = Message(self._method, self._properties, self._body)
+        self.reset()
+        return message
+
+    def reset(self) -> None:
+        """Discard the partially assembled message, if any"""
+        self._method = None
+        self._properties = None
+        self._body = None
+        self._offset = 0
@@ -0,0 +1,164 @@
+# -*- encoding: utf-8 -*-
+import asyncio
+import socket
+import unittest
+from unittest import mock
+
+from pamqp import aio, body, commands, exceptions, frame, header, heartbeat
+
+
+class FrameProtocolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.frames = [
+            (1, commands.Basic.Deliver('ctag0', 1, False, 'ex', 'rk')),
+            (1, header.ContentHeader(body_size=5)),
+            (1, body.ContentBody(b'hello')),
+            (0, heartbeat.Heartbeat())]
+        self.data = b''.join(frame.marshal(value, channel)
+                             for channel, value in self.frames)
+
+    def assertFramesEqual(self, received):
+        self.assertEqual(
+            [(channel, frame.marshal(value, channel))
+             for channel, value in received],
+            [(channel, frame.marshal(value, channel))
+             for channel, value in self.frames])
+
+    def test_buffer_updated_invokes_callback(self):
+        received = []
+        protocol = aio.FrameProtocol(
+            lambda channel, value: received.append((channel, value)))
+        for offset in range(0, len(self.data), 7):
+            chunk = self.data[offset:offset + 7]
+            buffer = protocol.get_buffer(-1)
+            buffer[:len(chunk)] = chunk
+            protocol.buffer_updated(len(chunk))
+        self.assertFramesEqual(received)
+
+    def test_async_iteration_over_socket(self):
+        async def run():
+            local, remote = socket.socketpair()
+            loop = asyncio.get_running_loop()
+            transport, protocol = await loop.create_connection(
+                aio.FrameProtocol, sock=local)
+            remote.sendall(self.data)
+            remote.close()
+            received = [value async for value in protocol]
+            transport.close()
+            return received
+
+        self.assertFramesEqual(asyncio.run(run()))
+
+    def test_write(self):
+        async def run():
+            local, remote = socket.socketpair()
+            loop = asyncio.get_running_loop()
+            transport, protocol = await loop.create_connection(
+                aio.FrameProtocol, sock=local)
+            protocol.write(heartbeat.Heartbeat(), 0)
+            await asyncio.sleep(0)
+            transport.close()
+            value = remote.recv(1024)
+            remote.close()
+            return value
+
+        self.assertEqual(asyncio.run(run()), heartbeat.Heartbeat.value)
+
+    def test_unmarshaling_error_is_raised(self):
+        async def run():
+            local, remote = socket.socketpair()
+            loop = asyncio.get_running_loop()
+            transport, protocol = await loop.create_connection(
+                aio.FrameProtocol, sock=local)
+            remote.sendall(b'\x01\x00\x01\x00\x00\x00\x01\x00\x00')
+            try:
+                async for _value in protocol:
+                    pass
+            finally:
+                remote.close()
+
+        with self.assertRaises(exceptions.UnmarshalingException):
+            asyncio.run(run())
+
+
+class FrameProtocolWatermarkTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.data = frame.marshal(commands.Basic.Ack(1), 1)
+        self.transport = mock.Mock(spec=asyncio.Transport)
+
+    def receive(self, protocol, data):
+        buffer = protocol.get_buffer(len(data))
+        buffer[:len(data)] = data
+        protocol.buffer_updated(len(data))
+
+    def test_pause_on_queued_frames(self):
+        async def run():
+            protocol = aio.FrameProtocol(high_water=4, low_water=1)
+            protocol.connection_made(self.transport)
+            self.receive(protocol, self.data * 3)
+            self.assertFalse(protocol.reading_paused)
+            self.receive(protocol, self.data)
+            self.assertTrue(protocol.reading_paused)
+            self.transport.pause_reading.assert_called_once_with()
+            for _ in range(2):
+                await protocol.__anext__()
+            self.transport.resume_reading.assert_not_called()
+            await protocol.__anext__()
+            self.assertFalse(protocol.reading_paused)
+            self.transport.resume_reading.assert_called_once_with()
+
+        asyncio.run(run())
+
+    def test_pause_on_buffered_bytes(self):
+        protocol = aio.FrameProtocol(lambda *args: None,
+                                     high_water_bytes=16)
+        protocol.connection_made(self.transport)
+        protocol.reader.feed(self.data)
+        self.assertTrue(protocol.reading_paused)
+        self.transport.pause_reading.assert_called_once_with()
+        list(protocol.reader)
+        self.assertFalse(protocol.reading_paused)
+        self.transport.resume_reading.assert_called_once_with()
+
+    def test_reading_stays_paused_on_buffered_bytes(self):
+        async def run():
+            protocol = aio.FrameProtocol(high_water_bytes=1024)
+            protocol.connection_made(self.transport)
+            count = 2048 // len(self.data)
+            self.receive(protocol, self.data * count)
+            self.assertTrue(protocol.reading_paused)
+            self.transport.pause_reading.assert_called_once_with()
+            self.transport.resume_reading.assert_not_called()
+            received = [await protocol.__anext__()
+                        for _ in range(count - 256 // len(self.data) - 1)]
+            self.assertTrue(protocol.reading_paused)
+            self.transport.resume_reading.assert_not_called()
+            received.append(await protocol.__anext__())
+            self.assertFalse(protocol.reading_paused)
+            self.transport.resume_reading.assert_called_once_with()
+            while protocol._frames or len(protocol.reader):
+                received.append(await protocol.__anext__())
+            self.assertEqual(len(received), count)
+
+        asyncio.run(run())
+
+    def test_callback_does_not_pause_on_buffered_bytes(self):
+        protocol = aio.FrameProtocol(lambda *args: None,
+                                     high_water_bytes=16)
+        protocol.connection_made(self.transport)
+        self.receive(protocol, self.data * 4)
+        self.assertFalse(protocol.reading_paused)
+        self.transport.pause_reading.assert_not_called()
+        self.transport.resume_reading.assert_not_called()
+
+    def test_callback_frames_are_not_queued(self):
+        protocol = aio.FrameProtocol(lambda *args: None, high_water=1)
+        protocol.connection_made(self.transport)
+        self.receive(protocol, self.data * 4)
+        self.assertFalse(protocol.reading_paused)
+
+    def test_invalid_watermarks(self):
+        with self.assertRaises(ValueError):
+            aio.FrameProtocol(high_water=1, low_water=2)
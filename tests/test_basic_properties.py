@@ -0,0 +1,231 @@
+# -*- encoding: utf-8 -*-
+import copy
+import datetime
+import unittest
+
+from pamqp import base, commands, encode, frame, header
+
+
+class FreezeTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.properties = commands.Basic.Properties(
+            app_id='unittest', content_type='application/json',
+            delivery_mode=2, headers={'foo': ['bar', {'baz': 1}]},
+            timestamp=datetime.datetime(2019, 12, 19, 23, 29))
+        self.frozen = self.properties.freeze()
+
+    def test_frozen_is_properties_instance(self):
+        self.assertIsInstance(self.frozen, commands.Basic.Properties)
+
+    def test_frozen_equals_properties(self):
+        self.assertEqual(self.frozen, self.properties)
+
+    def test_frozen_not_equal_to_other_properties(self):
+        self.assertNotEqual(self.frozen,
+                            commands.Basic.Properties(app_id='unittest'))
+
+    def test_frozen_attributes(self):
+        self.assertEqual(len(self.frozen), len(self.properties))
+        self.assertDictEqual(dict(self.frozen), dict(self.properties))
+
+    def test_frozen_marshal(self):
+        self.assertEqual(self.frozen.marshal(), self.properties.marshal())
+
+    def test_frozen_content_header(self):
+        self.assertEqual(
+            frame.marshal(header.ContentHeader(0, 10, self.frozen), 1),
+            frame.marshal(header.ContentHeader(0, 10, self.properties), 1))
+
+    def test_frozen_is_immutable(self):
+        with self.assertRaises(AttributeError):
+            self.frozen.app_id = 'foo'
+
+    def test_frozen_is_a_copy(self):
+        self.properties.headers['foo'].append('qux')
+        self.assertEqual(self.frozen.headers, {'foo': ['bar', {'baz': 1}]})
+
+    def test_frozen_attributes_can_not_be_deleted(self):
+        with self.assertRaises(AttributeError):
+            del self.frozen.content_type
+        self.assertEqual(self.frozen.content_type, 'application/json')
+
+    def test_frozen_headers_are_immutable(self):
+        with self.assertRaises(TypeError):
+            self.frozen.headers['foo'] = 'qux'
+        with self.assertRaises(TypeError):
+            self.frozen.headers.clear()
+
+    def test_frozen_nested_headers_are_immutable(self):
+        with self.assertRaises(TypeError):
+            self.frozen.headers['foo'].append('qux')
+        with self.assertRaises(TypeError):
+            self.frozen.headers['foo'][1]['baz'] = 2
+        self.assertEqual(self.frozen.headers, {'foo': ['bar', {'baz': 1}]})
+
+    def test_frozen_headers_can_be_reused(self):
+        properties = commands.Basic.Properties(
+            app_id='unittest', content_type='application/json',
+            delivery_mode=2, headers=self.frozen.headers,
+            timestamp=datetime.datetime(2019, 12, 19, 23, 29))
+        self.assertEqual(properties.marshal(), self.frozen.marshal())
+
+    def test_frozen_deepcopy(self):
+        self.assertIs(copy.deepcopy(self.frozen), self.frozen)
+        headers = copy.deepcopy(self.frozen.headers)
+        self.assertEqual(headers, self.frozen.headers)
+        with self.assertRaises(TypeError):
+            headers['foo'].append('qux')
+
+
+class PropertiesCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = base.cache_properties(2)
+
+    def tearDown(self):
+        base.cache_properties(0)
+
+    def test_disable(self):
+        self.assertIsNone(base.cache_properties(0))
+        self.assertIsNone(base.PROPERTIES_CACHE)
+
+    def test_hits_and_misses(self):
+        for _offset in range(4):
+            commands.Basic.Properties(
+                app_id='unittest', headers={'foo': 'bar'}).marshal()
+        self.assertEqual((self.cache.hits, self.cache.misses), (3, 1))
+        self.assertEqual(self.cache.hit_rate, 0.75)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_changed_values_are_encoded(self):
+        properties = commands.Basic.Properties(headers={'foo': 'bar'})
+        expectation = properties.marshal()
+        properties.headers['foo'] = 'baz'
+        self.assertNotEqual(properties.marshal(), expectation)
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_table_key_order_is_part_of_the_key(self):
+        properties = commands.Basic.Properties(headers={'b': 1, 'a': 2})
+        expectation = properties._marshal()
+        properties.marshal()
+        encode.sort_table_keys(False)
+        self.addCleanup(encode.sort_table_keys, True)
+        self.assertNotEqual(properties.marshal(), expectation)
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_unsorted_table_key_order_is_part_of_the_key(self):
+        encode.sort_table_keys(False)
+        self.addCleanup(encode.sort_table_keys, True)
+        first = commands.Basic.Properties(headers={'a': 1, 'b': 2})
+        second = commands.Basic.Properties(headers={'b': 2, 'a': 1})
+        self.assertEqual(first.marshal(), first._marshal())
+        self.assertEqual(second.marshal(), second._marshal())
+        self.assertNotEqual(first.marshal(), second.marshal())
+
+    def test_sorted_table_key_order_is_not_part_of_the_key(self):
+        commands.Basic.Properties(headers={'a': 1, 'b': 2}).marshal()
+        commands.Basic.Properties(headers={'b': 2, 'a': 1}).marshal()
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_deprecated_rabbitmq_support_is_part_of_the_key(self):
+        properties = commands.Basic.Properties(headers={'foo': 1})
+        properties.marshal()
+        encode.support_deprecated_rabbitmq()
+        self.addCleanup(encode.support_deprecated_rabbitmq, False)
+        self.assertEqual(properties.marshal(), properties._marshal())
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_value_types_are_part_of_the_key(self):
+        first = commands.Basic.Properties(headers={'foo': 1}).marshal()
+        second = commands.Basic.Properties(headers={'foo': True}).marshal()
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_least_recently_used_is_evicted(self):
+        for value in ['foo', 'bar', 'foo', 'baz', 'foo', 'bar']:
+            commands.Basic.Properties(app_id=value).marshal()
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 4))
+        self.assertEqual(len(self.cache), 2)
+
+    def test_unhashable_values_are_not_cached(self):
+        properties = commands.Basic.Properties(headers={'foo': {1, 2}})
+        with self.assertRaises(TypeError):
+            properties.marshal()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_clear(self):
+        commands.Basic.Properties(app_id='foo').marshal()
+        self.cache.clear()
+        self.assertEqual((len(self.cache), self.cache.misses), (0, 0))
+
+
+class LazyPropertiesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        header.lazy_properties()
+        self.properties = commands.Basic.Properties(
+            app_id='unittest', content_type='text/plain',
+            correlation_id='d146482a', delivery_mode=2,
+            headers={'foo': 'bar'}, message_id='4b5baed7',
+            timestamp=datetime.datetime(2019, 12, 19, 23, 29))
+        self.frame_data = frame.marshal(
+            header.ContentHeader(0, 10, self.properties), 1)
+        self.value = frame.unmarshal(self.frame_data)[2]
+
+    def tearDown(self):
+        header.lazy_properties(False)
+
+    def test_properties_are_lazy(self):
+        self.assertIsInstance(self.value.properties, header.LazyProperties)
+
+    def test_properties_are_not_lazy_when_disabled(self):
+        header.lazy_properties(False)
+        value = frame.unmarshal(self.frame_data)[2]
+        self.assertNotIsInstance(value.properties, header.LazyProperties)
+
+    def test_property_values(self):
+        self.assertEqual(self.value.properties.content_type, 'text/plain')
+        self.assertEqual(self.value.properties.correlation_id, 'd146482a')
+        self.assertEqual(self.value.properties.delivery_mode, 2)
+        self.assertEqual(self.value.properties.timestamp,
+                         datetime.datetime(2019, 12, 19, 23, 29))
+
+    def test_unset_property_values(self):
+        self.assertIsNone(self.value.properties.content_encoding)
+        self.assertEqual(self.value.properties.cluster_id, '')
+
+    def test_values_are_decoded_on_access(self):
+        descriptor = commands.Basic.Properties.message_id
+        with self.assertRaises(AttributeError):
+            descriptor.__get__(self.value.properties)
+        self.assertEqual(self.value.properties.message_id, '4b5baed7')
+        self.assertEqual(descriptor.__get__(self.value.properties),
+                         '4b5baed7')
+
+    def test_equals_properties(self):
+        self.assertEqual(self.value.properties, self.properties)
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            self.value.properties.foo
+
+    def test_unmodified_marshal_returns_original_data(self):
+        self.value.properties.correlation_id
+        self.assertEqual(frame.marshal(self.value, 1), self.frame_data)
+
+    def test_modified_marshal(self):
+        self.value.properties.app_id = 'foo'
+        self.properties.app_id = 'foo'
+        self.assertEqual(self.value.properties.marshal(),
+                         self.properties.marshal())
+
+    def test_headers_changed_in_place(self):
+        self.value.properties.headers['foo'] = 'baz'
+        self.properties.headers['foo'] = 'baz'
+        self.assertEqual(self.value.properties.marshal(),
+                         self.properties.marshal())
+
+    def test_empty_lazy_properties(self):
+        self.assertEqual(header.LazyProperties().marshal(),
+                         commands.Basic.Properties().marshal())
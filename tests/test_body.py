@@ -0,0 +1,91 @@
+# -*- encoding: utf-8 -*-
+import io
+import mmap
+import unittest
+
+from pamqp import body, frame
+
+
+class ContentBodyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.value = bytes(range(256)) * 4
+        self.expectation = b''.join(
+            frame.marshal(body.ContentBody(self.value[i:i + 100]), 1)
+            for i in range(0, len(self.value), 100))
+
+    def test_file_length_from_current_position(self):
+        handle = io.BytesIO(self.value)
+        handle.seek(24)
+        self.assertEqual(len(body.ContentBody(handle)), 1000)
+        self.assertEqual(handle.tell(), 24)
+
+    def test_memoryview_size(self):
+        self.assertEqual(body.size(memoryview(self.value).cast('I')), 1024)
+
+    def test_memoryview_marshal(self):
+        value = frame.marshal(
+            body.ContentBody(memoryview(self.value).cast('I')), 1)
+        self.assertEqual(value,
+                         frame.marshal(body.ContentBody(self.value), 1))
+        self.assertEqual(frame.unmarshal(value)[2].value, self.value)
+
+    def test_file_marshal(self):
+        self.assertEqual(
+            frame.marshal(body.ContentBody(io.BytesIO(self.value)), 1),
+            frame.marshal(body.ContentBody(self.value), 1))
+
+    def test_marshal_segments_from_file(self):
+        self.assertEqual(
+            b''.join(frame.marshal_segments(
+                body.ContentBody(io.BytesIO(self.value)), 1)),
+            frame.marshal(body.ContentBody(self.value), 1))
+
+    def test_stream_body_from_file(self):
+        frames = list(frame.stream_body(1, io.BytesIO(self.value), 108))
+        self.assertEqual(len(frames), 11)
+        self.assertEqual(b''.join(frames), self.expectation)
+
+    def test_stream_body_from_mmap(self):
+        value = mmap.mmap(-1, len(self.value))
+        value.write(self.value)
+        self.assertEqual(b''.join(frame.stream_body(1, value, 108)),
+                         self.expectation)
+
+    def test_stream_body_truncated_file(self):
+        class Truncated(io.BytesIO):
+            def readinto(self, buffer):
+                return 0
+
+        with self.assertRaises(ValueError):
+            list(frame.stream_body(1, Truncated(self.value), 108))
+
+    def test_writer_body_from_file(self):
+        writer = frame.FrameWriter()
+        writer.write_body(1, io.BytesIO(self.value), 108)
+        self.assertEqual(writer.getvalue(), self.expectation)
+
+    def test_marshal_message_from_file(self):
+        self.assertEqual(
+            frame.marshal_message(1, 'ex', 'rk', None,
+                                  io.BytesIO(self.value), 108),
+            frame.marshal_message(1, 'ex', 'rk', None, self.value, 108))
+
+
+class AllocateTestCase(unittest.TestCase):
+
+    def test_allocate_bytearray(self):
+        value = body.allocate(1024)
+        self.assertIsInstance(value, bytearray)
+        self.assertEqual(len(value), 1024)
+
+    def test_allocate_below_threshold(self):
+        self.assertIsInstance(body.allocate(1024, 1024), bytearray)
+
+    def test_allocate_above_threshold(self):
+        value = body.allocate(1025, 1024)
+        self.assertIsInstance(value, mmap.mmap)
+        self.assertEqual(len(value), 1025)
+        value[1020:1025] = b'hello'
+        self.assertEqual(value[1020:], b'hello')
+        value.close()
@@ -0,0 +1,87 @@
+import collections
+import unittest
+from unittest import mock
+
+from pamqp import body, commands, exceptions, frame, heartbeat
+
+
+class ChannelRouterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.connection_frames = collections.deque()
+        self.router = frame.ChannelRouter(
+            8, connection_sink=self.connection_frames.append)
+
+    def test_route_to_registered_sink(self):
+        frames = collections.deque()
+        self.router.register(3, frames.append)
+        value = body.ContentBody(b'foo')
+        self.router.route(3, value)
+        self.assertEqual(list(frames), [value])
+        self.assertEqual(list(self.connection_frames), [])
+
+    def test_route_channel_zero(self):
+        value = commands.Connection.Blocked()
+        self.router.route(0, value)
+        self.router.route(0, heartbeat.Heartbeat())
+        self.assertIs(self.connection_frames[0], value)
+        self.assertIsInstance(self.connection_frames[1], heartbeat.Heartbeat)
+
+    def test_route_heartbeat_sink(self):
+        heartbeats = []
+        router = frame.ChannelRouter(
+            connection_sink=self.connection_frames.append,
+            heartbeat_sink=heartbeats.append)
+        router.route(0, heartbeat.Heartbeat())
+        router.route(0, commands.Connection.Unblocked())
+        self.assertEqual(len(heartbeats), 1)
+        self.assertEqual(len(self.connection_frames), 1)
+
+    def test_route_all(self):
+        frames = collections.deque()
+        self.router.register(1, frames.append)
+        reader = frame.FrameReader()
+        reader.feed(
+            frame.marshal_many([(commands.Connection.Blocked(), 0),
+                                (commands.Basic.Ack(1), 1),
+                                (commands.Basic.Ack(2), 1)]))
+        self.router.route_all(reader)
+        self.assertEqual([value.delivery_tag for value in frames], [1, 2])
+        self.assertEqual(len(self.connection_frames), 1)
+
+    def test_unrouted_frame_raises(self):
+        with self.assertRaises(exceptions.AMQPChannelError):
+            self.router.route(2, commands.Basic.Ack(1))
+        with self.assertRaises(exceptions.AMQPChannelError):
+            self.router.route(1000, commands.Basic.Ack(1))
+
+    def test_default_sink(self):
+        unrouted = []
+        router = frame.ChannelRouter(
+            default_sink=lambda *args: unrouted.append(args))
+        value = commands.Basic.Ack(1)
+        router.route(5, value)
+        router.route(0, value)
+        self.assertEqual(unrouted, [(5, value), (0, value)])
+
+    def test_register_outside_channel_max_raises(self):
+        for channel_id in (0, 9, -1):
+            with self.assertRaises(ValueError):
+                self.router.register(channel_id, mock.Mock())
+
+    def test_register_twice_raises(self):
+        self.router.register(1, mock.Mock())
+        with self.assertRaises(ValueError):
+            self.router.register(1, mock.Mock())
+
+    def test_unregister(self):
+        self.router.register(2, mock.Mock())
+        self.assertIn(2, self.router)
+        self.router.unregister(2)
+        self.assertNotIn(2, self.router)
+        self.router.unregister(7)
+        with self.assertRaises(exceptions.AMQPChannelError):
+            self.router.route(2, commands.Basic.Ack(1))
+
+    def test_channel_max_defaults_to_limit(self):
+        self.assertEqual(frame.ChannelRouter().channel_max, 65535)
@@ -1,7 +1,8 @@
+import threading
 import unittest
 import uuid
 
-from pamqp import commands
+from pamqp import base, commands, header
 
 
 class ArgumentErrorsTestCase(unittest.TestCase):
@@ -252,3 +253,111 @@ class ArgumentErrorsTestCase(unittest.TestCase):
     def test_queue_purge_queue_characters(self):
         with self.assertRaises(ValueError):
             commands.Queue.Purge(queue='***')
+
+
+class ValidationModeTestCase(unittest.TestCase):
+
+    def tearDown(self):
+        base.set_validation_mode('strict')
+
+    def test_strict(self):
+        self.assertEqual(base.VALIDATION_MODE, 'strict')
+        with self.assertRaises(ValueError):
+            commands.Basic.Consume(queue='*')
+        value = commands.Basic.Consume(queue='foo')
+        value.queue = '*'
+        with self.assertRaises(ValueError):
+            value.marshal()
+
+    def test_construct_only(self):
+        base.set_validation_mode('construct-only')
+        with self.assertRaises(ValueError):
+            commands.Basic.Consume(queue='*')
+        value = commands.Basic.Consume(queue='foo')
+        value.queue = '*'
+        self.assertIn(b'*', value.marshal())
+
+    def test_marshal_only(self):
+        base.set_validation_mode('marshal-only')
+        value = commands.Basic.Consume(queue='*')
+        with self.assertRaises(ValueError):
+            value.marshal()
+        with self.assertRaises(ValueError):
+            value.marshal_into(bytearray(value.sizeof()))
+        commands.Basic.Properties(delivery_mode=3)
+
+    def test_marshal_only_validates_properties(self):
+        base.set_validation_mode('marshal-only')
+        properties = commands.Basic.Properties(delivery_mode=3)
+        with self.assertRaises(ValueError):
+            properties.marshal()
+        with self.assertRaises(ValueError):
+            properties.freeze()
+        with self.assertRaises(ValueError):
+            header.ContentHeader(0, 10, properties).marshal()
+
+    def test_marshal_only_validates_cached_properties(self):
+        base.set_validation_mode('marshal-only')
+        base.cache_properties()
+        self.addCleanup(base.cache_properties, 0)
+        properties = commands.Basic.Properties(delivery_mode=2)
+        properties.marshal()
+        properties.delivery_mode = 3
+        with self.assertRaises(ValueError):
+            properties.marshal()
+
+    def test_off(self):
+        base.set_validation_mode('off')
+        value = commands.Basic.Consume(queue='*')
+        self.assertIn(b'*', value.marshal())
+        commands.Basic.Properties(delivery_mode=3).marshal()
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            base.set_validation_mode('lenient')
+        self.assertEqual(base.VALIDATION_MODE, 'strict')
+
+    def test_validation_mode_context_manager(self):
+        with base.validation_mode('off'):
+            self.assertEqual(base.get_validation_mode(), 'off')
+            self.assertFalse(base.validate_on_construct())
+            self.assertFalse(base.validate_on_marshal())
+            self.assertEqual(base.VALIDATION_MODE, 'strict')
+            self.assertIn(b'*', commands.Basic.Consume(queue='*').marshal())
+        self.assertEqual(base.get_validation_mode(), 'strict')
+        with self.assertRaises(ValueError):
+            commands.Basic.Consume(queue='*')
+
+    def test_validation_mode_overrides_global_mode(self):
+        base.set_validation_mode('off')
+        with base.validation_mode('strict'):
+            with self.assertRaises(ValueError):
+                commands.Basic.Consume(queue='*')
+        commands.Basic.Consume(queue='*')
+
+    def test_validation_mode_is_scoped_to_the_thread(self):
+        errors = []
+
+        def construct():
+            try:
+                commands.Basic.Consume(queue='*')
+            except ValueError as error:
+                errors.append(error)
+
+        with base.validation_mode('off'):
+            thread = threading.Thread(target=construct)
+            thread.start()
+            thread.join()
+        self.assertEqual(len(errors), 1)
+
+    def test_validation_mode_invalid(self):
+        with self.assertRaises(ValueError):
+            with base.validation_mode('lenient'):
+                pass
+
+    def test_validation_mode_restored_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with base.validation_mode('marshal-only'):
+                raise RuntimeError()
+        self.assertEqual(base.get_validation_mode(), 'strict')
+        self.assertTrue(base.validate_on_construct())
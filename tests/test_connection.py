@@ -0,0 +1,274 @@
+import unittest
+
+from pamqp import commands, connection, exceptions, frame, header, heartbeat
+
+
+def server_frames(*frames):
+    return frame.marshal_many(frames)
+
+
+class ConnectionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = connection.Connection(
+            'user', 'pass', 'vhost', {'product': 'test'},
+            channel_max=32, heartbeat=30)
+
+    def negotiate(self):
+        self.connection.connect()
+        self.connection.data_received(
+            server_frames((commands.Connection.Start(), 0),
+                          (commands.Connection.Tune(2047, 131072, 60), 0),
+                          (commands.Connection.OpenOk(), 0)))
+        self.connection.data_to_send()
+
+    def sent(self):
+        reader = frame.FrameReader()
+        reader.feed(self.connection.data_to_send())
+        return list(reader)
+
+    def test_connect_sends_protocol_header(self):
+        self.connection.connect()
+        self.assertEqual(self.connection.state, connection.STARTING)
+        self.assertEqual(self.connection.data_to_send(),
+                         header.ProtocolHeader().marshal())
+        self.assertEqual(self.connection.data_to_send(), b'')
+
+    def test_start_sends_start_ok(self):
+        self.connection.connect()
+        self.connection.data_to_send()
+        self.connection.data_received(
+            server_frames((commands.Connection.Start(
+                server_properties={'product': 'broker'}), 0)))
+        self.assertEqual(self.connection.state, connection.TUNING)
+        self.assertEqual(self.connection.server_properties,
+                         {'product': 'broker'})
+        [(channel_id, value)] = self.sent()
+        self.assertEqual(channel_id, 0)
+        self.assertIsInstance(value, commands.Connection.StartOk)
+        self.assertEqual(value.response, '\0user\0pass')
+        self.assertEqual(value.client_properties, {'product': 'test'})
+
+    def test_tune_negotiates_and_opens(self):
+        self.connection.connect()
+        self.connection.data_received(
+            server_frames((commands.Connection.Start(), 0)))
+        self.connection.data_to_send()
+        self.connection.data_received(
+            server_frames((commands.Connection.Tune(2047, 0, 60), 0)))
+        self.assertEqual(self.connection.state, connection.OPENING)
+        tune_ok, open_value = [value for _, value in self.sent()]
+        self.assertEqual(tune_ok.channel_max, 32)
+        self.assertEqual(tune_ok.frame_max, 131072)
+        self.assertEqual(tune_ok.heartbeat, 30)
+        self.assertEqual(open_value.virtual_host, 'vhost')
+
+    def test_tune_applies_limits(self):
+        self.negotiate()
+        self.assertEqual(self.connection._reader.frame_max, 131072)
+        self.assertEqual(self.connection._writer.channel_max, 32)
+        with self.assertRaises(exceptions.AMQPFrameError):
+            self.connection.data_received(b'\x03\x00\x01\x00\x03\x00\x00\x00')
+
+    def test_tune_uses_server_heartbeat_when_not_set(self):
+        value = connection.Connection()
+        value.connect()
+        value.data_received(
+            server_frames((commands.Connection.Start(), 0),
+                          (commands.Connection.Tune(0, 4096, 60), 0)))
+        self.assertEqual(value.heartbeat, 60)
+        self.assertEqual(value.channel_max, 0)
+        self.assertEqual(value.frame_max, 4096)
+
+    def test_tune_disabled_heartbeat(self):
+        value = connection.Connection(heartbeat=0)
+        value.connect()
+        value.data_received(
+            server_frames((commands.Connection.Start(), 0),
+                          (commands.Connection.Tune(0, 4096, 60), 0)))
+        self.assertEqual(value.heartbeat, 0)
+        reader = frame.FrameReader()
+        reader.feed(value.data_to_send())
+        tune_ok = [frame_value for _, frame_value in reader
+                   if isinstance(frame_value, commands.Connection.TuneOk)]
+        self.assertEqual(tune_ok[0].heartbeat, 0)
+
+    def test_open_ok_opens_connection(self):
+        self.negotiate()
+        self.assertEqual(self.connection.state, connection.OPEN)
+
+    def test_data_received_returns_frames(self):
+        self.connection.connect()
+        received = self.connection.data_received(
+            server_frames((commands.Connection.Start(), 0),
+                          (heartbeat.Heartbeat(), 0)))
+        self.assertIsInstance(received[0][1], commands.Connection.Start)
+        self.assertIsInstance(received[1][1], heartbeat.Heartbeat)
+
+    def test_partial_data_received(self):
+        self.connection.connect()
+        value = server_frames((commands.Connection.Start(), 0))
+        self.assertEqual(self.connection.data_received(value[:10]), [])
+        self.assertEqual(len(self.connection.data_received(value[10:])), 1)
+
+    def test_unexpected_frame_raises(self):
+        self.connection.connect()
+        with self.assertRaises(exceptions.AMQPUnexpectedFrame):
+            self.connection.data_received(
+                server_frames((commands.Connection.OpenOk(), 0)))
+
+    def test_server_close(self):
+        self.negotiate()
+        channel = self.connection.open_channel()
+        self.connection.data_received(
+            server_frames(
+                (commands.Connection.Close(320, 'Shutdown', 0, 0), 0)))
+        self.assertEqual(self.connection.state, connection.CLOSED)
+        self.assertEqual(channel.state, connection.CLOSED)
+        self.assertEqual(self.connection.channels, {})
+        self.assertIsInstance(self.sent()[-1][1],
+                              commands.Connection.CloseOk)
+
+    def test_client_close(self):
+        self.negotiate()
+        self.connection.close()
+        self.assertEqual(self.connection.state, connection.CLOSING)
+        self.assertIsInstance(self.sent()[0][1], commands.Connection.Close)
+        self.connection.data_received(
+            server_frames((commands.Connection.CloseOk(), 0)))
+        self.assertEqual(self.connection.state, connection.CLOSED)
+
+    def test_blocked_and_unblocked(self):
+        self.negotiate()
+        self.connection.data_received(
+            server_frames((commands.Connection.Blocked(), 0)))
+        self.assertTrue(self.connection.blocked)
+        self.connection.data_received(
+            server_frames((commands.Connection.Unblocked(), 0)))
+        self.assertFalse(self.connection.blocked)
+
+    def test_open_channel_before_open_raises(self):
+        with self.assertRaises(exceptions.AMQPChannelError):
+            self.connection.open_channel()
+
+
+class ChannelTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = connection.Connection(channel_max=2)
+        self.connection.connect()
+        self.connection.data_received(
+            server_frames((commands.Connection.Start(), 0),
+                          (commands.Connection.Tune(0, 131072, 0), 0),
+                          (commands.Connection.OpenOk(), 0)))
+        self.connection.data_to_send()
+        self.channel = self.connection.open_channel()
+
+    def sent(self):
+        reader = frame.FrameReader()
+        reader.feed(self.connection.data_to_send())
+        return list(reader)
+
+    def test_open_channel(self):
+        self.assertEqual(self.channel.channel_id, 1)
+        self.assertEqual(self.channel.state, connection.OPENING)
+        self.assertIsInstance(self.channel.pending, commands.Channel.Open)
+        [(channel_id, value)] = self.sent()
+        self.assertEqual(channel_id, 1)
+        self.assertIsInstance(value, commands.Channel.Open)
+        self.connection.data_received(
+            server_frames((commands.Channel.OpenOk(), 1)))
+        self.assertEqual(self.channel.state, connection.OPEN)
+        self.assertIsNone(self.channel.pending)
+
+    def test_open_channel_ids(self):
+        self.assertEqual(self.connection.open_channel().channel_id, 2)
+        with self.assertRaises(exceptions.AMQPChannelError):
+            self.connection.open_channel()
+
+    def test_open_channel_id_in_use_raises(self):
+        with self.assertRaises(exceptions.AMQPChannelError):
+            self.connection.open_channel(1)
+
+    def test_synchronous_methods_are_held_back(self):
+        self.connection.data_received(
+            server_frames((commands.Channel.OpenOk(), 1)))
+        self.sent()
+        self.channel.send(commands.Basic.Ack(1))
+        self.channel.send(commands.Queue.Declare(queue='foo'))
+        self.channel.send(commands.Queue.Bind(queue='foo', exchange='bar'))
+        self.channel.send(commands.Basic.Publish(exchange='bar'))
+        self.assertEqual([type(value) for _, value in self.sent()],
+                         [commands.Basic.Ack, commands.Queue.Declare])
+        self.connection.data_received(
+            server_frames((commands.Queue.DeclareOk('foo', 0, 0), 1)))
+        self.assertIsInstance(self.channel.pending, commands.Queue.Bind)
+        self.assertEqual([type(value) for _, value in self.sent()],
+                         [commands.Queue.Bind])
+        self.connection.data_received(
+            server_frames((commands.Queue.BindOk(), 1)))
+        self.assertIsNone(self.channel.pending)
+        self.assertEqual([type(value) for _, value in self.sent()],
+                         [commands.Basic.Publish])
+
+    def test_held_back_frames_are_sent_up_to_next_synchronous_method(self):
+        self.connection.data_received(
+            server_frames((commands.Channel.OpenOk(), 1)))
+        self.channel.send(commands.Queue.Declare(queue='foo'))
+        self.channel.send(commands.Queue.Declare(queue='bar'))
+        self.channel.send(commands.Basic.Ack(1))
+        self.channel.send(commands.Queue.Declare(queue='baz'))
+        self.channel.send(commands.Basic.Ack(2))
+        self.sent()
+        self.connection.data_received(
+            server_frames((commands.Queue.DeclareOk('foo', 0, 0), 1)))
+        self.assertEqual([type(value) for _, value in self.sent()],
+                         [commands.Queue.Declare])
+        self.connection.data_received(
+            server_frames((commands.Queue.DeclareOk('bar', 0, 0), 1)))
+        self.assertEqual(
+            [type(value) for _, value in self.sent()],
+            [commands.Basic.Ack, commands.Queue.Declare])
+        self.assertEqual(self.channel.pending.queue, 'baz')
+
+    def test_nowait_methods_are_not_tracked(self):
+        self.connection.data_received(
+            server_frames((commands.Channel.OpenOk(), 1)))
+        self.channel.send(commands.Queue.Declare(queue='foo', nowait=True))
+        self.assertIsNone(self.channel.pending)
+
+    def test_unrelated_response_is_ignored(self):
+        self.connection.data_received(
+            server_frames((commands.Channel.OpenOk(), 1)))
+        self.channel.send(commands.Queue.Declare(queue='foo'))
+        self.connection.data_received(
+            server_frames(
+                (commands.Basic.Deliver('ctag', 1, False, 'ex', 'rk'), 1)))
+        self.assertIsInstance(self.channel.pending, commands.Queue.Declare)
+
+    def test_server_channel_close(self):
+        self.sent()
+        self.connection.data_received(
+            server_frames((commands.Channel.Close(404, 'Not Found', 0, 0), 1)))
+        self.assertEqual(self.channel.state, connection.CLOSED)
+        self.assertNotIn(1, self.connection.channels)
+        self.assertIsInstance(self.sent()[0][1], commands.Channel.CloseOk)
+        with self.assertRaises(exceptions.AMQPChannelError):
+            self.channel.send(commands.Basic.Ack(1))
+
+    def test_client_channel_close(self):
+        self.connection.data_received(
+            server_frames((commands.Channel.OpenOk(), 1)))
+        self.channel.send(commands.Channel.Close(200, '', 0, 0))
+        self.connection.data_received(
+            server_frames((commands.Channel.CloseOk(), 1)))
+        self.assertEqual(self.channel.state, connection.CLOSED)
+        self.assertNotIn(1, self.connection.channels)
+
+    def test_flow_is_acknowledged(self):
+        self.sent()
+        self.connection.data_received(
+            server_frames((commands.Channel.Flow(False), 1)))
+        [(channel_id, value)] = self.sent()
+        self.assertIsInstance(value, commands.Channel.FlowOk)
+        self.assertFalse(value.active)
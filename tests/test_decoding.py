@@ -2,6 +2,8 @@
 import datetime
 import decimal
 import struct
+import sys
+import threading
 import unittest
 
 from pamqp import decode
@@ -741,3 +743,172 @@ class CodecDecodeTests(unittest.TestCase):
                                             int(dt.timestamp() * 1000))
         self.assertEqual(decode.timestamp(large_timestamp_bytes)[1],
                          dt.replace(tzinfo=None))
+
+
+class BufferDecodeTests(unittest.TestCase):
+    FIELD_TBL = CodecDecodeTests.FIELD_TBL
+
+    def test_decode_short_str_at_offset(self):
+        self.assertEqual(decode.short_str(b'\xff\xff\x030123', 2), (4, '012'))
+
+    def test_decode_long_str_from_memoryview(self):
+        value = memoryview(b'\x00\x00\x00\x00\x04\xe2\x9c\x88!')
+        self.assertEqual(decode.long_str(value, 1), (8, '✈!'))
+
+    def test_decode_long_str_invalid_utf8_from_memoryview(self):
+        value = memoryview(b'\x00\x00\x00\x02\xff\xfe')
+        self.assertEqual(decode.long_str(value), (6, b'\xff\xfe'))
+
+    def test_decode_byte_array_from_bytearray(self):
+        value = bytearray(b'\x00\x00\x00\x00\x03abc')
+        self.assertEqual(decode.byte_array(value, 1), (7, bytearray(b'abc')))
+
+    def test_decode_bit_at_offset(self):
+        self.assertTrue(decode.bit(b'\x00\x04', 2, 1)[1])
+
+    def test_decode_field_table_at_offset(self):
+        value = b'\x00\x00' + self.FIELD_TBL
+        expectation = decode.field_table(self.FIELD_TBL)
+        self.assertEqual(decode.field_table(value, 2), expectation)
+
+    def test_decode_field_table_from_memoryview(self):
+        expectation = decode.field_table(self.FIELD_TBL)
+        self.assertEqual(
+            decode.field_table(memoryview(self.FIELD_TBL)), expectation)
+
+    def test_decode_field_array_at_offset(self):
+        value = b'\xffA\x00\x00\x00\x06b\x01b\x02b\x03'
+        self.assertEqual(decode.embedded_value(value, 1), (11, [1, 2, 3]))
+
+
+class LazyFieldTableTests(unittest.TestCase):
+    FIELD_TBL = CodecDecodeTests.FIELD_TBL
+
+    def setUp(self):
+        decode.lazy_field_tables()
+
+    def tearDown(self):
+        decode.lazy_field_tables(False)
+
+    def test_field_table_returns_lazy_table(self):
+        consumed, value = decode.field_table(self.FIELD_TBL)
+        self.assertEqual(consumed, len(self.FIELD_TBL))
+        self.assertIsInstance(value, decode.LazyFieldTable)
+
+    def test_lazy_table_equals_decoded_table(self):
+        value = decode.field_table(self.FIELD_TBL)[1]
+        decode.lazy_field_tables(False)
+        self.assertEqual(value, decode.field_table(self.FIELD_TBL)[1])
+
+    def test_lazy_table_keys(self):
+        value = decode.LazyFieldTable(self.FIELD_TBL)
+        self.assertEqual(len(value), 10)
+        self.assertIn('strval', value)
+        self.assertNotIn('foo', value)
+        self.assertEqual(list(value)[0], 'arrayval')
+
+    def test_lazy_table_values_are_decoded_once(self):
+        value = decode.LazyFieldTable(self.FIELD_TBL)
+        self.assertIs(value['arrayval'], value['arrayval'])
+        self.assertEqual(value['arrayval'], [1, 2, 3])
+
+    def test_lazy_table_nested_table(self):
+        value = decode.LazyFieldTable(self.FIELD_TBL)
+        self.assertIsInstance(value['dictval'], decode.LazyFieldTable)
+        self.assertEqual(value['dictval'], {'f✉': '✐'})
+
+    def test_lazy_table_at_offset(self):
+        value = decode.LazyFieldTable(memoryview(b'\x00' + self.FIELD_TBL), 1)
+        self.assertEqual(value.encoded, self.FIELD_TBL)
+
+    def test_truncated_lazy_table_raises(self):
+        for length in range(4, len(self.FIELD_TBL)):
+            with self.assertRaises(struct.error):
+                decode.LazyFieldTable(self.FIELD_TBL[:length])
+
+    def test_lazy_table_with_value_past_end_raises(self):
+        with self.assertRaises(struct.error):
+            decode.LazyFieldTable(b'\x00\x00\x00\x04\x01aS\x00\x00')
+
+    def test_lazy_table_missing_key(self):
+        with self.assertRaises(KeyError):
+            decode.LazyFieldTable(self.FIELD_TBL)['foo']
+
+    def test_lazy_table_unknown_type(self):
+        with self.assertRaises(ValueError):
+            decode.LazyFieldTable(b'\x00\x00\x00\x03\x01aZ')
+
+    def test_lazy_table_invalid_value(self):
+        with self.assertRaises(ValueError):
+            decode.LazyFieldTable(None)
+
+
+class StringCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = decode.cache_short_strings(2)
+
+    def tearDown(self):
+        decode.cache_short_strings(0)
+
+    def test_short_str_shares_decoded_value(self):
+        data = bytearray(b'\x0eorders.created')
+        first = decode.short_str(data)[1]
+        second = decode.short_str(memoryview(data))[1]
+        self.assertEqual(first, 'orders.created')
+        self.assertIs(first, second)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(self.cache.hit_rate, 0.5)
+
+    def test_field_table_keys_are_cached(self):
+        data = b'\x00\x00\x00\x0c\x07x-deathV\x01aV'
+        first = decode.field_table(data)[1]
+        second = decode.LazyFieldTable(data)
+        self.assertEqual(first, {'x-death': None, 'a': None})
+        self.assertIs(list(first)[0], list(second)[0])
+        self.assertEqual(len(self.cache), 2)
+
+    def test_utf8_value(self):
+        self.assertEqual(decode.short_str(b'\x03\xc3\xbcb')[1], 'üb')
+        self.assertEqual(self.cache.decode(b'\xc3\xbcb'), 'üb')
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_oldest_value_is_evicted(self):
+        for value in (b'a', b'b', b'c'):
+            self.cache.decode(value)
+        self.assertEqual(len(self.cache), 2)
+        self.cache.decode(b'a')
+        self.assertEqual(self.cache.misses, 4)
+
+    def test_concurrent_eviction(self):
+        cache = decode.StringCache(1)
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+        errors = []
+
+        def decode_values(prefix):
+            try:
+                for offset in range(2000):
+                    cache.decode('{}{}'.format(prefix, offset).encode())
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=decode_values, args=(prefix, ))
+                   for prefix in 'abcdefgh']
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_clear(self):
+        self.cache.decode(b'a')
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.hit_rate, 0.0)
+
+    def test_disabled(self):
+        self.assertIsNone(decode.cache_short_strings(0))
+        self.assertIsNone(decode.SHORT_STRING_CACHE)
+        self.assertEqual(decode.short_str(b'\x01a')[1], 'a')
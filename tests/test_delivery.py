@@ -0,0 +1,198 @@
+import unittest
+
+from pamqp import commands, delivery
+
+
+def describe(frames):
+    return [(channel_id, value.name, value.delivery_tag, value.multiple,
+             getattr(value, 'requeue', None))
+            for channel_id, value in frames]
+
+
+class AckCoalescerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.coalescer = delivery.AckCoalescer(max_batch=4, max_delay=1.0)
+
+    def test_contiguous_acks_are_coalesced(self):
+        for tag in range(1, 4):
+            self.assertEqual(self.coalescer.ack(1, tag, now=0), [])
+        self.assertEqual(len(self.coalescer), 3)
+        frames = self.coalescer.ack(1, 4, now=0)
+        self.assertEqual(describe(frames),
+                         [(1, 'Basic.Ack', 4, True, None)])
+        self.assertEqual(len(self.coalescer), 0)
+
+    def test_single_ack_is_not_multiple(self):
+        self.coalescer.ack(1, 1, now=0)
+        self.assertEqual(describe(self.coalescer.flush()),
+                         [(1, 'Basic.Ack', 1, False, None)])
+
+    def test_dispositions_are_split_into_ranges(self):
+        self.coalescer.ack(1, 1, now=0)
+        self.coalescer.ack(1, 2, now=0)
+        self.coalescer.nack(1, 3, now=0)
+        frames = self.coalescer.nack(1, 4, requeue=False, now=0)
+        self.assertEqual(describe(frames),
+                         [(1, 'Basic.Ack', 2, True, None),
+                          (1, 'Basic.Nack', 3, False, True),
+                          (1, 'Basic.Nack', 4, False, False)])
+
+    def test_gap_close_flushes(self):
+        self.assertEqual(self.coalescer.ack(1, 2, now=0), [])
+        self.assertEqual(self.coalescer.ack(1, 3, now=0), [])
+        self.assertEqual(describe(self.coalescer.ack(1, 1, now=0)),
+                         [(1, 'Basic.Ack', 3, True, None)])
+
+    def test_stragglers_are_settled_individually(self):
+        self.coalescer.max_batch = 100
+        for tag in (1, 2, 4, 6):
+            self.coalescer.ack(1, tag, now=0)
+        self.assertEqual(describe(self.coalescer.flush(1)),
+                         [(1, 'Basic.Ack', 2, True, None),
+                          (1, 'Basic.Ack', 4, False, None),
+                          (1, 'Basic.Ack', 6, False, None)])
+        self.coalescer.ack(1, 5, now=0)
+        self.assertEqual(describe(self.coalescer.ack(1, 3, now=0)),
+                         [(1, 'Basic.Ack', 5, True, None)])
+        self.coalescer.ack(1, 7, now=0)
+        self.assertEqual(describe(self.coalescer.flush()),
+                         [(1, 'Basic.Ack', 7, False, None)])
+
+    def test_max_delay(self):
+        self.coalescer.ack(1, 1, now=10)
+        self.coalescer.ack(2, 1, now=10.5)
+        self.assertEqual(self.coalescer.poll(now=10.9), [])
+        self.assertEqual(describe(self.coalescer.poll(now=11)),
+                         [(1, 'Basic.Ack', 1, False, None)])
+        self.assertEqual(describe(self.coalescer.ack(2, 2, now=11.5)),
+                         [(2, 'Basic.Ack', 2, True, None)])
+
+    def test_channels_are_independent(self):
+        self.coalescer.ack(1, 1, now=0)
+        self.coalescer.ack(2, 1, now=0)
+        self.assertEqual(describe(self.coalescer.flush(2)),
+                         [(2, 'Basic.Ack', 1, False, None)])
+        self.assertEqual(len(self.coalescer), 1)
+        self.assertEqual(self.coalescer.flush(3), [])
+
+    def test_discard(self):
+        self.coalescer.ack(1, 1, now=0)
+        self.coalescer.discard(1)
+        self.assertEqual(self.coalescer.flush(), [])
+        self.assertEqual(self.coalescer.ack(1, 1, now=0), [])
+
+    def test_duplicate_tag_raises(self):
+        self.coalescer.ack(1, 2, now=0)
+        with self.assertRaises(ValueError):
+            self.coalescer.nack(1, 2, now=0)
+        self.coalescer.ack(1, 1, now=0)
+        with self.assertRaises(ValueError):
+            self.coalescer.ack(1, 1, now=0)
+
+    def test_frames_are_basic_methods(self):
+        self.coalescer.ack(1, 1, now=0)
+        self.coalescer.nack(1, 2, now=0)
+        frames = [value for _, value in self.coalescer.flush()]
+        self.assertIsInstance(frames[0], commands.Basic.Ack)
+        self.assertIsInstance(frames[1], commands.Basic.Nack)
+
+
+class ConfirmTrackerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tracker = delivery.ConfirmTracker()
+        self.confirmed = []
+
+    def callback(self, delivery_tag, acked):
+        self.confirmed.append((delivery_tag, acked))
+
+    def publish(self, count, callback=None):
+        return [self.tracker.publish(callback) for _ in range(count)]
+
+    def test_publish_assigns_sequential_tags(self):
+        self.assertEqual(self.publish(3), [1, 2, 3])
+        self.assertEqual(self.tracker.next_delivery_tag, 4)
+        self.assertEqual(len(self.tracker), 3)
+        self.assertIn(2, self.tracker)
+        self.assertNotIn(4, self.tracker)
+
+    def test_contiguous_publishes_are_one_interval(self):
+        self.publish(10000)
+        self.assertEqual(self.tracker._firsts, [1])
+        self.assertEqual(self.tracker._lasts, [10000])
+
+    def test_single_confirm_splits_interval(self):
+        self.publish(5)
+        self.assertEqual(self.tracker.confirm(3), [(3, 3)])
+        self.assertEqual(self.tracker._firsts, [1, 4])
+        self.assertEqual(self.tracker._lasts, [2, 5])
+        self.assertEqual(len(self.tracker), 4)
+        self.assertEqual(self.tracker.confirm(1), [(1, 1)])
+        self.assertEqual(self.tracker.confirm(5), [(5, 5)])
+        self.assertEqual(self.tracker.confirm(2), [(2, 2)])
+        self.assertEqual(self.tracker._firsts, [4])
+        self.assertEqual(self.tracker._lasts, [4])
+
+    def test_unknown_confirm_is_ignored(self):
+        self.publish(2)
+        self.tracker.confirm(1)
+        self.assertEqual(self.tracker.confirm(1), [])
+        self.assertEqual(self.tracker.confirm(7), [])
+        self.assertEqual(self.tracker.confirm(0), [])
+        self.assertEqual(len(self.tracker), 1)
+
+    def test_multiple_confirm(self):
+        self.publish(10)
+        self.tracker.confirm(3)
+        self.assertEqual(self.tracker.confirm(6, multiple=True),
+                         [(1, 2), (4, 6)])
+        self.assertEqual(len(self.tracker), 4)
+        self.assertEqual(self.tracker._firsts, [7])
+        self.assertEqual(self.tracker.confirm(10, multiple=True), [(7, 10)])
+        self.assertEqual(len(self.tracker), 0)
+
+    def test_multiple_confirm_at_interval_end(self):
+        self.publish(6)
+        self.tracker.confirm(4)
+        self.assertEqual(self.tracker.confirm(3, multiple=True), [(1, 3)])
+        self.assertEqual(self.tracker._firsts, [5])
+        self.assertEqual(self.tracker._lasts, [6])
+
+    def test_multiple_confirm_zero_confirms_all(self):
+        self.publish(4)
+        self.assertEqual(self.tracker.confirm(0, multiple=True), [(1, 4)])
+        self.assertEqual(len(self.tracker), 0)
+
+    def test_callbacks(self):
+        self.publish(2, self.callback)
+        self.publish(1)
+        self.publish(2, self.callback)
+        self.tracker.confirm(4, acked=False)
+        self.tracker.confirm(5, multiple=True)
+        self.assertEqual(self.confirmed,
+                         [(4, False), (1, True), (2, True), (5, True)])
+        self.assertEqual(self.tracker._callbacks, {})
+
+    def test_callbacks_for_large_range(self):
+        self.publish(100000)
+        self.tracker.publish(self.callback)
+        self.tracker.confirm(100001, multiple=True)
+        self.assertEqual(self.confirmed, [(100001, True)])
+
+    def test_process(self):
+        self.publish(4, self.callback)
+        self.assertEqual(
+            self.tracker.process(commands.Basic.Ack(2, multiple=True)),
+            [(1, 2)])
+        self.assertEqual(self.tracker.process(commands.Basic.Nack(3)),
+                         [(3, 3)])
+        self.assertEqual(self.confirmed, [(1, True), (2, True), (3, False)])
+
+    def test_reset(self):
+        self.publish(3, self.callback)
+        self.tracker.reset()
+        self.assertEqual(len(self.tracker), 0)
+        self.assertEqual(self.tracker.publish(), 1)
+        self.tracker.confirm(1)
+        self.assertEqual(self.confirmed, [])
@@ -1,9 +1,14 @@
 # -*- encoding: utf-8 -*-
 import datetime
 import decimal
+import enum
+import sys
+import threading
 import unittest
+from unittest import mock
+import uuid
 
-from pamqp import encode
+from pamqp import decode, encode
 
 
 class MarshalingTests(unittest.TestCase):
@@ -366,6 +371,7 @@ class EncodeTableIntegerTestCase(unittest.TestCase):
     def test_table_integer(self):
         tests = {
             'short-short': (32, b'b '),
+            'short-short-negative': (-128, b'b\x80'),
             'short': (1024, b's\x04\x00'),
             'short-negative': (-1024, b's\xfc\x00'),
             'short-unsigned': (32768, b'u\x80\x00'),
@@ -387,8 +393,10 @@ class EncodeTableIntegerTestCase(unittest.TestCase):
         self.assertTrue(encode.DEPRECATED_RABBITMQ_SUPPORT)
         tests = {
             'short-short': (32, b'b '),
+            'short-short-negative': (-1, b'b\xff'),
             'short': (1024, b's\x04\x00'),
             'short-negative': (-1024, b's\xfc\x00'),
+            'short-signed': (32768, b'I\x00\x00\x80\x00'),
             'long': (65536, b'I\x00\x01\x00\x00'),
             'long-negative': (65536, b'I\x00\x01\x00\x00'),
             'long-long': (2147483648, b'l\x00\x00\x00\x00\x80\x00\x00\x00'),
@@ -408,3 +416,201 @@ class EncodeTableIntegerTestCase(unittest.TestCase):
         self.assertTrue(encode.DEPRECATED_RABBITMQ_SUPPORT)
         with self.assertRaises(TypeError):
             encode.table_integer(9223372036854775809)
+
+    def test_table_integer_wrong_type(self):
+        with self.assertRaises(TypeError):
+            encode.table_integer(1.5)
+
+
+class TableTypeTestCase(unittest.TestCase):
+
+    def setUp(self):
+        for value in (encode.TABLE_TYPES, encode._table_encoders):
+            patcher = mock.patch.dict(value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_subclass_uses_base_class_encoder(self):
+        class Priority(enum.IntEnum):
+            HIGH = 9
+
+        self.assertEqual(encode.encode_table_value(Priority.HIGH), b'b\x09')
+        self.assertIn(Priority, encode._table_encoders)
+
+    def test_register_table_type(self):
+        value = uuid.UUID('7f9c2a3e-51b4-4d8e-9a6b-0c1d2e3f4a5b')
+        with self.assertRaises(TypeError):
+            encode.encode_table_value(value)
+        encode.register_table_type(
+            uuid.UUID, lambda value: encode.encode_table_value(str(value)))
+        self.assertEqual(encode.field_table({'id': value}),
+                         encode.field_table({'id': str(value)}))
+
+    def test_register_table_type_replaces_cached_subclass_encoder(self):
+        class Flag(str):
+            pass
+
+        self.assertEqual(encode.encode_table_value(Flag('on')),
+                         b'S\x00\x00\x00\x02on')
+        encode.register_table_type(Flag, lambda value: b't\x01')
+        self.assertEqual(encode.encode_table_value(Flag('on')), b't\x01')
+
+
+class EncodeIntoTestCase(unittest.TestCase):
+    VALUES = {
+        'bytearray': bytearray(b'\x00\x01\x02'),
+        'double': 3.141592653589793,
+        'field_array': [1, -1, 'two', 3.0, True, None, bytearray(b'x')],
+        'long': 2147483647,
+        'longlong': -9223372036854775808,
+        'longstr': 'Spëcial',
+        'octet': 255,
+        'short': 65535,
+        'shortstr': 'amq.direct',
+        'table': {
+            'array': ['a', {'b': 1}],
+            'decimal': decimal.Decimal('3.14'),
+            'int': 70000,
+            'nested': {'key': 'value', 'empty': {}},
+            'timestamp': datetime.datetime(2024, 1, 1,
+                                           tzinfo=datetime.timezone.utc),
+            'ü': 'unicode key'},
+        'timestamp': datetime.datetime(2024, 1, 1,
+                                       tzinfo=datetime.timezone.utc),
+        'void': None,
+    }
+
+    def test_sizeof(self):
+        for data_type, value in self.VALUES.items():
+            self.assertEqual(
+                encode.sizeof(value, data_type),
+                len(encode.by_type(value, data_type) or b''), data_type)
+
+    def test_encode_into(self):
+        for data_type, value in self.VALUES.items():
+            expectation = encode.by_type(value, data_type) or b''
+            buffer = bytearray(len(expectation) + 3)
+            self.assertEqual(
+                encode.encode_into(memoryview(buffer), 3, value, data_type),
+                len(expectation), data_type)
+            self.assertEqual(buffer[3:], expectation, data_type)
+
+    def test_encode_into_lazy_field_table(self):
+        value = {'lazy': decode.LazyFieldTable(
+            encode.field_table({'key': 'value'}))}
+        expectation = encode.field_table(value)
+        buffer = bytearray(encode.sizeof(value, 'table'))
+        encode.encode_into(buffer, 0, value, 'table')
+        self.assertEqual(buffer, expectation)
+
+    def test_unknown_type(self):
+        with self.assertRaises(TypeError):
+            encode.sizeof(1, 'foo')
+        with self.assertRaises(TypeError):
+            encode.encode_into(bytearray(8), 0, 1, 'foo')
+
+    def test_invalid_value(self):
+        for data_type in ('bytearray', 'field_array', 'shortstr', 'table'):
+            with self.assertRaises(TypeError):
+                encode.sizeof(1, data_type)
+            with self.assertRaises(TypeError):
+                encode.encode_into(bytearray(8), 0, 1, data_type)
+
+    def test_invalid_table_value(self):
+        with self.assertRaises(TypeError):
+            encode.sizeof({'key': object()}, 'table')
+        with self.assertRaises(TypeError):
+            encode.encode_into(bytearray(32), 0, {'key': object()}, 'table')
+
+
+class FieldTableKeyTestCase(unittest.TestCase):
+    VALUE = {'b': 1, 'a': [{'d': 2, 'c': 3}]}
+    SORTED = (b'\x00\x00\x00\x18\x01aA\x00\x00\x00\rF\x00\x00\x00\x08'
+              b'\x01cb\x03\x01db\x02\x01bb\x01')
+    UNSORTED = (b'\x00\x00\x00\x18\x01bb\x01\x01aA\x00\x00\x00\rF\x00'
+                b'\x00\x00\x08\x01db\x02\x01cb\x03')
+
+    def tearDown(self):
+        encode.sort_table_keys(True)
+        encode.cache_table_keys()
+
+    def test_sorted_by_default(self):
+        self.assertTrue(encode.SORT_TABLE_KEYS)
+        self.assertEqual(encode.field_table(self.VALUE), self.SORTED)
+
+    def test_sort_table_keys_disabled(self):
+        encode.sort_table_keys(False)
+        self.assertEqual(encode.field_table(self.VALUE), self.UNSORTED)
+        buffer = bytearray(len(self.UNSORTED))
+        encode.encode_into(buffer, 0, self.VALUE, 'table')
+        self.assertEqual(buffer, self.UNSORTED)
+
+    def test_sort_keys_argument(self):
+        self.assertEqual(encode.field_table(self.VALUE, sort_keys=False),
+                         self.UNSORTED)
+        encode.sort_table_keys(False)
+        self.assertEqual(encode.field_table(self.VALUE, sort_keys=True),
+                         self.SORTED)
+
+    def test_keys_are_cached(self):
+        encode.field_table({'x-death': 1})
+        self.assertEqual(encode._table_keys['x-death'], b'\x07x-death')
+
+    def test_cache_evicts_oldest_key(self):
+        encode.cache_table_keys(2)
+        encode.field_table({'a': 1, 'b': 2, 'c': 3})
+        self.assertEqual(list(encode._table_keys), ['b', 'c'])
+
+    def test_cache_disabled(self):
+        encode.cache_table_keys(0)
+        self.assertEqual(encode.field_table(self.VALUE), self.SORTED)
+        self.assertEqual(encode._table_keys, {})
+
+    def test_long_key_is_truncated(self):
+        key = 'k' * 200
+        for _attempt in range(2):
+            self.assertEqual(encode.field_table({key: None}),
+                             b'\x00\x00\x00\x82\x80' + b'k' * 128 + b'V')
+
+    def test_concurrent_eviction(self):
+        encode.cache_table_keys(1)
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+        errors = []
+
+        def encode_keys(prefix):
+            try:
+                for offset in range(2000):
+                    encode.field_table({'{}{}'.format(prefix, offset): 1})
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=encode_keys, args=(prefix, ))
+                   for prefix in 'abcdefgh']
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+
+class LazyFieldTableEncodingTests(unittest.TestCase):
+    FIELD_TBL = (b'\x00\x00\x00\x19\x03zzzS\x00\x00\x00\x03bar\x03aaa'
+                 b'F\x00\x00\x00\x04\x01bb\x01')
+
+    def test_encode_field_table_writes_encoded_value(self):
+        self.assertEqual(
+            encode.field_table(decode.LazyFieldTable(self.FIELD_TBL)),
+            self.FIELD_TBL)
+
+    def test_encode_table_value(self):
+        self.assertEqual(
+            encode.encode_table_value(decode.LazyFieldTable(self.FIELD_TBL)),
+            b'F' + self.FIELD_TBL)
+
+    def test_encode_nested_lazy_field_table(self):
+        value = {'foo': decode.LazyFieldTable(self.FIELD_TBL)}
+        self.assertEqual(
+            encode.field_table(value),
+            b'\x00\x00\x00"\x03fooF' + self.FIELD_TBL)
@@ -3,7 +3,7 @@ import datetime
 import unittest
 import uuid
 
-from pamqp import body, commands, frame, header, heartbeat
+from pamqp import base, body, commands, frame, header, heartbeat
 
 
 class MarshalingTests(unittest.TestCase):
@@ -91,3 +91,95 @@ class MarshalingTests(unittest.TestCase):
     def test_unknown_frame_type(self):
         with self.assertRaises(ValueError):
             frame.marshal(self, 1)
+
+
+class CodecTests(unittest.TestCase):
+    def test_invalid_fixed_width_value_raises_type_error(self):
+        frame_obj = commands.Basic.Ack(1, False)
+        frame_obj.delivery_tag = 'foo'
+        with self.assertRaises(TypeError):
+            frame_obj.marshal()
+
+    def test_out_of_range_fixed_width_value_raises_type_error(self):
+        frame_obj = commands.Basic.Qos(prefetch_count=1)
+        frame_obj.prefetch_count = 70000
+        with self.assertRaises(TypeError):
+            frame_obj.marshal()
+
+    def test_bits_round_trip(self):
+        frame_obj = commands.Exchange.Declare(
+            exchange='foo', durable=True, internal=True, nowait=True)
+        value = commands.Exchange.Declare()
+        value.unmarshal(frame_obj.marshal())
+        self.assertEqual(dict(value), dict(frame_obj))
+
+    def test_more_than_eight_bits(self):
+        class Flags(base.Frame):
+            __slots__ = ['bit{}'.format(i) for i in range(10)] + ['value']
+            _value = 'short'
+
+        for i in range(10):
+            setattr(Flags, '_bit{}'.format(i), 'bit')
+        frame_obj = Flags()
+        for i in range(10):
+            setattr(frame_obj, 'bit{}'.format(i), i in {0, 7, 9})
+        frame_obj.value = 2
+        data = frame_obj.marshal()
+        self.assertEqual(data, b'\x81\x02\x00\x02')
+        value = Flags()
+        value.unmarshal(data)
+        self.assertEqual(dict(value), dict(frame_obj))
+
+    def test_marshal_into(self):
+        for frame_obj in (
+                commands.Basic.Ack(1, True),
+                commands.Basic.Publish(exchange='amq.direct',
+                                       routing_key='orders.created'),
+                commands.Exchange.Declare(exchange='foo', durable=True),
+                commands.Queue.Declare(queue='orders', arguments={
+                    'x-queue-type': 'quorum', 'x-max-length': 1000})):
+            expectation = frame_obj.marshal()
+            self.assertEqual(frame_obj.sizeof(), len(expectation))
+            buffer = bytearray(len(expectation) + 2)
+            self.assertEqual(frame_obj.marshal_into(buffer, 2),
+                             len(expectation))
+            self.assertEqual(buffer[2:], expectation)
+
+    def test_marshal_into_invalid_fixed_width_value_raises_type_error(self):
+        frame_obj = commands.Basic.Qos(prefetch_count=1)
+        frame_obj.prefetch_count = 70000
+        with self.assertRaises(TypeError):
+            frame_obj.marshal_into(bytearray(frame_obj.sizeof()))
+
+
+class SegmentMarshalingTests(unittest.TestCase):
+    def test_content_body_segments_reference_value(self):
+        value = bytearray(b'hello world')
+        segments = frame.marshal_segments(body.ContentBody(value), 1)
+        self.assertEqual(b''.join(segments),
+                         frame.marshal(body.ContentBody(bytes(value)), 1))
+        value[0:5] = b'HELLO'
+        self.assertEqual(bytes(segments[1]), b'HELLO world')
+
+    def test_content_body_memoryview(self):
+        value = memoryview(b'hello world')[6:]
+        self.assertEqual(
+            b''.join(frame.marshal_segments(body.ContentBody(value), 1)),
+            frame.marshal(body.ContentBody(b'world'), 1))
+
+    def test_method_frame_segments(self):
+        value = commands.Basic.Ack(1, False)
+        self.assertEqual(frame.marshal_segments(value, 1),
+                         [frame.marshal(value, 1)])
+
+    def test_body_segments_are_split_at_frame_max(self):
+        value = bytes(range(256)) * 4
+        segments = frame.marshal_body_segments(1, value, 108)
+        self.assertEqual(len(segments), 33)
+        self.assertEqual(
+            b''.join(segments),
+            b''.join(frame.marshal(body.ContentBody(value[i:i + 100]), 1)
+                     for i in range(0, len(value), 100)))
+
+    def test_body_segments_for_empty_body(self):
+        self.assertEqual(frame.marshal_body_segments(1, b'', 4096), [])
@@ -0,0 +1,158 @@
+# -*- encoding: utf-8 -*-
+import unittest
+
+from pamqp import body, commands, exceptions, frame, header, heartbeat
+
+
+class FrameReaderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.frames = [
+            (0, header.ProtocolHeader()),
+            (1, commands.Basic.Publish(exchange='foo', routing_key='bar')),
+            (1, header.ContentHeader(body_size=5)),
+            (1, body.ContentBody(b'hello')),
+            (0, heartbeat.Heartbeat()),
+            (2, commands.Basic.Ack(delivery_tag=10, multiple=True))]
+        self.data = b''.join(frame.marshal(value, channel)
+                             for channel, value in self.frames)
+
+    def assertFramesEqual(self, received):
+        self.assertEqual(len(received), len(self.frames))
+        for (channel, value), (expected_channel, expectation) in zip(
+                received, self.frames):
+            self.assertEqual(channel, expected_channel)
+            self.assertIsInstance(value, type(expectation))
+            self.assertEqual(frame.marshal(value, channel),
+                             frame.marshal(expectation, channel))
+
+    def test_feed_all_at_once(self):
+        reader = frame.FrameReader()
+        reader.feed(self.data)
+        self.assertFramesEqual(list(reader))
+        self.assertEqual(len(reader), 0)
+
+    def test_feed_byte_by_byte(self):
+        reader = frame.FrameReader(16)
+        received = []
+        for offset in range(len(self.data)):
+            reader.feed(self.data[offset:offset + 1])
+            received.extend(reader)
+        self.assertFramesEqual(received)
+        self.assertEqual(len(reader), 0)
+
+    def test_partial_frame_returns_none(self):
+        reader = frame.FrameReader()
+        reader.feed(self.data[:20])
+        self.assertEqual(reader.read()[0], 0)
+        self.assertIsNone(reader.read())
+        self.assertEqual(len(reader), 12)
+
+    def test_buffer_grows_for_large_frames(self):
+        value = body.ContentBody(b'x' * 1024)
+        reader = frame.FrameReader(64)
+        reader.feed(frame.marshal(value, 1))
+        channel, result = reader.read()
+        self.assertEqual(result.value, value.value)
+
+    def test_invalid_frame_raises(self):
+        reader = frame.FrameReader()
+        reader.feed(b'\x01\x00\x01\x00\x00\x00\x01\x00\x00')
+        with self.assertRaises(exceptions.UnmarshalingException):
+            reader.read()
+
+    def test_get_buffer_and_buffer_updated(self):
+        reader = frame.FrameReader(16)
+        received = []
+        for offset in range(0, len(self.data), 5):
+            chunk = self.data[offset:offset + 5]
+            buffer = reader.get_buffer(len(chunk))
+            self.assertGreaterEqual(len(buffer), len(chunk))
+            buffer[:len(chunk)] = chunk
+            reader.buffer_updated(len(chunk))
+            received.extend(reader)
+        self.assertFramesEqual(received)
+
+    def test_feed_after_get_buffer(self):
+        reader = frame.FrameReader(16)
+        reader.get_buffer()
+        reader.feed(self.data)
+        self.assertFramesEqual(list(reader))
+
+    def test_frame_max(self):
+        reader = frame.FrameReader(frame_max=4096)
+        reader.feed(frame.marshal(body.ContentBody(bytes(4088)), 1))
+        self.assertEqual(len(list(reader)), 1)
+        reader.feed(frame.marshal(body.ContentBody(bytes(4089)), 1)[:8])
+        with self.assertRaises(exceptions.AMQPFrameError):
+            reader.read()
+
+    def test_oversized_frame_rejected_from_header(self):
+        reader = frame.FrameReader(frame_max=131072)
+        reader.feed(b'\x03\x00\x01\xff\xff\xff\xf0\x00')
+        with self.assertRaises(exceptions.AMQPFrameError):
+            reader.read()
+
+    def test_channel_max(self):
+        reader = frame.FrameReader(channel_max=2)
+        reader.feed(self.data)
+        self.assertFramesEqual(list(reader))
+        reader.feed(frame.marshal(commands.Basic.Ack(1), 3))
+        with self.assertRaises(exceptions.AMQPChannelError):
+            reader.read()
+
+
+class FrameReaderWatermarkTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.events = []
+        self.reader = frame.FrameReader(64)
+        self.reader.set_watermarks(
+            24, 8, lambda: self.events.append('pause'),
+            lambda: self.events.append('resume'))
+        self.frame = frame.marshal(commands.Basic.Ack(1), 1)  # 21 bytes
+
+    def test_pause_and_resume(self):
+        self.reader.feed(self.frame)
+        self.assertFalse(self.reader.paused)
+        self.reader.feed(self.frame)
+        self.assertTrue(self.reader.paused)
+        self.assertEqual(self.events, ['pause'])
+        self.reader.read()
+        self.assertTrue(self.reader.paused)
+        self.reader.read()
+        self.assertFalse(self.reader.paused)
+        self.assertEqual(self.events, ['pause', 'resume'])
+
+    def test_not_paused_on_partial_frame(self):
+        self.reader.feed(frame.marshal(body.ContentBody(bytes(32)), 1)[:30])
+        self.assertFalse(self.reader.paused)
+        self.assertEqual(self.events, [])
+
+    def test_resumed_when_only_partial_frame_is_left(self):
+        large = frame.marshal(body.ContentBody(bytes(32)), 1)
+        self.reader.feed(self.frame + large[:20])
+        self.assertTrue(self.reader.paused)
+        self.reader.read()
+        self.assertFalse(self.reader.paused)
+        self.assertEqual(self.events, ['pause', 'resume'])
+
+    def test_disable_watermarks_resumes(self):
+        self.reader.feed(self.frame * 2)
+        self.reader.set_watermarks(0)
+        self.assertFalse(self.reader.paused)
+        self.assertEqual(self.events, ['pause', 'resume'])
+
+    def test_default_low_watermark(self):
+        reader = frame.FrameReader()
+        reader.set_watermarks(40)
+        reader.feed(self.frame * 2)
+        self.assertTrue(reader.paused)
+        reader.read()
+        self.assertTrue(reader.paused)
+        reader.read()
+        self.assertFalse(reader.paused)
+
+    def test_invalid_watermarks(self):
+        with self.assertRaises(ValueError):
+            self.reader.set_watermarks(8, 24)
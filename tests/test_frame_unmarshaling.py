@@ -1714,3 +1714,32 @@ class DemarshalingTests(unittest.TestCase):
         ch = frame.marshal(header.ContentHeader(0, 10, props), 1)
         rt_props = frame.unmarshal(ch)[2].properties
         self.assertEqual(rt_props, props)
+
+
+class BufferDemarshalingTests(unittest.TestCase):
+    def test_method_frame_from_memoryview(self):
+        frame_data = frame.marshal(
+            commands.Basic.Deliver('ctag0', 10, True, 'ex', 'rk'), 1)
+        consumed, channel, frame_obj = frame.unmarshal(
+            memoryview(frame_data + b'\x00'))
+        self.assertEqual((consumed, channel), (len(frame_data), 1))
+        self.assertEqual(
+            (frame_obj.consumer_tag, frame_obj.delivery_tag,
+             frame_obj.redelivered, frame_obj.exchange, frame_obj.routing_key),
+            ('ctag0', 10, True, 'ex', 'rk'))
+
+    def test_content_header_from_bytearray(self):
+        props = commands.Basic.Properties(
+            content_type='application/json', headers={'foo': 'bar'},
+            message_id='1')
+        frame_data = bytearray(
+            frame.marshal(header.ContentHeader(0, 10, props), 1))
+        frame_obj = frame.unmarshal(frame_data)[2]
+        self.assertEqual(frame_obj.body_size, 10)
+        self.assertEqual(frame_obj.properties, props)
+
+    def test_content_body_from_memoryview_is_bytes(self):
+        frame_data = frame.marshal(body.ContentBody(b'foo'), 1)
+        frame_obj = frame.unmarshal(memoryview(frame_data))[2]
+        self.assertIsInstance(frame_obj.value, bytes)
+        self.assertEqual(frame_obj.value, b'foo')
@@ -1,8 +1,10 @@
 # coding=utf-8
+import datetime
 import struct
 import unittest
 
-from pamqp import constants, exceptions, frame
+from pamqp import (commands, constants, decode, encode, exceptions, frame,
+                   header)
 
 
 class TestCase(unittest.TestCase):
@@ -85,3 +87,32 @@ class TestCase(unittest.TestCase):
             frame.unmarshal(frame_value)
             self.assertTrue(str(err).startswith(
                 'Could not unmarshal ContentHeader frame:'))
+
+    def test_truncated_lazy_field_table(self):
+        arguments = encode.field_table({'x-queue-type': 'quorum'})
+        frame_data = frame.marshal(
+            commands.Queue.Declare(queue='foo', arguments={
+                'x-queue-type': 'quorum'}), 1).replace(
+            arguments, struct.pack('>I', len(arguments)) + arguments[4:])
+        decode.lazy_field_tables()
+        try:
+            with self.assertRaises(exceptions.UnmarshalingException):
+                frame.unmarshal(frame_data)
+        finally:
+            decode.lazy_field_tables(False)
+
+    def test_truncated_content_header_properties(self):
+        properties = commands.Basic.Properties(
+            content_type='text/plain', delivery_mode=2,
+            headers={'foo': 'bar'}, timestamp=datetime.datetime(2019, 12, 19),
+            message_id='1')
+        payload = header.ContentHeader(0, 10, properties).marshal()
+        for lazy in (True, False):
+            header.lazy_properties(lazy)
+            self.addCleanup(header.lazy_properties, False)
+            for length in range(14, len(payload)):
+                frame_value = b''.join([
+                    struct.pack('>BHI', 2, 1, length), payload[:length],
+                    constants.FRAME_END_CHAR])
+                with self.assertRaises(exceptions.UnmarshalingException):
+                    frame.unmarshal(frame_value)
@@ -0,0 +1,189 @@
+# -*- encoding: utf-8 -*-
+import unittest
+
+from pamqp import base, body, commands, frame, header, heartbeat
+
+
+class FrameWriterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.frames = [
+            (header.ProtocolHeader(), 0),
+            (commands.Basic.Publish(exchange='foo', routing_key='bar'), 1),
+            (header.ContentHeader(body_size=5), 1),
+            (body.ContentBody(b'hello'), 1),
+            (heartbeat.Heartbeat(), 0),
+            (commands.Basic.Ack(delivery_tag=10, multiple=True), 2)]
+        self.expectation = b''.join(
+            frame.marshal(value, channel) for value, channel in self.frames)
+
+    def test_marshal_many(self):
+        self.assertEqual(frame.marshal_many(self.frames), self.expectation)
+
+    def test_write(self):
+        writer = frame.FrameWriter()
+        for value, channel in self.frames:
+            writer.write(value, channel)
+        self.assertEqual(len(writer), len(self.expectation))
+        self.assertEqual(writer.getvalue(), self.expectation)
+        with writer.getbuffer() as view:
+            self.assertEqual(view, self.expectation)
+
+    def test_clear(self):
+        writer = frame.FrameWriter()
+        writer.write(heartbeat.Heartbeat(), 0)
+        writer.clear()
+        self.assertEqual(len(writer), 0)
+        writer.write(body.ContentBody(b'foo'), 1)
+        self.assertEqual(writer.getvalue(),
+                         frame.marshal(body.ContentBody(b'foo'), 1))
+
+    def test_detach(self):
+        writer = frame.FrameWriter()
+        writer.write(heartbeat.Heartbeat(), 0)
+        buffer = writer._buffer
+        value = writer.detach()
+        self.assertIs(value, buffer)
+        self.assertEqual(value, heartbeat.Heartbeat.value)
+        self.assertEqual(len(writer), 0)
+        writer.write(body.ContentBody(b'foo'), 1)
+        self.assertEqual(value, heartbeat.Heartbeat.value)
+
+    def test_unknown_frame_type(self):
+        writer = frame.FrameWriter()
+        with self.assertRaises(ValueError):
+            writer.write(self, 1)
+
+    def test_failed_marshal_does_not_leave_partial_frame(self):
+        writer = frame.FrameWriter()
+        writer.write(heartbeat.Heartbeat(), 0)
+        value = commands.Basic.Ack(1)
+        value.delivery_tag = 'foo'
+        with self.assertRaises(TypeError):
+            writer.write(value, 1)
+        self.assertEqual(writer.getvalue(), heartbeat.Heartbeat.value)
+
+    def test_content_body_is_split_at_frame_max(self):
+        writer = frame.FrameWriter(frame_max=16)
+        writer.write(body.ContentBody(b'0123456789'), 1)
+        self.assertEqual(
+            writer.getvalue(),
+            b''.join([frame.marshal(body.ContentBody(b'01234567'), 1),
+                      frame.marshal(body.ContentBody(b'89'), 1)]))
+
+    def test_content_body_within_frame_max(self):
+        writer = frame.FrameWriter(frame_max=16)
+        writer.write(body.ContentBody(b'01234567'), 1)
+        writer.write(body.ContentBody(b''), 1)
+        self.assertEqual(
+            writer.getvalue(),
+            b''.join([frame.marshal(body.ContentBody(b'01234567'), 1),
+                      frame.marshal(body.ContentBody(b''), 1)]))
+
+    def test_body_is_split_at_writer_frame_max(self):
+        for frame_max in (0, 8192):
+            writer = frame.FrameWriter(frame_max=4096)
+            writer.write_message(1, 'ex', 'rk', None, bytes(10000), frame_max)
+            writer.write_body(1, bytes(10000), frame_max)
+            reader = frame.FrameReader(frame_max=4096)
+            reader.feed(writer.getvalue())
+            self.assertEqual([len(value) for _, value in list(reader)[2:]],
+                             [4088, 4088, 1824] * 2)
+
+    def test_body_is_split_at_lower_frame_max_argument(self):
+        writer = frame.FrameWriter(frame_max=4096)
+        writer.write_body(1, bytes(100), 16)
+        self.assertEqual(
+            writer.getvalue(),
+            b''.join(frame.marshal_body_segments(1, bytes(100), 16)))
+
+    def test_oversized_method_frame_raises(self):
+        writer = frame.FrameWriter(frame_max=4096)
+        writer.write(heartbeat.Heartbeat(), 0)
+        with self.assertRaises(ValueError):
+            writer.write(
+                commands.Connection.StartOk(
+                    client_properties={'key': 'x' * 4096}), 0)
+        self.assertEqual(writer.getvalue(), heartbeat.Heartbeat.value)
+
+    def test_channel_max(self):
+        writer = frame.FrameWriter(channel_max=2)
+        writer.write(commands.Basic.Ack(1), 2)
+        for method, args in ((writer.write, (commands.Basic.Ack(1), 3)),
+                             (writer.write_body, (3, b'foo', 0)),
+                             (writer.write_message,
+                              (3, 'ex', 'rk', None, b'foo', 0))):
+            with self.assertRaises(ValueError):
+                method(*args)
+        self.assertEqual(writer.getvalue(),
+                         frame.marshal(commands.Basic.Ack(1), 2))
+
+
+class MarshalMessageTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.properties = commands.Basic.Properties(
+            app_id='unittest', content_type='text/plain', delivery_mode=2)
+
+    def expectation(self, body_value, frame_size, mandatory=False):
+        frames = [
+            (commands.Basic.Publish(exchange='ex', routing_key='rk',
+                                    mandatory=mandatory), 1),
+            (header.ContentHeader(0, len(body_value), self.properties), 1)]
+        for offset in range(0, len(body_value), frame_size):
+            frames.append(
+                (body.ContentBody(body_value[offset:offset + frame_size]), 1))
+        return frame.marshal_many(frames)
+
+    def test_single_body_frame(self):
+        self.assertEqual(
+            frame.marshal_message(1, 'ex', 'rk', self.properties, b'hello',
+                                  4096), self.expectation(b'hello', 4088))
+
+    def test_body_is_split_at_frame_max(self):
+        value = bytes(range(256)) * 4
+        self.assertEqual(
+            frame.marshal_message(1, 'ex', 'rk', self.properties, value,
+                                  108, True),
+            self.expectation(value, 100, True))
+
+    def test_memoryview_body(self):
+        value = bytes(range(256))
+        self.assertEqual(
+            frame.marshal_message(1, 'ex', 'rk', self.properties,
+                                  memoryview(value), 58),
+            self.expectation(value, 50))
+
+    def test_empty_body_has_no_body_frames(self):
+        self.assertEqual(
+            frame.marshal_message(1, 'ex', 'rk', self.properties, b'', 4096),
+            self.expectation(b'', 4088))
+
+    def test_default_properties(self):
+        self.properties = commands.Basic.Properties()
+        self.assertEqual(
+            frame.marshal_message(1, 'ex', 'rk', None, b'foo', 4096),
+            self.expectation(b'foo', 4088))
+
+    def test_no_frame_max(self):
+        value = b'x' * 10000
+        self.assertEqual(
+            frame.marshal_message(1, 'ex', 'rk', self.properties, value, 0),
+            self.expectation(value, 10000))
+
+    def test_invalid_frame_max(self):
+        with self.assertRaises(ValueError):
+            frame.marshal_message(1, 'ex', 'rk', None, b'foo', 8)
+
+    def test_invalid_exchange_leaves_buffer_untouched(self):
+        writer = frame.FrameWriter()
+        writer.write(heartbeat.Heartbeat(), 0)
+        with self.assertRaises(ValueError):
+            writer.write_message(1, '*', 'rk', None, b'foo', 4096)
+        self.assertEqual(writer.getvalue(), heartbeat.Heartbeat.value)
+
+    def test_payload_cached_without_validation_is_validated(self):
+        with base.validation_mode('off'):
+            frame.marshal_message(1, '**', 'rk', None, b'foo', 4096)
+        with self.assertRaises(ValueError):
+            frame.marshal_message(1, '**', 'rk', None, b'foo', 4096)
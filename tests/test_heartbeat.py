@@ -0,0 +1,81 @@
+import unittest
+
+from pamqp import heartbeat
+
+
+class HeartbeatSchedulerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = heartbeat.HeartbeatScheduler(resolution=1.0,
+                                                      slots=8)
+        self.scheduler.add('a', 10, now=100)
+
+    def test_heartbeat_sent_when_idle(self):
+        self.assertEqual(self.scheduler.tick(now=105), ([], []))
+        self.scheduler.received('a', now=109)
+        self.assertEqual(self.scheduler.tick(now=110), (['a'], []))
+        self.assertEqual(self.scheduler.tick(now=111), ([], []))
+
+    def test_heartbeat_not_sent_after_other_frames(self):
+        self.scheduler.sent('a', now=108)
+        self.scheduler.received('a', now=108)
+        self.assertEqual(self.scheduler.tick(now=110), ([], []))
+        self.scheduler.received('a', now=117)
+        self.assertEqual(self.scheduler.tick(now=118), (['a'], []))
+
+    def test_dead_peer(self):
+        self.assertEqual(self.scheduler.tick(now=110), (['a'], []))
+        self.assertEqual(self.scheduler.tick(now=119), ([], []))
+        self.assertEqual(self.scheduler.tick(now=120), ([], ['a']))
+        self.assertNotIn('a', self.scheduler)
+
+    def test_received_delays_dead_peer(self):
+        self.scheduler.received('a', now=115)
+        self.scheduler.sent('a', now=129)
+        self.assertEqual(self.scheduler.tick(now=130), ([], []))
+        self.assertEqual(self.scheduler.tick(now=135), ([], ['a']))
+
+    def test_intervals_longer_than_the_wheel(self):
+        self.scheduler.add('b', 20, now=100)
+        self.scheduler.received('a', now=119)
+        for now in range(101, 120):
+            send, dead = self.scheduler.tick(now=now)
+            self.assertNotIn('b', send)
+        send, dead = self.scheduler.tick(now=120)
+        self.assertIn('b', send)
+
+    def test_tick_after_long_pause(self):
+        self.scheduler.add('b', 5, now=100)
+        send, dead = self.scheduler.tick(now=1000)
+        self.assertEqual(send, [])
+        self.assertEqual(sorted(dead), ['a', 'b'])
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_many_connections(self):
+        for key in range(1000):
+            self.scheduler.add(key, 10, now=100)
+            self.scheduler.received(key, now=109)
+        send, dead = self.scheduler.tick(now=110)
+        self.assertEqual(len(send), 1001)
+        self.assertEqual(dead, [])
+
+    def test_remove(self):
+        self.scheduler.remove('a')
+        self.scheduler.remove('b')
+        self.assertEqual(len(self.scheduler), 0)
+        self.assertEqual(self.scheduler.tick(now=130), ([], []))
+
+    def test_add_disabled_interval(self):
+        self.scheduler.add('b', 0, now=100)
+        self.assertNotIn('b', self.scheduler)
+        self.scheduler.received('b', now=101)
+        self.scheduler.sent('b', now=101)
+
+    def test_tick_without_connections(self):
+        scheduler = heartbeat.HeartbeatScheduler()
+        self.assertEqual(scheduler.tick(), ([], []))
+
+    def test_readd_reschedules(self):
+        self.scheduler.add('a', 30, now=105)
+        self.assertEqual(self.scheduler.tick(now=120), ([], []))
+        self.assertEqual(self.scheduler.tick(now=135), (['a'], []))
@@ -0,0 +1,95 @@
+import mmap
+import unittest
+
+from pamqp import body, commands, exceptions, frame, header, message
+
+
+class MessageAssemblerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.assembler = message.MessageAssembler()
+        self.method = commands.Basic.Deliver('ctag', 1, False, 'ex', 'rk')
+        self.properties = commands.Basic.Properties(content_type='text/plain')
+
+    def test_multiple_body_frames(self):
+        self.assertIsNone(self.assembler.feed(self.method))
+        self.assertTrue(self.assembler.in_progress)
+        self.assertIsNone(
+            self.assembler.feed(header.ContentHeader(0, 10, self.properties)))
+        self.assertIsNone(self.assembler.feed(body.ContentBody(b'01234')))
+        value = self.assembler.feed(body.ContentBody(b'56789'))
+        self.assertIsInstance(value, message.Message)
+        self.assertIs(value.method, self.method)
+        self.assertIs(value.properties, self.properties)
+        self.assertEqual(value.body, b'0123456789')
+        self.assertIsInstance(value.body, bytearray)
+        self.assertFalse(self.assembler.in_progress)
+
+    def test_empty_body(self):
+        self.assembler.feed(commands.Basic.GetOk(1, False, 'ex', 'rk', 0))
+        value = self.assembler.feed(
+            header.ContentHeader(0, 0, self.properties))
+        self.assertEqual(value.body, b'')
+        self.assertFalse(self.assembler.in_progress)
+
+    def test_return(self):
+        self.assembler.feed(commands.Basic.Return(312, 'NO_ROUTE', 'ex', 'rk'))
+        self.assembler.feed(header.ContentHeader(0, 3, self.properties))
+        value = self.assembler.feed(body.ContentBody(b'foo'))
+        self.assertIsInstance(value.method, commands.Basic.Return)
+
+    def test_unmarshaled_frames(self):
+        reader = frame.FrameReader()
+        reader.feed(
+            frame.marshal_many([
+                (self.method, 1),
+                (header.ContentHeader(0, 100, self.properties), 1),
+                (body.ContentBody(b'x' * 60), 1),
+                (body.ContentBody(b'y' * 40), 1)]))
+        values = [self.assembler.feed(value) for _, value in reader]
+        self.assertEqual(values[:-1], [None, None, None])
+        self.assertEqual(values[-1].body, b'x' * 60 + b'y' * 40)
+        self.assertEqual(values[-1].properties.content_type, 'text/plain')
+
+    def test_spill_threshold(self):
+        assembler = message.MessageAssembler(spill_threshold=4)
+        assembler.feed(self.method)
+        assembler.feed(header.ContentHeader(0, 5, self.properties))
+        value = assembler.feed(body.ContentBody(b'abcde'))
+        self.assertIsInstance(value.body, mmap.mmap)
+        self.assertEqual(value.body[:], b'abcde')
+
+    def test_other_frames_are_ignored(self):
+        self.assertIsNone(self.assembler.feed(commands.Basic.ConsumeOk('c')))
+        self.assertFalse(self.assembler.in_progress)
+
+    def test_header_without_method_raises(self):
+        with self.assertRaises(exceptions.AMQPUnexpectedFrame):
+            self.assembler.feed(header.ContentHeader(0, 1, self.properties))
+
+    def test_body_without_header_raises(self):
+        self.assembler.feed(self.method)
+        with self.assertRaises(exceptions.AMQPUnexpectedFrame):
+            self.assembler.feed(body.ContentBody(b'foo'))
+
+    def test_method_while_in_progress_raises(self):
+        self.assembler.feed(self.method)
+        with self.assertRaises(exceptions.AMQPUnexpectedFrame):
+            self.assembler.feed(self.method)
+
+    def test_body_overflow_raises(self):
+        self.assembler.feed(self.method)
+        self.assembler.feed(header.ContentHeader(0, 2, self.properties))
+        with self.assertRaises(exceptions.AMQPUnexpectedFrame):
+            self.assembler.feed(body.ContentBody(b'foo'))
+
+    def test_reset(self):
+        self.assembler.feed(self.method)
+        self.assembler.reset()
+        self.assertFalse(self.assembler.in_progress)
+        self.assertIsNone(self.assembler.feed(self.method))
+
+    def test_repr(self):
+        value = message.Message(self.method, self.properties, bytearray(3))
+        self.assertEqual(repr(value),
+                         '<Message method=Basic.Deliver body_size=3>')
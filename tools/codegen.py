@@ -370,7 +370,8 @@ class Codegen:
         for arg in properties:
             self._add_line('self.{} = {}'.format(
                 arg['pyname'], arg['pyname']), indent)
-        self._add_line('self.validate()', indent)
+        self._add_line('if base.validate_on_construct():', indent)
+        self._add_line('self.validate()', indent + 4)
         self._add_line()
 
     def _build_command_map(self) -> None:
@@ -596,7 +597,8 @@ class Codegen:
                     break
 
             if add_validate:
-                self._add_line('self.validate()', indent)
+                self._add_line('if base.validate_on_construct():', indent)
+                self._add_line('self.validate()', indent + 4)
 
             indent -=4
 